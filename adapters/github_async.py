@@ -0,0 +1,203 @@
+from typing import Dict, Any, Optional, List
+import asyncio
+import importlib.util
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from core.error_handler import ErrorSeverity
+from core.structured_logger import StructuredLogger
+from adapters.github_integration import (
+    CodeAnalyzer,
+    GitHubIntegrationError,
+    _default_logger,
+    _rate_limit_delay
+)
+
+GITHUB_API_URL = "https://api.github.com"
+
+class AsyncGitHubClient:
+    """
+    Asynchronous GitHub REST client for fanning out independent read requests.
+    """
+    def __init__(
+        self,
+        token: str,
+        max_concurrency: int = 10,
+        timeout: float = 30.0,
+        rate_limit_floor: int = 10,
+        logger: Optional[StructuredLogger] = None
+    ):
+        """
+        Initialize the async GitHub client.
+
+        :param token: GitHub Personal Access Token
+        :param max_concurrency: Maximum number of in-flight requests
+        :param timeout: Request timeout in seconds
+        :param rate_limit_floor: Remaining requests at which calls pause until the window resets
+        :param logger: Optional structured logger
+        """
+        if httpx is None:
+            raise GitHubIntegrationError(
+                "AsyncGitHubClient requires httpx; install it with 'pip install httpx'",
+                severity=ErrorSeverity.ERROR
+            )
+
+        self._client = httpx.AsyncClient(
+            base_url=GITHUB_API_URL,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json"
+            },
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            # HTTP/2 multiplexes concurrent requests over one connection when h2 is installed
+            http2=importlib.util.find_spec("h2") is not None
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate_limit_floor = rate_limit_floor
+        self._logger = logger or _default_logger()
+
+    async def __aenter__(self) -> 'AsyncGitHubClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Close the underlying HTTP connection pool.
+        """
+        await self._client.aclose()
+
+    async def _get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Perform a GET request bounded by the concurrency semaphore.
+
+        :param path: API path
+        :param params: Optional query parameters
+        :return: Decoded JSON payload
+        """
+        async with self._semaphore:
+            response = await self._client.get(path, params=params)
+
+            delay = _rate_limit_delay(response.headers, self._rate_limit_floor)
+            if response.status_code in (403, 429) and delay > 0:
+                # Throttled: wait as long as GitHub asked, then retry once
+                await asyncio.sleep(delay)
+                response = await self._client.get(path, params=params)
+            elif delay > 0:
+                # Quota nearly exhausted: hold this slot until the window resets
+                await asyncio.sleep(delay)
+
+        if response.status_code >= 400:
+            raise GitHubIntegrationError(
+                f"GitHub request failed: {response.status_code} {response.text}",
+                severity=ErrorSeverity.ERROR,
+                context={'path': path}
+            )
+
+        return response.json()
+
+    async def get_repository(self, repo_name: str) -> Dict[str, Any]:
+        """
+        Get raw repository metadata.
+
+        :param repo_name: Repository name (owner/repo)
+        :return: Repository payload
+        """
+        return await self._get(f"/repos/{repo_name}")
+
+    async def _walk_tree(self, repo_name: str, sha: str) -> List[Dict[str, Any]]:
+        """
+        List every entry of a Git tree one level at a time, for trees too
+        large to fetch recursively. Subtrees of each level are fetched
+        concurrently.
+
+        :param repo_name: Repository name (owner/repo)
+        :param sha: Root tree or commit SHA
+        :return: Flat list of raw Git tree entries with full paths
+        """
+        entries = []
+        level = [(sha, '')]
+        while level:
+            trees = await asyncio.gather(
+                *(self._get(f"/repos/{repo_name}/git/trees/{tree_sha}") for tree_sha, _ in level)
+            )
+            next_level = []
+            for (_, prefix), tree in zip(level, trees):
+                for entry in tree['tree']:
+                    entry = dict(entry, path=prefix + entry['path'])
+                    entries.append(entry)
+                    if entry['type'] == 'tree':
+                        next_level.append((entry['sha'], entry['path'] + '/'))
+            level = next_level
+        return entries
+
+    async def analyze_repository(
+        self,
+        repo_name: str,
+        branch: str = 'main'
+    ) -> Dict[str, Any]:
+        """
+        Perform repository structure analysis, fetching the tree and
+        language breakdown concurrently.
+
+        :param repo_name: Repository name (owner/repo)
+        :param branch: Branch to analyze
+        :return: Repository structure analysis
+        """
+        branch_info = await self._get(f"/repos/{repo_name}/branches/{branch}")
+        sha = branch_info['commit']['sha']
+
+        tree, languages = await asyncio.gather(
+            self._get(f"/repos/{repo_name}/git/trees/{sha}", params={'recursive': 1}),
+            self._get(f"/repos/{repo_name}/languages")
+        )
+        entries = tree['tree']
+        if tree.get('truncated'):
+            # GitHub caps recursive trees; fetch the rest level by level
+            self._logger.log(
+                f"Recursive tree for {repo_name} was truncated; walking subtrees",
+                level=ErrorSeverity.WARNING,
+                extra={'repo_name': repo_name, 'sha': sha}
+            )
+            entries = await self._walk_tree(repo_name, sha)
+        structure, file_types = CodeAnalyzer.analyze_tree(entries)
+
+        analysis = {
+            'repo_name': repo_name,
+            'branch': branch,
+            'structure': structure,
+            'languages': languages,
+            'file_types': file_types
+        }
+
+        self._logger.track_event(
+            'github_repo_analyzed',
+            analysis
+        )
+
+        return analysis
+
+    async def analyze_repositories(
+        self,
+        repo_names: List[str],
+        branch: str = 'main'
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several repositories concurrently.
+
+        :param repo_names: Repository names (owner/repo)
+        :param branch: Branch to analyze
+        :return: Analyses in the same order as repo_names
+        """
+        return await asyncio.gather(
+            *(self.analyze_repository(name, branch) for name in repo_names)
+        )
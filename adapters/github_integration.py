@@ -1,7 +1,16 @@
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Tuple, Union
 import uuid
 import json
+import os
 import re
+import time
+import asyncio
+import threading
+import functools
+from functools import cached_property
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime, timedelta
 
 import requests
@@ -20,6 +29,164 @@ class GitHubIntegrationError(AgentError):
     """Exception raised for GitHub integration-related errors."""
     pass
 
+@functools.lru_cache(maxsize=1)
+def _default_config_manager() -> ConfigManager:
+    """
+    Get the process-wide ConfigManager used when none is injected.
+    """
+    return ConfigManager()
+
+@functools.lru_cache(maxsize=1)
+def _default_credential_store() -> CredentialStore:
+    """
+    Get the process-wide CredentialStore used when none is injected.
+    """
+    return CredentialStore()
+
+@functools.lru_cache(maxsize=1)
+def _default_logger() -> StructuredLogger:
+    """
+    Get the process-wide StructuredLogger used when none is injected.
+    """
+    return StructuredLogger()
+
+def _file_extension(name: str) -> str:
+    """
+    Extract a lower-cased file extension so e.g. JPG and jpg count together.
+    
+    :param name: File name
+    :return: Extension, or 'no_ext' for extensionless files and dotfiles
+    """
+    return os.path.splitext(name)[1][1:].lower() or 'no_ext'
+
+def _rate_limit_delay(headers: Dict[str, Any], floor: int) -> float:
+    """
+    Compute how long to pause based on GitHub rate limit response headers.
+    
+    :param headers: Response headers (lower-cased keys)
+    :param floor: Remaining request count at which to wait for the reset
+    :return: Seconds to wait before the next request
+    """
+    retry_after = headers.get('retry-after')
+    if retry_after is not None:
+        return float(retry_after)
+    
+    remaining = headers.get('x-ratelimit-remaining')
+    reset = headers.get('x-ratelimit-reset')
+    if remaining is not None and reset is not None and int(remaining) <= floor:
+        return max(0.0, float(reset) - time.time())
+    
+    return 0.0
+
+def _next_page_url(headers: Dict[str, Any]) -> Optional[str]:
+    """
+    Extract the next page URL from a paginated response's Link header.
+    
+    :param headers: Response headers (lower-cased keys)
+    :return: URL of the next page, or None on the last page
+    """
+    for link in requests.utils.parse_header_links(headers.get('link', '')):
+        if link.get('rel') == 'next':
+            return link['url']
+    return None
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket that spreads requests over an hourly budget.
+    """
+    def __init__(self, requests_per_hour: int = 4500, burst: int = 100):
+        """
+        Initialize the token bucket.
+        
+        :param requests_per_hour: Sustained request budget
+        :param burst: Maximum number of tokens that can accumulate
+        """
+        self._rate = requests_per_hour / 3600.0
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, returning how long the caller must wait before using it.
+        
+        :return: Seconds to wait (0 if a token was available)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, 
+                self._tokens + (now - self._updated_at) * self._rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+class _ResponseCache:
+    """
+    Thread-safe, size-bounded TTL cache for GitHub responses.
+    
+    Entries keep their ETag after the TTL expires so stale payloads can be
+    revalidated with a conditional request instead of refetched.
+    """
+    def __init__(self, maxsize: int = 1024, ttl: float = 90.0):
+        """
+        Initialize the response cache.
+        
+        :param maxsize: Maximum number of cached entries
+        :param ttl: Seconds an entry is served without revalidation
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[Tuple[Optional[str], Any, float]]:
+        """
+        Get a cached entry regardless of freshness.
+        
+        :param key: Cache key
+        :return: (etag, payload, stored_at) tuple or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: Tuple[Optional[str], Any, float]) -> bool:
+        """
+        Check whether an entry is still within its TTL.
+        
+        :param entry: Entry returned by get()
+        :return: True if the entry can be served without revalidation
+        """
+        return time.monotonic() - entry[2] < self._ttl
+
+    def set(self, key: Tuple, payload: Any, etag: Optional[str] = None):
+        """
+        Store a payload, evicting the least recently used entry when full.
+        
+        :param key: Cache key
+        :param payload: Response payload
+        :param etag: Optional ETag for conditional revalidation
+        """
+        with self._lock:
+            self._entries[key] = (etag, payload, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all cached entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
 class CodeAnalyzer:
     """
     Provides advanced code and repository structure analysis.
@@ -47,14 +214,25 @@ class CodeAnalyzer:
         """
         try:
             repo = self._github_client.get_repository(repo_name)
-            contents = repo.get_contents('', ref=branch)
+            sha = repo.get_branch(branch).commit.sha
+            tree = repo.get_git_tree(sha, recursive=True)
+            entries = tree.raw_data['tree']
+            if tree.raw_data.get('truncated'):
+                # GitHub caps recursive trees; fetch the rest level by level
+                self._logger.log(
+                    f"Recursive tree for {repo_name} was truncated; walking subtrees",
+                    level=ErrorSeverity.WARNING,
+                    extra={'repo_name': repo_name, 'sha': sha}
+                )
+                entries = self._walk_tree(repo, sha)
+            structure, file_types = self.analyze_tree(entries)
             
             analysis = {
                 'repo_name': repo_name,
                 'branch': branch,
-                'structure': self._analyze_contents(contents),
+                'structure': structure,
                 'languages': self._analyze_languages(repo),
-                'file_types': self._count_file_types(contents)
+                'file_types': file_types
             }
             
             self._logger.track_event(
@@ -70,34 +248,64 @@ class CodeAnalyzer:
                 severity=ErrorSeverity.ERROR
             )
 
-    def _analyze_contents(
-        self, 
-        contents: List, 
-        base_path: str = ''
-    ) -> Dict[str, Any]:
+    @staticmethod
+    def _walk_tree(repo: Repository, sha: str) -> List[Dict[str, Any]]:
+        """
+        List every entry of a Git tree one level at a time, for trees too
+        large to fetch recursively.
+        
+        :param repo: GitHub repository
+        :param sha: Root tree or commit SHA
+        :return: Flat list of raw Git tree entries with full paths
+        """
+        entries = []
+        pending = [(sha, '')]
+        while pending:
+            tree_sha, prefix = pending.pop()
+            for entry in repo.get_git_tree(tree_sha).raw_data['tree']:
+                entry = dict(entry, path=prefix + entry['path'])
+                entries.append(entry)
+                if entry['type'] == 'tree':
+                    pending.append((entry['sha'], entry['path'] + '/'))
+        return entries
+
+    @staticmethod
+    def analyze_tree(
+        entries: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
         """
-        Recursively analyze repository contents.
+        Build the nested repository structure and file type counts
+        from a recursive Git tree in a single pass.
         
-        :param contents: List of repository contents
-        :param base_path: Current path being analyzed
-        :return: Structured repository contents
+        :param entries: Flat list of raw Git tree entries
+        :return: Structured repository contents and file type counts
         """
         structure = {}
+        file_types = Counter()
         
-        for content in contents:
-            if content.type == 'dir':
-                structure[content.name] = self._analyze_contents(
-                    content.repository.get_contents(content.path), 
-                    content.path
-                )
-            else:
-                structure[content.name] = {
-                    'type': content.type,
-                    'size': content.size,
-                    'path': content.path
-                }
+        for entry in entries:
+            path = entry['path']
+            entry_type = entry['type']
+            *parents, name = path.split('/')
+            node = structure
+            for part in parents:
+                node = node.setdefault(part, {})
+            
+            if entry_type == 'tree':
+                node.setdefault(name, {})
+                continue
+            
+            is_file = entry_type == 'blob'
+            node[name] = {
+                'type': 'file' if is_file else entry_type,
+                'size': entry.get('size'),
+                'path': path
+            }
+            
+            if is_file:
+                file_types[_file_extension(name)] += 1
         
-        return structure
+        return structure, dict(file_types)
 
     def _analyze_languages(self, repo: Repository) -> Dict[str, float]:
         """
@@ -107,29 +315,10 @@ class CodeAnalyzer:
         :return: Language breakdown
         """
         try:
-            return repo.language_breakdown
+            return self._github_client.request_json(f"{repo.url}/languages")
         except Exception:
             return {}
 
-    def _count_file_types(
-        self, 
-        contents: List
-    ) -> Dict[str, int]:
-        """
-        Count file types in the repository.
-        
-        :param contents: Repository contents
-        :return: File type counts
-        """
-        file_types = {}
-        
-        for content in contents:
-            if content.type == 'file':
-                ext = content.name.split('.')[-1] if '.' in content.name else 'no_ext'
-                file_types[ext] = file_types.get(ext, 0) + 1
-        
-        return file_types
-
 class SecurityScanner:
     """
     Performs security vulnerability scanning and analysis.
@@ -156,11 +345,26 @@ class SecurityScanner:
         try:
             repo = self._github_client.get_repository(repo_name)
             
-            scan_results = {
-                'dependencies': self._scan_dependencies(repo),
-                'security_alerts': self._check_security_alerts(repo),
-                'code_scanning': self._analyze_code_scanning(repo)
-            }
+            if not self._github_client.has_rate_limit_headroom():
+                # Skip non-essential alert listings when close to the quota
+                scan_results = {
+                    'dependencies': {},
+                    'security_alerts': [],
+                    'code_scanning': [],
+                    'rate_limited': True
+                }
+            else:
+                # Sub-scans are independent network calls; run them concurrently
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    dependencies = executor.submit(self._scan_dependencies, repo)
+                    security_alerts = executor.submit(self._check_security_alerts, repo)
+                    code_scanning = executor.submit(self._analyze_code_scanning, repo)
+                    
+                    scan_results = {
+                        'dependencies': dependencies.result(),
+                        'security_alerts': security_alerts.result(),
+                        'code_scanning': code_scanning.result()
+                    }
             
             self._logger.track_event(
                 'github_security_scan', 
@@ -198,11 +402,13 @@ class SecurityScanner:
         try:
             return [
                 {
-                    'state': alert.state,
-                    'created_at': alert.created_at.isoformat(),
-                    'dismissed': alert.dismissed
+                    'state': alert['state'],
+                    'created_at': alert['created_at'],
+                    'dismissed': alert['state'] == 'dismissed'
                 }
-                for alert in repo.get_security_alerts()
+                for alert in self._github_client.request_all(
+                    f"{repo.url}/dependabot/alerts"
+                )
             ]
         except Exception:
             return []
@@ -217,12 +423,14 @@ class SecurityScanner:
         try:
             return [
                 {
-                    'rule_id': alert.rule.id,
-                    'rule_description': alert.rule.description,
-                    'severity': alert.rule.severity,
-                    'created_at': alert.created_at.isoformat()
+                    'rule_id': alert['rule']['id'],
+                    'rule_description': alert['rule']['description'],
+                    'severity': alert['rule']['severity'],
+                    'created_at': alert['created_at']
                 }
-                for alert in repo.get_code_scanning_alerts()
+                for alert in self._github_client.request_all(
+                    f"{repo.url}/code-scanning/alerts"
+                )
             ]
         except Exception:
             return []
@@ -244,7 +452,8 @@ class TrendAnalyzer:
         self, 
         language: Optional[str] = None,
         created_after: Optional[datetime] = None,
-        min_stars: int = 100
+        min_stars: int = 100,
+        limit: int = 10
     ) -> List[Dict[str, Any]]:
         """
         Analyze trending repositories.
@@ -252,6 +461,7 @@ class TrendAnalyzer:
         :param language: Optional programming language filter
         :param created_after: Optional date to filter repositories created after
         :param min_stars: Minimum number of stars
+        :param limit: Maximum number of repositories to return
         :return: List of trending repositories
         """
         try:
@@ -262,22 +472,38 @@ class TrendAnalyzer:
                 query_parts.append(f"language:{language}")
             
             if created_after:
-                query_parts.append(f"created:>{created_after.strftime('%Y-%m-%d')}")
+                created_date = created_after.strftime('%Y-%m-%d')
+                query_parts.append(f"created:>{created_date}")
             
             query = " ".join(query_parts)
             
-            trending_repos = self._github_client._github.search_repositories(query=query)
+            search = self._github_client.request_json(
+                '/search/repositories',
+                # Request only the first page, sized to what is returned
+                parameters={
+                    'q': query,
+                    'sort': 'stars',
+                    'order': 'desc',
+                    'per_page': limit
+                }
+            )
+            
+            items = list(islice(search['items'], limit))
+            
+            # Seed the repository cache so follow-up analyses skip get_repo
+            for item in items:
+                self._github_client.cache_repository(item)
             
             results = [
                 {
-                    'name': repo.full_name,
-                    'description': repo.description,
-                    'stars': repo.stargazers_count,
-                    'language': repo.language,
-                    'created_at': repo.created_at.isoformat(),
-                    'last_updated': repo.updated_at.isoformat()
+                    'name': repo['full_name'],
+                    'description': repo['description'],
+                    'stars': repo['stargazers_count'],
+                    'language': repo['language'],
+                    'created_at': repo['created_at'],
+                    'last_updated': repo['updated_at']
                 }
-                for repo in trending_repos[:10]  # Limit to top 10
+                for repo in items
             ]
             
             self._logger.track_event(
@@ -337,7 +563,7 @@ class RepoManager:
                 'number': pr.number,
                 'title': pr.title,
                 'state': pr.state,
-                'created_at': pr.created_at.isoformat(),
+                'created_at': pr.raw_data['created_at'],
                 'url': pr.html_url
             }
             
@@ -363,7 +589,11 @@ class GitHubClient:
         token: str,
         config_manager: Optional[ConfigManager] = None,
         credential_store: Optional[CredentialStore] = None,
-        logger: Optional[StructuredLogger] = None
+        logger: Optional[StructuredLogger] = None,
+        cache_ttl: float = 90.0,
+        rate_limit_threshold: int = 100,
+        rate_limit_floor: int = 10,
+        requests_per_hour: int = 4500
     ):
         """
         Initialize GitHub client with comprehensive configuration.
@@ -372,25 +602,55 @@ class GitHubClient:
         :param config_manager: Optional configuration manager
         :param credential_store: Optional credential store
         :param logger: Optional structured logger
+        :param cache_ttl: Seconds read responses are served from cache
+        :param rate_limit_threshold: Remaining requests below which non-essential scans are skipped
+        :param rate_limit_floor: Remaining requests at which calls pause until the window resets
+        :param requests_per_hour: Client-side request budget, kept below GitHub's 5000/hr cap
         """
         self._token = token
         
-        # Initialize GitHub client
-        self._github = Github(token)
+        # Initialize GitHub client with a pooled, keep-alive HTTP session
+        self._github = Github(token, per_page=100, pool_size=50)
+        
+        # Read-path cache with ETag revalidation
+        self._response_cache = _ResponseCache(ttl=cache_ttl)
+        self._rate_limit_threshold = rate_limit_threshold
+        
+        # Bounds concurrent in-flight requests across worker threads
+        self._request_semaphore = threading.Semaphore(5)
+        
+        # Rate limit pacing driven by GitHub's response headers
+        self._rate_limit_floor = rate_limit_floor
+        self._rate_limit_bucket = _TokenBucket(requests_per_hour)
+        self._rate_limit_resume_at = 0.0
+        self._rate_limit_remaining: Optional[int] = None
         
         # Optional components
-        self._config_manager = config_manager or ConfigManager()
-        self._credential_store = credential_store or CredentialStore()
-        self._logger = logger or StructuredLogger()
-        
-        # Initialize sub-components
-        self.code_analyzer = CodeAnalyzer(self)
-        self.security_scanner = SecurityScanner(self)
-        self.trend_analyzer = TrendAnalyzer(self)
-        self.repo_manager = RepoManager(self)
-        
-        # Retry handler for API calls
-        self._retry_handler = RetryHandler(
+        self._config_manager = config_manager or _default_config_manager()
+        self._credential_store = credential_store or _default_credential_store()
+        self._logger = logger or _default_logger()
+
+    # Sub-components are built on first access
+    @cached_property
+    def code_analyzer(self) -> CodeAnalyzer:
+        return CodeAnalyzer(self)
+
+    @cached_property
+    def security_scanner(self) -> SecurityScanner:
+        return SecurityScanner(self)
+
+    @cached_property
+    def trend_analyzer(self) -> TrendAnalyzer:
+        return TrendAnalyzer(self)
+
+    @cached_property
+    def repo_manager(self) -> RepoManager:
+        return RepoManager(self)
+
+    @cached_property
+    def _retry_handler(self) -> RetryHandler:
+        # Per-client, since the handler tracks circuit breaker state
+        return RetryHandler(
             max_retries=3,
             backoff_strategy=RetryStrategy.EXPONENTIAL
         )
@@ -402,10 +662,199 @@ class GitHubClient:
         :param repo_name: Repository name (owner/repo)
         :return: GitHub Repository object
         """
+        key = ('repository', repo_name)
+        entry = self._response_cache.get(key)
+        if entry is not None and self._response_cache.is_fresh(entry):
+            return entry[1]
+        
         try:
-            return self._github.get_repo(repo_name)
+            repo = self._github.get_repo(repo_name)
         except GithubException as e:
             raise GitHubIntegrationError(
                 f"Repository retrieval failed: {str(e)}",
                 severity=ErrorSeverity.ERROR
             )
+        
+        self._response_cache.set(key, repo)
+        return repo
+
+    def cache_repository(self, raw_data: Dict[str, Any]) -> Repository:
+        """
+        Cache a Repository built from an already fetched API payload,
+        such as a search result, so get_repository can reuse it.
+        
+        :param raw_data: Raw repository JSON
+        :return: GitHub Repository object
+        """
+        repo = self._github.create_from_raw_data(Repository, raw_data)
+        self._response_cache.set(('repository', raw_data['full_name']), repo)
+        return repo
+
+    def analyze_repositories(
+        self, 
+        repo_names: List[str], 
+        branch: str = 'main'
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several repositories concurrently through the async client.
+        
+        :param repo_names: Repository names (owner/repo)
+        :param branch: Branch to analyze
+        :return: Analyses in the same order as repo_names
+        """
+        from adapters.github_async import AsyncGitHubClient
+        
+        async def run() -> List[Dict[str, Any]]:
+            async with AsyncGitHubClient(self._token, logger=self._logger) as client:
+                return await client.analyze_repositories(repo_names, branch)
+        
+        return asyncio.run(run())
+
+    def request_json(
+        self, 
+        url: str, 
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Perform a cached GET request against the GitHub REST API.
+        
+        Fresh entries are served from memory; stale entries are revalidated
+        with If-None-Match so unchanged resources return 304 and do not
+        count against the rate limit.
+        
+        :param url: API path or absolute URL
+        :param parameters: Optional query parameters
+        :return: Decoded JSON payload
+        """
+        return self._request_page(url, parameters)[0]
+
+    def request_all(
+        self, 
+        url: str, 
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        """
+        Perform cached GET requests for every page of a list endpoint.
+        
+        :param url: API path or absolute URL
+        :param parameters: Optional query parameters
+        :return: Items from all pages, in order
+        """
+        items = []
+        parameters = {'per_page': 100, **(parameters or {})}
+        while url:
+            payload, url = self._request_page(url, parameters)
+            items.extend(payload)
+            # The next link already carries the query string
+            parameters = None
+        return items
+
+    def _request_page(
+        self, 
+        url: str, 
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Perform a single cached GET request.
+        
+        :param url: API path or absolute URL
+        :param parameters: Optional query parameters
+        :return: Decoded JSON payload and the URL of the next page, if any
+        """
+        key = (url, tuple(sorted((parameters or {}).items())))
+        entry = self._response_cache.get(key)
+        if entry is not None and self._response_cache.is_fresh(entry):
+            return entry[1]
+        
+        headers = {}
+        if entry is not None and entry[0]:
+            headers['If-None-Match'] = entry[0]
+        
+        for attempt in range(2):
+            self._wait_for_rate_limit()
+            try:
+                with self._request_semaphore:
+                    response_headers, payload = self._github._Github__requester.requestJsonAndCheck(
+                        'GET', url, parameters=parameters, headers=headers
+                    )
+                break
+            except GithubException as e:
+                self._record_rate_limit(e.headers or {})
+                delay = 0.0
+                if e.status in (403, 429):
+                    delay = _rate_limit_delay(e.headers or {}, self._rate_limit_floor)
+                
+                if attempt == 0 and delay > 0:
+                    # Throttled: wait exactly as long as GitHub asked, then retry once
+                    self._rate_limit_resume_at = time.time() + delay
+                    continue
+                
+                raise GitHubIntegrationError(
+                    f"GitHub request failed: {str(e)}",
+                    severity=ErrorSeverity.ERROR,
+                    context={'url': url}
+                )
+        
+        self._record_rate_limit(response_headers)
+        delay = _rate_limit_delay(response_headers, self._rate_limit_floor)
+        if delay > 0:
+            self._rate_limit_resume_at = time.time() + delay
+        
+        if payload is None and entry is not None:
+            # 304 Not Modified: the cached page is still current
+            page = entry[1]
+        else:
+            page = (payload, _next_page_url(response_headers))
+        
+        self._response_cache.set(key, page, response_headers.get('etag'))
+        return page
+
+    def _record_rate_limit(self, headers: Dict[str, Any]):
+        """
+        Remember the remaining request count reported by the last response.
+        
+        :param headers: Response headers (lower-cased keys)
+        """
+        remaining = headers.get('x-ratelimit-remaining')
+        if remaining is not None:
+            self._rate_limit_remaining = int(remaining)
+
+    def _wait_for_rate_limit(self):
+        """
+        Block until the token bucket and any announced rate limit reset allow
+        the next request.
+        """
+        delay = max(
+            self._rate_limit_bucket.reserve(),
+            self._rate_limit_resume_at - time.time()
+        )
+        if delay > 0:
+            self._logger.log(
+                f"Pausing {delay:.1f}s for GitHub rate limit",
+                level=ErrorSeverity.INFO,
+                extra={'delay': delay}
+            )
+            time.sleep(delay)
+
+    def check_rate_limit(self) -> int:
+        """
+        Get the number of core API requests remaining in the current window.
+        
+        :return: Remaining request count
+        """
+        return self._github.get_rate_limit().core.remaining
+
+    def has_rate_limit_headroom(self) -> bool:
+        """
+        Check whether enough quota remains for non-essential requests.
+        
+        :return: True if remaining requests exceed the configured threshold
+        """
+        remaining = self._rate_limit_remaining
+        if remaining is None:
+            # Nothing requested yet, so no response headers to go by
+            try:
+                remaining = self.check_rate_limit()
+            except GithubException:
+                return True
+        return remaining >= self._rate_limit_threshold
@@ -1,6 +1,13 @@
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Tuple, Union
 import uuid
 import json
+import copy
+import functools
+import hashlib
+import threading
+from functools import cached_property
+from collections import OrderedDict, deque
+from itertools import islice
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 from slack_sdk.socket_mode import SocketModeClient
@@ -16,10 +23,68 @@ class SlackIntegrationError(AgentError):
     """Exception raised for Slack integration-related errors."""
     pass
 
+@functools.lru_cache(maxsize=1)
+def _default_config_manager() -> ConfigManager:
+    """
+    Get the process-wide ConfigManager used when none is injected.
+    """
+    return ConfigManager()
+
+@functools.lru_cache(maxsize=1)
+def _default_credential_store() -> CredentialStore:
+    """
+    Get the process-wide CredentialStore used when none is injected.
+    """
+    return CredentialStore()
+
+@functools.lru_cache(maxsize=1)
+def _default_logger() -> StructuredLogger:
+    """
+    Get the process-wide StructuredLogger used when none is injected.
+    """
+    return StructuredLogger()
+
+# Bot tokens whose WebClient is kept for reuse; deployments use one or a few
+MAX_SHARED_WEB_CLIENTS = 8
+
+# Shared WebClients keyed by a digest of their bot token, least recently used first
+_web_clients: "OrderedDict[str, WebClient]" = OrderedDict()
+_web_clients_lock = threading.Lock()
+
+def _shared_web_client(bot_token: str) -> WebClient:
+    """
+    Get the WebClient shared by all SlackClients using the same bot token.
+    
+    Only the most recently used MAX_SHARED_WEB_CLIENTS are kept, so rotated
+    or per-tenant tokens do not stay in memory for the life of the process.
+    
+    :param bot_token: Slack Bot User OAuth Token
+    :return: Shared WebClient instance
+    """
+    key = hashlib.sha256(bot_token.encode()).hexdigest()
+    with _web_clients_lock:
+        client = _web_clients.get(key)
+        if client is None:
+            client = _web_clients[key] = WebClient(token=bot_token)
+        _web_clients.move_to_end(key)
+        while len(_web_clients) > MAX_SHARED_WEB_CLIENTS:
+            _web_clients.popitem(last=False)
+        return client
+
 class MessageFormatter:
     """
     Handles formatting of messages for optimal Slack interface presentation.
     """
+    @staticmethod
+    def format_text(text: str) -> Dict[str, Any]:
+        """
+        Format a plain text message without rich formatting.
+        
+        :param text: Basic text message
+        :return: Formatted message dictionary
+        """
+        return {"text": text}
+
     @staticmethod
     def format_message(
         text: str, 
@@ -34,7 +99,7 @@ class MessageFormatter:
         :param attachments: Optional message attachments
         :return: Formatted message dictionary
         """
-        message = {"text": text}
+        message = MessageFormatter.format_text(text)
         
         if blocks:
             message["blocks"] = blocks
@@ -44,18 +109,28 @@ class MessageFormatter:
         
         return message
 
+_MESSAGE_FORMATTER = MessageFormatter()
+
 class ConversationTracker:
     """
     Tracks Slack conversation threads and provides context management.
     """
-    def __init__(self, logger: Optional[StructuredLogger] = None):
+    __slots__ = ('_conversations', '_logger', '_max_history')
+
+    def __init__(
+        self, 
+        logger: Optional[StructuredLogger] = None,
+        max_history: int = 500
+    ):
         """
         Initialize conversation tracker.
         
         :param logger: Optional structured logger
+        :param max_history: Maximum number of messages kept per conversation
         """
-        self._conversations: Dict[str, Dict[str, Any]] = {}
-        self._logger = logger or StructuredLogger()
+        self._conversations: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._logger = logger or _default_logger()
+        self._max_history = max_history
 
     def track_conversation(
         self, 
@@ -70,25 +145,27 @@ class ConversationTracker:
         :param thread_ts: Thread timestamp
         :param message_data: Optional message metadata
         """
-        conversation_key = f"{channel_id}:{thread_ts or 'root'}"
+        conversation_key = (channel_id, thread_ts or '')
         
-        if conversation_key not in self._conversations:
-            self._conversations[conversation_key] = {
+        conversation = self._conversations.get(conversation_key)
+        if conversation is None:
+            conversation = self._conversations[conversation_key] = {
                 "channel_id": channel_id,
                 "thread_ts": thread_ts,
-                "messages": [],
+                "messages": deque(maxlen=self._max_history),
                 "metadata": {}
             }
         
         if message_data:
-            self._conversations[conversation_key]["messages"].append(message_data)
+            messages = conversation["messages"]
+            messages.append(message_data)
             
             self._logger.track_event(
                 "slack_conversation_tracked",
                 {
                     "channel_id": channel_id,
                     "thread_ts": thread_ts,
-                    "message_count": len(self._conversations[conversation_key]["messages"])
+                    "message_count": len(messages)
                 }
             )
 
@@ -106,17 +183,20 @@ class ConversationTracker:
         :param limit: Maximum number of messages to return
         :return: List of recent messages
         """
-        conversation_key = f"{channel_id}:{thread_ts or 'root'}"
+        conversation = self._conversations.get((channel_id, thread_ts or ''))
         
-        if conversation_key not in self._conversations:
+        if conversation is None:
             return []
         
-        return self._conversations[conversation_key]["messages"][-limit:]
+        messages = conversation["messages"]
+        return list(islice(messages, max(0, len(messages) - limit), None))
 
 class EventHandler:
     """
     Manages Slack events like mentions, messages, and interactions.
     """
+    __slots__ = ('_slack_client', '_conversation_tracker', '_logger')
+
     def __init__(
         self, 
         slack_client: 'SlackClient',
@@ -132,13 +212,7 @@ class EventHandler:
         """
         self._slack_client = slack_client
         self._conversation_tracker = conversation_tracker or ConversationTracker()
-        self._logger = logger or StructuredLogger()
-        
-        # Event type to handler mapping
-        self._event_handlers = {
-            "message": self._handle_message,
-            "app_mention": self._handle_mention
-        }
+        self._logger = logger or _default_logger()
 
     def handle_event(self, event: Dict[str, Any]):
         """
@@ -148,50 +222,43 @@ class EventHandler:
         """
         event_type = event.get("type")
         
-        if event_type in self._event_handlers:
-            try:
-                self._event_handlers[event_type](event)
-            except Exception as e:
-                self._logger.log(
-                    f"Error handling {event_type} event",
-                    level=ErrorSeverity.WARNING.value,
-                    extra={
-                        "event_type": event_type,
-                        "error": str(e)
-                    }
-                )
-        else:
+        try:
+            match event_type:
+                case "message":
+                    self._handle(event, event.get("channel"), event.get("thread_ts"), False)
+                case "app_mention":
+                    self._handle(event, event.get("channel"), event.get("thread_ts"), True)
+                case _:
+                    self._logger.log(
+                        f"Unhandled event type: {event_type}",
+                        level=ErrorSeverity.INFO,
+                        extra={"event_type": event_type}
+                    )
+        except Exception as e:
             self._logger.log(
-                f"Unhandled event type: {event_type}",
-                level=ErrorSeverity.INFO.value,
-                extra={"event_type": event_type}
+                f"Error handling {event_type} event",
+                level=ErrorSeverity.WARNING,
+                extra={
+                    "event_type": event_type,
+                    "error": str(e)
+                }
             )
 
-    def _handle_message(self, event: Dict[str, Any]):
-        """
-        Handle standard message events.
-        
-        :param event: Message event payload
-        """
-        channel_id = event.get("channel")
-        thread_ts = event.get("thread_ts")
-        
-        self._conversation_tracker.track_conversation(
-            channel_id, 
-            thread_ts, 
-            event
-        )
-
-    def _handle_mention(self, event: Dict[str, Any]):
+    def _handle(
+        self, 
+        event: Dict[str, Any], 
+        channel_id: Optional[str], 
+        thread_ts: Optional[str], 
+        is_mention: bool
+    ):
         """
-        Handle app mention events.
+        Handle message and app mention events.
         
-        :param event: App mention event payload
+        :param event: Event payload
+        :param channel_id: Slack channel ID
+        :param thread_ts: Thread timestamp
+        :param is_mention: Whether the event is an app mention
         """
-        channel_id = event.get("channel")
-        thread_ts = event.get("thread_ts")
-        
-        # Additional processing for mentions
         self._conversation_tracker.track_conversation(
             channel_id, 
             thread_ts, 
@@ -222,22 +289,16 @@ class SlackClient:
         self._bot_token = bot_token
         self._app_token = app_token
         
-        # Initialize Slack WebClient
-        self._web_client = WebClient(token=bot_token)
+        # Share one WebClient per token across clients
+        self._web_client = _shared_web_client(bot_token)
         
         # Optional components
-        self._config_manager = config_manager or ConfigManager()
-        self._credential_store = credential_store or CredentialStore()
-        self._logger = logger or StructuredLogger()
+        self._config_manager = config_manager or _default_config_manager()
+        self._credential_store = credential_store or _default_credential_store()
+        self._logger = logger or _default_logger()
         
-        # Initialize sub-components
-        self._conversation_tracker = ConversationTracker(self._logger)
-        self._message_formatter = MessageFormatter()
-        self._event_handler = EventHandler(
-            self, 
-            self._conversation_tracker, 
-            self._logger
-        )
+        # Stateless formatter shared by all clients
+        self._message_formatter = _MESSAGE_FORMATTER
         
         # Socket Mode client for real-time events (optional)
         self._socket_mode_client = None
@@ -246,13 +307,43 @@ class SlackClient:
                 app_token=app_token,
                 web_client=self._web_client
             )
+        
+        # Pre-serialized Block Kit templates by name
+        self._block_templates: Dict[str, str] = {}
+
+    # Sub-components are built on first access
+    @cached_property
+    def _conversation_tracker(self) -> ConversationTracker:
+        return ConversationTracker(self._logger)
+
+    @cached_property
+    def _event_handler(self) -> EventHandler:
+        return EventHandler(
+            self, 
+            self._conversation_tracker, 
+            self._logger
+        )
+
+    def register_template(
+        self, 
+        name: str, 
+        blocks: List[Dict[str, Any]]
+    ):
+        """
+        Register a reusable Block Kit template, serialized once up front.
+        
+        :param name: Template name
+        :param blocks: Slack Block Kit blocks
+        """
+        self._block_templates[name] = json.dumps(blocks, separators=(',', ':'))
 
     def send_message(
         self, 
         channel: str, 
         text: str, 
         thread_ts: Optional[str] = None,
-        blocks: Optional[List[Dict[str, Any]]] = None
+        blocks: Optional[List[Dict[str, Any]]] = None,
+        template: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Send a message to a Slack channel.
@@ -261,12 +352,25 @@ class SlackClient:
         :param text: Message text
         :param thread_ts: Optional thread timestamp for threaded messages
         :param blocks: Optional Slack Block Kit blocks
+        :param template: Optional name of a registered block template
         :return: API response
         """
         try:
-            formatted_message = self._message_formatter.format_message(
-                text, blocks=blocks
-            )
+            if template is not None:
+                if template not in self._block_templates:
+                    raise SlackIntegrationError(
+                        f"Unknown message template: {template}",
+                        severity=ErrorSeverity.ERROR
+                    )
+                formatted_message = self._message_formatter.format_text(text)
+                formatted_message["blocks"] = self._block_templates[template]
+            elif blocks is None:
+                # Plain text fast path
+                formatted_message = self._message_formatter.format_text(text)
+            else:
+                formatted_message = self._message_formatter.format_message(
+                    text, blocks=blocks
+                )
             
             response = self._web_client.chat_postMessage(
                 channel=channel,
@@ -322,6 +426,23 @@ class SlackClient:
             {"app_token": bool(self._app_token)}
         )
 
+# Base manifest layout, copied and filled in per app
+_MANIFEST_SKELETON: Dict[str, Any] = {
+    "display_information": {
+        "name": ""
+    },
+    "features": {
+        "bot_user": {
+            "display_name": ""
+        }
+    },
+    "oauth_config": {
+        "scopes": {
+            "bot": []
+        }
+    }
+}
+
 class AppManifestGenerator:
     """
     Generates dynamic Slack app manifests for configuration and deployment.
@@ -342,29 +463,19 @@ class AppManifestGenerator:
         :param socket_mode: Enable Socket Mode
         :return: Slack app manifest dictionary
         """
-        manifest = {
-            "display_information": {
-                "name": app_name
-            },
-            "features": {
-                "bot_user": {
-                    "display_name": app_name
+        manifest = copy.deepcopy(_MANIFEST_SKELETON)
+        manifest["display_information"]["name"] = app_name
+        manifest["features"]["bot_user"]["display_name"] = app_name
+        manifest["oauth_config"]["scopes"]["bot"] = bot_scopes
+        
+        manifest["features"].update({
+            **({
+                "event_subscriptions": {
+                    "request_url": "",  # Replace with your event endpoint
+                    "bot_events": event_subscriptions
                 }
-            },
-            "oauth_config": {
-                "scopes": {
-                    "bot": bot_scopes
-                }
-            }
-        }
-        
-        if event_subscriptions:
-            manifest["features"]["event_subscriptions"] = {
-                "request_url": "",  # Replace with your event endpoint
-                "bot_events": event_subscriptions
-            }
-        
-        if socket_mode:
-            manifest["features"]["socket_mode_enabled"] = True
+            } if event_subscriptions else {}),
+            **({"socket_mode_enabled": True} if socket_mode else {})
+        })
         
         return manifest
@@ -1,4 +1,6 @@
 from typing import Dict, Any, Optional
+import logging
+from core.structured_logger import StructuredLogger
 from .memory_system import AutonomosMemorySystem
 
 class BaseAgent:
@@ -14,6 +16,7 @@ class BaseAgent:
                  memory_path: Optional[str] = None, 
                  temperature: float = 0.7, 
                  llm_model: Optional[str] = None, 
+                 logger: Optional[StructuredLogger] = None,
                  **kwargs):
         """
         Initialize the base agent with a name, description, and optional parameters.
@@ -23,10 +26,12 @@ class BaseAgent:
         :param memory_path: Optional path to load persistent memory from
         :param temperature: Temperature for language model (default 0.7)
         :param llm_model: Language model to use (optional)
+        :param logger: Optional structured logger (created on first use)
         :param kwargs: Additional configuration parameters
         """
         self.name = name
         self.description = description
+        self._logger = logger
         
         # Add temperature and model attributes
         self.temperature = temperature
@@ -47,7 +52,27 @@ class BaseAgent:
             try:
                 self.memory.load_memory(memory_path)
             except Exception as e:
-                print(f"Error loading memory for {name}: {e}")
+                self.logger.log(
+                    "agent_memory_load_failed",
+                    level=logging.WARNING,
+                    extra={
+                        "agent": name,
+                        "memory_path": memory_path,
+                        "error": str(e)
+                    }
+                )
+
+    @property
+    def logger(self) -> StructuredLogger:
+        """
+        Structured logger for the agent, created lazily so agents that
+        never log do not open a log file.
+        
+        :return: Structured logger
+        """
+        if self._logger is None:
+            self._logger = StructuredLogger()
+        return self._logger
 
     def process_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -56,12 +81,9 @@ class BaseAgent:
         :param task: Dictionary containing task details
         :return: Dictionary with task processing results
         """
-        # Add task context to memory
+        # Add task context to memory and retrieve relevant context for it
         task_context = f"Task: {task.get('description', 'Unnamed Task')}"
-        self.memory.add_context(task_context)
-        
-        # Retrieve relevant context for task
-        context_results = self.memory.retrieve_context(task_context)
+        context_results = self.memory.add_and_retrieve(task_context)
         
         # Placeholder for task processing logic with memory-enhanced context
         return {
@@ -84,11 +106,8 @@ class BaseAgent:
         :param input_text: Input text for the agent
         :return: Dictionary containing the agent's response
         """
-        # Add input context to memory
-        self.memory.add_context(input_text)
-        
-        # Retrieve context
-        context_results = self.memory.retrieve_context(input_text)
+        # Add input context to memory and retrieve context
+        context_results = self.memory.add_and_retrieve(input_text)
         
         # Placeholder response generation
         return {
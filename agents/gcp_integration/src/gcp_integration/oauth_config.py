@@ -2,6 +2,9 @@ import os
 import json
 from pathlib import Path
 
+# Ubicación por defecto de las credenciales, junto a este módulo
+_DEFAULT_CREDENTIALS_PATH = Path(__file__).resolve().parent / 'credentials.json'
+
 class GoogleOAuthConfig:
     """
     Gestión segura de credenciales OAuth para Google Workspace
@@ -14,14 +17,17 @@ class GoogleOAuthConfig:
             credentials_path (str, optional): Ruta al archivo de credenciales
         """
         if not credentials_path:
-            credentials_path = Path(__file__).parent / 'credentials.json'
+            credentials_path = _DEFAULT_CREDENTIALS_PATH
         
         self.credentials_path = Path(credentials_path)
-        self._validate_credentials()
+        self._creds = self._validate_credentials()
     
     def _validate_credentials(self):
         """
         Validar la existencia y formato de las credenciales
+        
+        Returns:
+            dict: Credenciales OAuth ya parseadas
         """
         if not self.credentials_path.exists():
             raise FileNotFoundError(f"Archivo de credenciales no encontrado: {self.credentials_path}")
@@ -40,6 +46,8 @@ class GoogleOAuthConfig:
         
         except json.JSONDecodeError:
             raise ValueError("Formato de credenciales inválido")
+        
+        return credentials
     
     def get_credentials(self):
         """
@@ -48,8 +56,7 @@ class GoogleOAuthConfig:
         Returns:
             dict: Credenciales OAuth
         """
-        with open(self.credentials_path, 'r') as f:
-            return json.load(f)
+        return self._creds
     
     def get_client_id(self):
         """
@@ -58,7 +65,7 @@ class GoogleOAuthConfig:
         Returns:
             str: Client ID de Google
         """
-        return self.get_credentials()['installed']['client_id']
+        return self._creds['installed']['client_id']
     
     def get_client_secret(self):
         """
@@ -67,4 +74,4 @@ class GoogleOAuthConfig:
         Returns:
             str: Client Secret de Google
         """
-        return self.get_credentials()['installed']['client_secret']
+        return self._creds['installed']['client_secret']
@@ -4,10 +4,13 @@ Flujo de autorización OAuth para Google Workspace.
 import os
 import json
 import pickle
+import tempfile
 from pathlib import Path
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
+
+# Ubicaciones por defecto de credenciales y token, junto a este módulo
+_HERE = Path(__file__).resolve().parent
+_DEFAULT_CREDENTIALS_PATH = _HERE / 'credentials.json'
+_DEFAULT_TOKEN_PATH = _HERE / 'token.json'
 
 class GoogleOAuthFlow:
     """
@@ -24,10 +27,10 @@ class GoogleOAuthFlow:
             scopes (list, optional): Lista de permisos requeridos
         """
         if not credentials_path:
-            credentials_path = Path(__file__).parent / 'credentials.json'
+            credentials_path = _DEFAULT_CREDENTIALS_PATH
         
         if not token_path:
-            token_path = Path(__file__).parent / 'token.pickle'
+            token_path = _DEFAULT_TOKEN_PATH
         
         if not scopes:
             scopes = [
@@ -38,6 +41,11 @@ class GoogleOAuthFlow:
         
         self.credentials_path = Path(credentials_path)
         self.token_path = Path(token_path)
+        
+        # Los tokens se guardan como JSON; token.pickle solo se lee para migrarlo
+        if self.token_path.suffix == '.pickle':
+            self.token_path = self.token_path.with_suffix('.json')
+        self.legacy_token_path = self.token_path.with_suffix('.pickle')
         self.scopes = scopes
         self.creds = None
     
@@ -49,23 +57,63 @@ class GoogleOAuthFlow:
         Returns:
             google.oauth2.credentials.Credentials: Credenciales OAuth
         """
-        # Verificar si ya tenemos un token guardado
-        if self.token_path.exists():
+        # Importados aquí para que importar este módulo no cargue las librerías de Google
+        from google.oauth2.credentials import Credentials
+        
+        # Verificar si ya tenemos un token guardado (abrir directamente evita
+        # la carrera entre exists() y open() con varios workers)
+        try:
             with open(self.token_path, 'rb') as token:
-                self.creds = pickle.load(token)
+                self.creds = Credentials.from_authorized_user_info(
+                    json.load(token), self.scopes)
+        except FileNotFoundError:
+            self._migrate_legacy_token()
         
         # Si no hay credenciales válidas, obtenerlas
         if not self.creds or not self.creds.valid:
             if self.creds and self.creds.expired and self.creds.refresh_token:
+                from google.auth.transport.requests import Request
                 self.creds.refresh(Request())
             else:
                 # Iniciar flujo de autorización
+                from google_auth_oauthlib.flow import InstalledAppFlow
                 flow = InstalledAppFlow.from_client_secrets_file(
                     str(self.credentials_path), self.scopes)
                 self.creds = flow.run_local_server(port=0)
             
             # Guardar las credenciales para la próxima vez
-            with open(self.token_path, 'wb') as token:
-                pickle.dump(self.creds, token)
+            self._save_token()
         
         return self.creds
+    
+    def _save_token(self):
+        """
+        Guardar las credenciales actuales como JSON.
+        
+        Se escribe en un archivo temporal y se renombra con os.replace, de modo
+        que otros procesos nunca lean un token a medio escribir.
+        """
+        with tempfile.NamedTemporaryFile(
+            'w', dir=self.token_path.parent, suffix='.tmp', delete=False
+        ) as token:
+            token.write(self.creds.to_json())
+        
+        try:
+            os.replace(token.name, self.token_path)
+        except OSError:
+            os.unlink(token.name)
+            raise
+    
+    def _migrate_legacy_token(self):
+        """
+        Migrar un token.pickle heredado a token.json y eliminar el pickle,
+        si existe.
+        """
+        try:
+            with open(self.legacy_token_path, 'rb') as token:
+                self.creds = pickle.load(token)
+        except FileNotFoundError:
+            return
+        
+        self._save_token()
+        self.legacy_token_path.unlink(missing_ok=True)
@@ -1,20 +1,248 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from pathlib import Path
 import os
 import json
 import base64
-from googleapiclient.discovery import build
-from llama_index.readers.google import GoogleDocsReader, GoogleSheetsReader
+import binascii
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from .oauth_config import GoogleOAuthConfig
 from .oauth_flow import GoogleOAuthFlow
 
-class GMailLoader:
+# Gmail accepts at most 100 calls per batch request
+_BATCH_SIZE = 100
+
+# Priority keywords, matched case-insensitively against the subject
+_HIGH_PRIORITY_RE = re.compile(r"urgente|importante|inmediato|critical|urgent", re.IGNORECASE)
+_MEDIUM_PRIORITY_RE = re.compile(r"reunión|proyecto|informe|meeting|report", re.IGNORECASE)
+
+# Gmail returns at most 500 message IDs per list page
+_LIST_PAGE_SIZE = 500
+
+# Upper bound on concurrent individual fetches for messages a batch failed to return
+_MAX_FALLBACK_WORKERS = 10
+
+# Response fields requested from Gmail; everything else is stripped server-side
+_LIST_FIELDS = 'messages/id,nextPageToken'
+_METADATA_FIELDS = 'id,payload/headers'
+_FULL_FIELDS = 'id,payload(headers,mimeType,body/data,parts)'
+
+def _list_message_ids(service, query: str, max_results: int) -> List[str]:
     """
-    Loader for Gmail emails with intelligent filtering and priority classification.
+    List the IDs of messages matching a query, following pages as needed.
+    
+    Args:
+        service: Gmail API service
+        query (str): Gmail search query
+        max_results (int): Maximum number of IDs to return
+    
+    Returns:
+        List[str]: Message IDs, newest first
+    """
+    message_ids = []
+    page_token = None
+    
+    while len(message_ids) < max_results:
+        results = service.users().messages().list(
+            userId='me',
+            q=query,
+            maxResults=min(_LIST_PAGE_SIZE, max_results - len(message_ids)),
+            pageToken=page_token,
+            fields=_LIST_FIELDS
+        ).execute()
+        
+        message_ids.extend(message['id'] for message in results.get('messages', []))
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            break
+    
+    return message_ids
+
+def _message_request(service, message_id: str, include_body: bool):
     """
+    Build a messages.get request, asking only for headers unless the body is needed.
+    
+    Args:
+        service: Gmail API service
+        message_id (str): ID of the message
+        include_body (bool): Whether the message body is needed
+    
+    Returns:
+        HttpRequest: Unexecuted Gmail API request
+    """
+    if include_body:
+        return service.users().messages().get(
+            userId='me',
+            id=message_id,
+            format='full',
+            fields=_FULL_FIELDS
+        )
+    
+    return service.users().messages().get(
+        userId='me',
+        id=message_id,
+        format='metadata',
+        metadataHeaders=['Subject', 'From'],
+        fields=_METADATA_FIELDS
+    )
+
+def _batch_get_messages(
+    service, 
+    message_ids: List[str], 
+    include_body: bool = True
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch Gmail messages with batch requests instead of one HTTP call each.
+    
+    Args:
+        service: Gmail API service
+        message_ids (List[str]): IDs of the messages to fetch
+        include_body (bool): Whether to fetch message bodies or only headers
+    
+    Returns:
+        Dict[str, Dict[str, Any]]: Messages keyed by ID; failed fetches are omitted
+    """
+    fetched = {}
+    
+    def callback(request_id, response, exception):
+        if exception is None:
+            fetched[request_id] = response
+    
+    for start in range(0, len(message_ids), _BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=callback)
+        for message_id in message_ids[start:start + _BATCH_SIZE]:
+            batch.add(
+                _message_request(service, message_id, include_body),
+                request_id=message_id
+            )
+        batch.execute()
+    
+    missing = [message_id for message_id in message_ids if message_id not in fetched]
+    if missing:
+        fetched.update(_fetch_individually(service, missing, include_body))
+    
+    return fetched
+
+def _fetch_individually(
+    service, 
+    message_ids: List[str], 
+    include_body: bool
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Retry messages one by one, concurrently, after a batch failed to return them.
+    
+    httplib2 connections are not thread-safe, so each worker thread reuses
+    its own authorized connection.
+    
+    Args:
+        service: Gmail API service
+        message_ids (List[str]): IDs of the messages to fetch
+        include_body (bool): Whether to fetch message bodies or only headers
+    
+    Returns:
+        Dict[str, Dict[str, Any]]: Messages keyed by ID; failed fetches are omitted
+    """
+    import google_auth_httplib2
+    import httplib2
+    from googleapiclient.errors import HttpError
+    
+    credentials = service._http.credentials
+    local = threading.local()
+    
+    def fetch(message_id):
+        if not hasattr(local, 'http'):
+            local.http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+        try:
+            return message_id, _message_request(service, message_id, include_body).execute(http=local.http)
+        except HttpError:
+            return message_id, None
+    
+    workers = min(_MAX_FALLBACK_WORKERS, len(message_ids))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(fetch, message_ids)
+        return {message_id: msg for message_id, msg in results if msg is not None}
+
+def _classify_subject(subject: str) -> str:
+    """
+    Classify email priority from its subject.
+    
+    Args:
+        subject (str): Email subject
+    
+    Returns:
+        str: Priority level
+    """
+    if _HIGH_PRIORITY_RE.search(subject):
+        return "Alta"
+    elif _MEDIUM_PRIORITY_RE.search(subject):
+        return "Media"
+    else:
+        return "Baja"
+
+def _iter_text_parts(payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Walk a message payload depth-first, yielding text/plain parts at any nesting level.
+    
+    Args:
+        payload (Dict[str, Any]): Gmail message payload
+    
+    Yields:
+        Dict[str, Any]: text/plain parts carrying body data, in document order
+    """
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        mime_type = part.get('mimeType', '')
+        if mime_type.startswith('multipart/'):
+            # Reversed so parts are popped in their original order
+            stack.extend(reversed(part.get('parts', [])))
+        elif mime_type == 'text/plain' and 'data' in part.get('body', {}):
+            yield part
+
+def _extract_text(payload: Dict[str, Any]) -> str:
+    """
+    Decode the first plain-text body of a message.
+    
+    Args:
+        payload (Dict[str, Any]): Gmail message payload
+    
+    Returns:
+        str: Decoded text, or an empty string if the message has none
+    """
+    part = next(_iter_text_parts(payload), None)
+    if part is None:
+        # Single-part messages carry their body on the payload itself
+        if 'parts' in payload or 'data' not in payload.get('body', {}):
+            return ""
+        part = payload
+    
+    # A malformed body must not abort the whole load, so undecodable
+    # base64 yields no content and invalid UTF-8 is replaced
+    data = part['body']['data']
+    try:
+        raw = base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+    except binascii.Error:
+        return ""
+    return raw.decode('utf-8', errors='replace')
+
+class _GmailLoaderBase:
+    """
+    Shared Gmail loading logic; subclasses provide user-facing messages
+    in their own language.
+    """
+    # User-facing strings, overridden per language
+    _MESSAGES = {
+        'no_subject': 'No subject',
+        'unknown_sender': 'Unknown sender',
+        'no_messages': 'No messages found.',
+        'load_error': 'Error loading emails: {error}'
+    }
+    
     def __init__(self, credentials_path: Optional[str] = None, token_path: Optional[str] = None):
         """
-        Initialize the Gmail loader with OAuth 2.0 credentials.
+        Initialize the loader with OAuth 2.0 credentials.
         
         Args:
             credentials_path (str, optional): Path to OAuth credentials file
@@ -30,68 +258,73 @@ class GMailLoader:
             token_path=token_path
         )
     
-    def load_emails(self, query: str = "in:inbox", max_results: int = 10) -> List[Dict[str, Any]]:
+    @cached_property
+    def service(self):
+        """
+        Gmail API service, built once from the bundled discovery document.
+        
+        Returns:
+            Resource: Gmail API service
+        """
+        # Imported here so importing this module does not load the Google client stack
+        from googleapiclient.discovery import build
+        
+        return build(
+            'gmail', 'v1',
+            credentials=self.oauth_flow.get_credentials(),
+            cache_discovery=False,
+            static_discovery=True
+        )
+    
+    def _load_emails(
+        self, 
+        query: str, 
+        max_results: int, 
+        include_body: bool
+    ) -> List[Dict[str, Any]]:
         """
         Load emails with smart filtering.
         
         Args:
             query (str): Gmail search query
             max_results (int): Maximum number of emails to retrieve
+            include_body (bool): Fetch message bodies; when False only
+                Subject and From are fetched and content is left empty
         
         Returns:
             List[Dict[str, Any]]: List of processed emails
         """
         try:
-            # Get valid OAuth credentials
-            creds = self.oauth_flow.get_credentials()
-            
-            # Create Gmail service
-            service = build('gmail', 'v1', credentials=creds)
+            # Reuse the Gmail service across calls
+            service = self.service
             
-            # Get list of messages
-            results = service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=max_results
-            ).execute()
+            # Get list of message IDs
+            message_ids = _list_message_ids(service, query, max_results)
             
-            messages = results.get('messages', [])
-            
-            if not messages:
-                print("No messages found.")
+            if not message_ids:
+                print(self._MESSAGES['no_messages'])
                 return []
             
-            # Process and prioritize emails
+            # Get message details in batches
+            fetched = _batch_get_messages(service, message_ids, include_body)
+            
+            # Process and prioritize emails, building each record in one literal
             processed_emails = []
-            for message in messages:
-                # Get message details
-                msg = service.users().messages().get(
-                    userId='me',
-                    id=message['id'],
-                    format='full'
-                ).execute()
+            for message_id in message_ids:
+                msg = fetched.get(message_id)
+                if msg is None:
+                    continue
                 
                 # Extract headers
-                headers = msg['payload']['headers']
-                subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No subject')
-                sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown sender')
+                headers = {h['name']: h['value'] for h in msg['payload']['headers']}
+                subject = headers.get('Subject', self._MESSAGES['no_subject'])
+                sender = headers.get('From', self._MESSAGES['unknown_sender'])
                 
                 # Extract content
-                content = ""
-                if 'parts' in msg['payload']:
-                    for part in msg['payload']['parts']:
-                        if part['mimeType'] == 'text/plain':
-                            if 'data' in part['body']:
-                                content = base64.urlsafe_b64decode(
-                                    part['body']['data']).decode('utf-8')
-                                break
-                elif 'body' in msg['payload'] and 'data' in msg['payload']['body']:
-                    content = base64.urlsafe_b64decode(
-                        msg['payload']['body']['data']).decode('utf-8')
+                content = _extract_text(msg['payload'])
                 
-                # Create email object
-                email = {
-                    "id": message['id'],
+                processed_emails.append({
+                    "id": message_id,
                     "subject": subject,
                     "sender": sender,
                     "content": content[:500],  # Limited excerpt
@@ -99,17 +332,17 @@ class GMailLoader:
                         "subject": subject,
                         "from": sender
                     },
-                    "page_content": content
-                }
-                
-                # Classify priority
-                email["priority"] = self._classify_email_priority(email)
-                
-                processed_emails.append(email)
+                    "page_content": content,
+                    "priority": _classify_subject(subject)
+                })
             
             return processed_emails
         except Exception as e:
-            print(f"Error loading emails: {e}")
+            from googleapiclient.errors import HttpError
+            if isinstance(e, HttpError) and e.resp.status == 401:
+                # Rebuild the service with fresh credentials next time
+                self.__dict__.pop('service', None)
+            print(self._MESSAGES['load_error'].format(error=e))
             return []
     
     def _classify_email_priority(self, email) -> str:
@@ -117,155 +350,73 @@ class GMailLoader:
         Classify email priority.
         
         Args:
-            email: Email to classify
+            email: Email to classify, as a dictionary or an object with metadata
         
         Returns:
             str: Priority level
         """
-        # Simple priority classification
-        keywords_high = ["urgente", "importante", "inmediato", "critical", "urgent"]
-        keywords_medium = ["reunión", "proyecto", "informe", "meeting", "report"]
-        
-        subject = email.get("metadata", {}).get("subject", "").lower()
-        
-        if any(keyword in subject for keyword in keywords_high):
-            return "Alta"
-        elif any(keyword in subject for keyword in keywords_medium):
-            return "Media"
+        # Handle both dictionary and object-like inputs
+        if hasattr(email, 'metadata'):
+            subject = email.metadata.get('subject', '')
+        elif isinstance(email, dict):
+            subject = email.get("metadata", {}).get("subject", "")
         else:
-            return "Baja"
+            subject = ""
+        
+        return _classify_subject(subject)
 
-class WorkspaceLoader:
+class GMailLoader(_GmailLoaderBase):
     """
-    Integración de servicios de Google Workspace con capacidades de lectura limitada.
-    Sigue los principios de mínimo privilegio y solo lectura.
+    Loader for Gmail emails with intelligent filtering and priority classification.
     """
-    
-    def __init__(self, credentials_path: Optional[str] = None, token_path: Optional[str] = None):
+    def load_emails(
+        self, 
+        query: str = "in:inbox", 
+        max_results: int = 10, 
+        include_body: bool = True
+    ) -> List[Dict[str, Any]]:
         """
-        Inicializar el loader con credenciales OAuth 2.0.
+        Load emails with smart filtering.
         
         Args:
-            credentials_path (str, optional): Ruta al archivo de credenciales OAuth
-            token_path (str, optional): Ruta al archivo de token OAuth
-        """
-        # Usar configuración de OAuth para manejar credenciales
-        self.oauth_config = GoogleOAuthConfig(credentials_path)
-        self.credentials_path = self.oauth_config.credentials_path
+            query (str): Gmail search query
+            max_results (int): Maximum number of emails to retrieve
+            include_body (bool): Fetch message bodies; when False only
+                Subject and From are fetched and content is left empty
         
-        # Inicializar flujo de autorización OAuth
-        self.oauth_flow = GoogleOAuthFlow(
-            credentials_path=str(self.credentials_path),
-            token_path=token_path
-        )
+        Returns:
+            List[Dict[str, Any]]: List of processed emails
+        """
+        return self._load_emails(query, max_results, include_body)
+
+class WorkspaceLoader(_GmailLoaderBase):
+    """
+    Integración de servicios de Google Workspace con capacidades de lectura limitada.
+    Sigue los principios de mínimo privilegio y solo lectura.
+    """
+    _MESSAGES = {
+        'no_subject': 'Sin asunto',
+        'unknown_sender': 'Remitente desconocido',
+        'no_messages': 'No se encontraron mensajes.',
+        'load_error': 'Error al cargar correos: {error}'
+    }
     
-    def load_gmail_emails(self, query: str = "in:inbox", max_results: int = 10) -> List[Dict[str, Any]]:
+    def load_gmail_emails(
+        self, 
+        query: str = "in:inbox", 
+        max_results: int = 10, 
+        include_body: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         Cargar correos electrónicos con filtrado inteligente.
         
         Args:
             query (str): Filtro de búsqueda de Gmail
             max_results (int): Número máximo de correos a recuperar
+            include_body (bool): Descargar el cuerpo de los correos; si es False
+                solo se obtienen Subject y From y el contenido queda vacío
         
         Returns:
             List[Dict[str, Any]]: Lista de correos electrónicos procesados
         """
-        try:
-            # Obtener credenciales OAuth válidas
-            creds = self.oauth_flow.get_credentials()
-            
-            # Crear servicio de Gmail
-            service = build('gmail', 'v1', credentials=creds)
-            
-            # Obtener lista de mensajes
-            results = service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=max_results
-            ).execute()
-            
-            messages = results.get('messages', [])
-            
-            if not messages:
-                print("No se encontraron mensajes.")
-                return []
-            
-            # Procesar y priorizar correos
-            processed_emails = []
-            for message in messages:
-                # Obtener detalles del mensaje
-                msg = service.users().messages().get(
-                    userId='me',
-                    id=message['id'],
-                    format='full'
-                ).execute()
-                
-                # Extraer headers
-                headers = msg['payload']['headers']
-                subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'Sin asunto')
-                sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Remitente desconocido')
-                
-                # Extraer contenido
-                content = ""
-                if 'parts' in msg['payload']:
-                    for part in msg['payload']['parts']:
-                        if part['mimeType'] == 'text/plain':
-                            if 'data' in part['body']:
-                                content = base64.urlsafe_b64decode(
-                                    part['body']['data']).decode('utf-8')
-                                break
-                elif 'body' in msg['payload'] and 'data' in msg['payload']['body']:
-                    content = base64.urlsafe_b64decode(
-                        msg['payload']['body']['data']).decode('utf-8')
-                
-                # Crear objeto de correo
-                email = {
-                    "id": message['id'],
-                    "subject": subject,
-                    "sender": sender,
-                    "content": content[:500],  # Extracto limitado
-                    "metadata": {
-                        "subject": subject,
-                        "from": sender
-                    },
-                    "page_content": content
-                }
-                
-                # Clasificar prioridad
-                email["priority"] = self._classify_email_priority(email)
-                
-                processed_emails.append(email)
-            
-            return processed_emails
-        except Exception as e:
-            print(f"Error al cargar correos: {e}")
-            return []
-    
-    def _classify_email_priority(self, email) -> str:
-        """
-        Clasificar prioridad de correo electrónico.
-        
-        Args:
-            email: Correo electrónico a clasificar
-        
-        Returns:
-            str: Nivel de prioridad
-        """
-        # Implementación simple de clasificación de prioridad
-        keywords_high = ["urgente", "importante", "inmediato", "critical", "urgent"]
-        keywords_medium = ["reunión", "proyecto", "informe", "meeting", "report"]
-        
-        # Handle both dictionary and object-like inputs
-        if hasattr(email, 'metadata'):
-            subject = email.metadata.get('subject', '').lower()
-        elif isinstance(email, dict):
-            subject = email.get("metadata", {}).get("subject", "").lower()
-        else:
-            subject = ""
-        
-        if any(keyword in subject for keyword in keywords_high):
-            return "Alta"
-        elif any(keyword in subject for keyword in keywords_medium):
-            return "Media"
-        else:
-            return "Baja"
+        return self._load_emails(query, max_results, include_body)
@@ -1,17 +1,144 @@
 from typing import Dict, Any, List, Optional, Union
 import os
 import json
+import sqlite3
+import threading
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+MEMORY_DB_FILENAME = "mem.db"
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize to JSON, using orjson when available
+    
+    :param obj: Object to serialize; non-string dict keys are stringified
+    :return: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    if isinstance(obj, dict):
+        obj = {str(k): v for k, v in obj.items()}
+    return json.dumps(obj).encode()
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """
+    Deserialize JSON, using orjson when available
+    
+    :param data: JSON document
+    :return: Decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 class AutonomosMemorySystem:
-    def __init__(self, llm=None):
+    def __init__(
+        self, 
+        llm=None, 
+        embedding_model: Optional[str] = None,
+        json_storage: bool = False
+    ):
         """
         Initialize the simplified memory system for Autonomos AI Agents
         
         :param llm: Language model for memory processing (not used in simplified version)
+        :param embedding_model: Sentence-transformers model for semantic retrieval,
+            e.g. DEFAULT_EMBEDDING_MODEL; None (the default, also forced by
+            DISABLE_VECTOR_INDEX=true) returns the most recent history
+        :param json_storage: Persist with full JSON rewrites instead of the
+            incremental SQLite store (compatibility mode)
         """
         # Simple conversation history
         self.conversation_history = []
         self.context_metadata = {}
+        
+        # Incremental SQLite store, bound on first save/load
+        self._json_storage = json_storage
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+        
+        # The connection is shared across threads (agents call in via
+        # asyncio.to_thread), so every use of it is serialized
+        self._db_lock = threading.RLock()
+        
+        # Normalized embeddings for conversation_history, grown by doubling;
+        # only the first _embedded_count rows are valid
+        if os.environ.get('DISABLE_VECTOR_INDEX', '').lower() == 'true':
+            embedding_model = None
+        self._embedding_model_name = embedding_model
+        self._embedding_model = None
+        self._embeddings: Optional[np.ndarray] = None
+        self._embedded_count = 0
+    
+    def _get_embedding_model(self):
+        """
+        Lazily load the sentence embedding model
+        
+        :return: Embedding model, or None if semantic retrieval is unavailable
+        """
+        if self._embedding_model is None and self._embedding_model_name:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                self._embedding_model_name = None
+                return None
+            self._embedding_model = SentenceTransformer(self._embedding_model_name)
+        return self._embedding_model
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts into unit-length float32 vectors so cosine similarity is a dot product
+        
+        :param texts: Texts to encode
+        :return: Array of shape (len(texts), dim)
+        """
+        return np.asarray(
+            self._embedding_model.encode(texts, normalize_embeddings=True),
+            dtype=np.float32
+        )
+    
+    def _sync_embeddings(self):
+        """
+        Embed any history entries added since the last retrieval in one batch
+        """
+        pending = self.conversation_history[self._embedded_count:]
+        if not pending:
+            return
+        
+        vectors = self._encode(pending)
+        needed = self._embedded_count + len(vectors)
+        
+        if self._embeddings is None:
+            self._embeddings = np.empty((max(needed, 16), vectors.shape[1]), dtype=np.float32)
+        elif needed > len(self._embeddings):
+            grown = np.empty((max(needed, 2 * len(self._embeddings)), vectors.shape[1]), dtype=np.float32)
+            grown[:self._embedded_count] = self._embeddings[:self._embedded_count]
+            self._embeddings = grown
+        
+        self._embeddings[self._embedded_count:needed] = vectors
+        self._embedded_count = needed
+    
+    def _top_k(self, query_vector: np.ndarray, top_k: int) -> List[str]:
+        """
+        Select the history entries most similar to a query vector
+        
+        :param query_vector: Normalized query embedding
+        :param top_k: Number of top results to return
+        :return: Matching texts ordered by decreasing similarity
+        """
+        scores = self._embeddings[:self._embedded_count] @ query_vector
+        if top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        ranked = candidates[np.argsort(-scores[candidates])]
+        return [self.conversation_history[i] for i in ranked]
     
     def add_context(self, context: str, metadata: Dict[str, Any] = None):
         """
@@ -26,12 +153,22 @@ class AutonomosMemorySystem:
         else:
             text_content = str(context)
             
-        # Add to simple conversation history
-        self.conversation_history.append(text_content)
-        
-        # Store metadata if provided
-        if metadata:
-            self.context_metadata[text_content] = metadata
+        with self._db_lock:
+            # Add to simple conversation history
+            self.conversation_history.append(text_content)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT INTO conversation(text) VALUES (?)", (text_content,)
+                )
+            
+            # Store metadata if provided
+            if metadata:
+                self.context_metadata[text_content] = metadata
+                if self._db is not None:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO metadata(text, json) VALUES (?, ?)",
+                        (text_content, _dumps(metadata).decode())
+                    )
     
     def retrieve_context(self, query: str, top_k: int = 5) -> List[str]:
         """
@@ -41,10 +178,38 @@ class AutonomosMemorySystem:
         :param top_k: Number of top results to return
         :return: List of contextually relevant text snippets
         """
-        # For testing purposes, just return the most recent conversation history
-        if self.conversation_history:
+        if not self.conversation_history:
+            return []
+        
+        # Without an embedding model, fall back to the most recent history
+        if self._get_embedding_model() is None:
             return self.conversation_history[-min(top_k, len(self.conversation_history)):]
-        return []
+        
+        self._sync_embeddings()
+        return self._top_k(self._encode([query])[0], top_k)
+    
+    def add_and_retrieve(
+        self, 
+        context: str, 
+        top_k: int = 5, 
+        metadata: Dict[str, Any] = None
+    ) -> List[str]:
+        """
+        Add context and retrieve relevant information for it in one call
+        
+        :param context: Text context to be stored and used as the query
+        :param top_k: Number of top results to return
+        :param metadata: Optional metadata for context
+        :return: List of contextually relevant text snippets
+        """
+        self.add_context(context, metadata)
+        
+        if self._get_embedding_model() is None:
+            return self.retrieve_context(context, top_k)
+        
+        # The new context is its own query: reuse its stored embedding
+        self._sync_embeddings()
+        return self._top_k(self._embeddings[self._embedded_count - 1], top_k)
     
     def clear_memory(self):
         """
@@ -52,24 +217,91 @@ class AutonomosMemorySystem:
         """
         self.conversation_history = []
         self.context_metadata = {}
+        self._embeddings = None
+        self._embedded_count = 0
+        
+        with self._db_lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM conversation")
+                self._db.execute("DELETE FROM metadata")
+    
+    def _open_store(self, path: str):
+        """
+        Open (or create) the SQLite memory store in a directory
+        
+        :param path: Directory holding the memory store
+        """
+        self._close_store()
+        
+        self._db = sqlite3.connect(
+            os.path.join(path, MEMORY_DB_FILENAME), check_same_thread=False
+        )
+        self._db_path = path
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS conversation("
+            "id INTEGER PRIMARY KEY, text TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS metadata("
+            "text TEXT PRIMARY KEY, json TEXT NOT NULL)"
+        )
+    
+    def _close_store(self):
+        """
+        Close the bound SQLite store, if any, so later changes stay in memory only
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            self._db_path = None
     
     def save_memory(self, path: str):
         """
         Save memory state to persistent storage
         
+        Once bound to a directory, contexts are inserted as they are added,
+        so saving only commits pending rows.
+        
         :param path: Path to save memory state
         """
         # Create directory if it doesn't exist
         os.makedirs(path, exist_ok=True)
         
-        # Save conversation history and metadata
-        with open(os.path.join(path, "conversation_history.json"), "w") as f:
-            json.dump(self.conversation_history, f)
+        if self._json_storage:
+            self._save_json(path)
+            return
+        
+        with self._db_lock:
+            if self._db_path != path:
+                # First save to this location: write the current state once
+                self._open_store(path)
+                self._db.execute("DELETE FROM conversation")
+                self._db.execute("DELETE FROM metadata")
+                self._db.executemany(
+                    "INSERT INTO conversation(text) VALUES (?)",
+                    ((text,) for text in self.conversation_history)
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO metadata(text, json) VALUES (?, ?)",
+                    ((str(k), _dumps(v).decode()) for k, v in self.context_metadata.items())
+                )
         
-        with open(os.path.join(path, "context_metadata.json"), "w") as f:
-            # Convert dict keys to strings for JSON serialization
-            serializable_metadata = {str(k): v for k, v in self.context_metadata.items()}
-            json.dump(serializable_metadata, f)
+            self._db.commit()
+    
+    def _save_json(self, path: str):
+        """
+        Save memory state as full JSON snapshots (compatibility mode)
+        
+        :param path: Path to save memory state
+        """
+        # Save conversation history and metadata (dict keys are stringified)
+        with open(os.path.join(path, "conversation_history.json"), "wb") as f:
+            f.write(_dumps(self.conversation_history))
+        
+        with open(os.path.join(path, "context_metadata.json"), "wb") as f:
+            f.write(_dumps(self.context_metadata))
     
     def load_memory(self, path: str):
         """
@@ -77,16 +309,38 @@ class AutonomosMemorySystem:
         
         :param path: Path to load memory state from
         """
+        with self._db_lock:
+            if not self._json_storage and os.path.exists(os.path.join(path, MEMORY_DB_FILENAME)):
+                self._open_store(path)
+                self.conversation_history = [
+                    text for (text,) in 
+                    self._db.execute("SELECT text FROM conversation ORDER BY id")
+                ]
+                self.context_metadata = {
+                    text: _loads(data) for text, data in 
+                    self._db.execute("SELECT text, json FROM metadata")
+                }
+                self._embeddings = None
+                self._embedded_count = 0
+                return
+            
+            # Unbind any previously loaded store so new contexts don't go into it
+            self._close_store()
+        
         # Load conversation history and metadata if they exist
         conversation_history_path = os.path.join(path, "conversation_history.json")
         if os.path.exists(conversation_history_path):
-            with open(conversation_history_path, "r") as f:
-                self.conversation_history = json.load(f)
+            with open(conversation_history_path, "rb") as f:
+                self.conversation_history = _loads(f.read())
+            
+            # Loaded history is re-embedded on the next retrieval
+            self._embeddings = None
+            self._embedded_count = 0
         
         context_metadata_path = os.path.join(path, "context_metadata.json")
         if os.path.exists(context_metadata_path):
-            with open(context_metadata_path, "r") as f:
-                self.context_metadata = json.load(f)
+            with open(context_metadata_path, "rb") as f:
+                self.context_metadata = _loads(f.read())
 
 # Example usage and testing
 def test_memory_system():
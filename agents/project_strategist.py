@@ -1,9 +1,32 @@
 from typing import Dict, List, Any
 from datetime import datetime
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
 from .base_agent import BaseAgent
 
+# Strategy prompt, formatted directly instead of through a PromptTemplate/LLMChain
+# so each generation skips LangChain's template parsing and input validation
+_STRATEGY_TEMPLATE = """
+You are {agent_name}, an AI agent specialized in project strategy.
+
+Personality Traits: {personality_traits}
+Primary Objective: {primary_objective}
+
+Project Context:
+{project_context}
+
+Conversation History:
+{conversation_history}
+
+Strategy Generation Guidelines:
+1. Analyze the project theme, constraints, and potential impact
+2. Identify innovative technological solutions
+3. Create a structured project roadmap
+4. Assess technical feasibility and potential challenges
+5. Propose unique value proposition
+
+Respond with a comprehensive and strategic approach, 
+maintaining a creative and analytical perspective.
+"""
+
 class ProjectStrategist(BaseAgent):
     """
     Specialized agent for project strategy and planning.
@@ -22,45 +45,6 @@ class ProjectStrategist(BaseAgent):
             personality=personality, 
             primary_objective=primary_objective
         )
-        
-        # Extend the base prompt template with strategy-specific instructions
-        self.strategy_prompt_template = PromptTemplate(
-            input_variables=[
-                "agent_name", 
-                "personality_traits", 
-                "primary_objective", 
-                "conversation_history",
-                "project_context"
-            ],
-            template="""
-            You are {agent_name}, an AI agent specialized in project strategy.
-            
-            Personality Traits: {personality_traits}
-            Primary Objective: {primary_objective}
-            
-            Project Context:
-            {project_context}
-            
-            Conversation History:
-            {conversation_history}
-            
-            Strategy Generation Guidelines:
-            1. Analyze the project theme, constraints, and potential impact
-            2. Identify innovative technological solutions
-            3. Create a structured project roadmap
-            4. Assess technical feasibility and potential challenges
-            5. Propose unique value proposition
-            
-            Respond with a comprehensive and strategic approach, 
-            maintaining a creative and analytical perspective.
-            """
-        )
-        
-        # Update conversation chain with strategy-specific prompt
-        self.strategy_chain = LLMChain(
-            llm=self.llm, 
-            prompt=self.strategy_prompt_template
-        )
     
     def generate_project_strategy(
         self, 
@@ -77,13 +61,17 @@ class ProjectStrategist(BaseAgent):
         Returns:
             Dict[str, Any]: Detailed project strategy
         """
-        strategy_response = self.strategy_chain.run(
+        prompt = _STRATEGY_TEMPLATE.format(
             agent_name=self.name,
             personality_traits=self.personality,
             primary_objective=self.primary_objective,
             project_context=str(project_context),
             conversation_history=conversation_history
         )
+        strategy_response = self.llm.invoke(prompt)
+        
+        # Chat models return a message object; plain LLMs return the text
+        strategy_response = getattr(strategy_response, 'content', strategy_response)
         
         return {
             "strategy": strategy_response,
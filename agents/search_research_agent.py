@@ -4,10 +4,15 @@ Search Research Agent for Autonomos Lab.
 Specialized in information gathering and synthesis.
 """
 import os
+import asyncio
 import logging
 import json
-from typing import Dict, Any, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Any, List, Optional, Deque
 from agents.base_agent import BaseAgent
+from core.response_cache import SemanticResponseCache
 from duckduckgo_search import DDGS
 
 # Configure logging
@@ -19,6 +24,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger("research_agent")
 
+# Retained entries; older ones are discarded as new ones arrive
+MAX_SOURCES = 1000
+MAX_RESEARCH_HISTORY = 100
+
+# Budget for research text in one synthesis prompt (~6k tokens at ~4 chars/token)
+MAX_SYNTHESIS_CHARS = 24000
+
+SYNTHESIS_PROMPT = "You are a research synthesis expert. Create a comprehensive, well-structured synthesis of the following research results:\n\n{}"
+
 class SearchResearchAgent(BaseAgent):
     """
     Search Research Agent specialized in information gathering and synthesis.
@@ -31,7 +45,8 @@ class SearchResearchAgent(BaseAgent):
         personality: str = "metódico, detallado y orientado a la investigación",
         primary_objective: str = "Recopilar y sintetizar información técnica relevante",
         llm_model: str = "llama-3.3-70b-versatile",
-        temperature: float = 0.5
+        temperature: float = 0.5,
+        semantic_cache_model: Optional[str] = None
     ):
         """
         Initialize the Research Agent.
@@ -42,6 +57,8 @@ class SearchResearchAgent(BaseAgent):
             primary_objective (str, optional): Agent objective. Defaults to "Recopilar y sintetizar...".
             llm_model (str, optional): LLM model to use. Defaults to "llama-3.3-70b-versatile".
             temperature (float, optional): Creativity level. Defaults to 0.5.
+            semantic_cache_model (str, optional): Sentence-transformers model for reusing
+                answers to paraphrased queries. Defaults to None (exact repeats only).
         """
         # Initialize base agent
         super().__init__(
@@ -53,11 +70,18 @@ class SearchResearchAgent(BaseAgent):
         )
         
         # Research-specific attributes
-        self.research_history: List[Dict[str, Any]] = []
-        self.sources: List[Dict[str, str]] = []
+        self.research_history: Deque[Dict[str, Any]] = deque(maxlen=MAX_RESEARCH_HISTORY)
+        self.sources: Deque[Dict[str, str]] = deque(maxlen=MAX_SOURCES)
         
         # Initialize DuckDuckGo search
         self.ddgs = DDGS()
+        
+        # Answers to earlier (or, with a semantic cache model, near-duplicate)
+        # queries, reused instead of re-researching until they expire
+        self._response_cache = SemanticResponseCache(embedding_model=semantic_cache_model)
+        
+        # Research in progress, shared with concurrent callers asking the same query
+        self._inflight: Dict[Any, asyncio.Future] = {}
     
     def web_search(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
         """
@@ -94,6 +118,32 @@ class SearchResearchAgent(BaseAgent):
         """
         Perform research on a given query.
         
+        Runs research_async to completion. Called from inside a running event
+        loop it still works, on a private loop in a worker thread, but blocks
+        that loop until done; async callers should await research_async instead.
+        
+        Args:
+            query (str): Research query
+            max_sources (int, optional): Maximum number of sources to use. Defaults to 5.
+        
+        Returns:
+            Dict[str, Any]: Research results
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.research_async(query, max_sources))
+        
+        # asyncio.run refuses to nest inside a running loop
+        logger.warning("research() called inside an event loop; use research_async to avoid blocking it")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.research_async(query, max_sources)).result()
+    
+    async def research_async(self, query: str, max_sources: int = 5) -> Dict[str, Any]:
+        """
+        Perform research on a given query, reusing cached answers and
+        joining identical research that is already in progress.
+        
         Args:
             query (str): Research query
             max_sources (int, optional): Maximum number of sources to use. Defaults to 5.
@@ -103,8 +153,61 @@ class SearchResearchAgent(BaseAgent):
         """
         logger.info(f"Performing research on: {query}")
         
-        # Perform web search
-        search_results = self.web_search(query, max_results=max_sources)
+        cache_namespace = (self.model_name, max_sources)
+        cached = await self._response_cache.lookup_async(cache_namespace, query)
+        if cached is not None:
+            logger.info(f"Reusing cached research for: {query}")
+            return dict(cached)
+        
+        key = (query, max_sources)
+        inflight = self._inflight.get(key)
+        # Research running on another thread's loop (via research) can't be awaited here
+        if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+            logger.info(f"Joining in-progress research for: {query}")
+            # Shielded so a cancelled waiter does not cancel the shared result
+            return dict(await asyncio.shield(inflight))
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._do_research(query, max_sources)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case no one else is waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        
+        await self._response_cache.update_async(cache_namespace, query, result)
+        return result
+    
+    async def _do_research(self, query: str, max_sources: int) -> Dict[str, Any]:
+        """
+        Research a query, drafting the research plan while the web search
+        is still running.
+        
+        Args:
+            query (str): Research query
+            max_sources (int): Maximum number of sources to use
+        
+        Returns:
+            Dict[str, Any]: Research results
+        """
+        # The plan only needs the query, so search and plan concurrently
+        search_results, research_plan = await asyncio.gather(
+            asyncio.to_thread(self.web_search, query, max_sources),
+            asyncio.to_thread(
+                self.interact,
+                f"You are a research planning assistant. Create a step-by-step plan to research the following query: {query}"
+            )
+        )
         
         # Format search results for the LLM
         formatted_results = ""
@@ -117,13 +220,9 @@ class SearchResearchAgent(BaseAgent):
         else:
             formatted_results = "No web search results found."
         
-        # Interact with LLM to get research plan
-        research_plan = self.interact(
-            f"You are a research planning assistant. Create a step-by-step plan to research the following query: {query}\n\nConsider these web search results:\n\n{formatted_results}"
-        )
-        
         # Execute research plan with web search results
-        research_results = self.interact(
+        research_results = await asyncio.to_thread(
+            self.interact,
             f"You are a research agent. Execute the following research plan and provide detailed, well-structured results with citations. Use the web search results as your primary sources.\n\nPlan: {research_plan['response']}\n\nWeb Search Results:\n{formatted_results}\n\nQuery: {query}"
         )
         
@@ -138,7 +237,7 @@ class SearchResearchAgent(BaseAgent):
         return {
             "query": query,
             "results": research_results["response"],
-            "sources": self.sources[-max_sources:] if self.sources else []
+            "sources": list(islice(self.sources, max(0, len(self.sources) - max_sources), None))
         }
     
     def synthesize(self, research_results: List[Dict[str, Any]]) -> Dict[str, str]:
@@ -153,22 +252,60 @@ class SearchResearchAgent(BaseAgent):
         """
         logger.info(f"Synthesizing {len(research_results)} research results")
         
-        # Combine research results
-        combined_results = "\n\n".join([
-            f"Research on '{result['query']}':\n{result['results']}"
+        # Group research results into prompts that fit the budget
+        sections = (
+            f"Research on '{result['query']}':\n{result['results']}"[:MAX_SYNTHESIS_CHARS]
             for result in research_results
-        ])
-        
-        # Interact with LLM to synthesize results
-        synthesis = self.interact(
-            f"You are a research synthesis expert. Create a comprehensive, well-structured synthesis of the following research results:\n\n{combined_results}"
         )
+        chunks = self._chunk_sections(sections)
+        
+        # Interact with LLM to synthesize results; when they do not fit in one
+        # prompt, synthesize each chunk and then combine the partial syntheses
+        if len(chunks) > 1:
+            partials = (
+                self.interact(SYNTHESIS_PROMPT.format(chunk))["response"]
+                for chunk in chunks
+            )
+            chunks = [
+                "\n\n".join(
+                    f"Partial synthesis {i}:\n{partial}" 
+                    for i, partial in enumerate(partials, 1)
+                )[:MAX_SYNTHESIS_CHARS]
+            ]
+        
+        synthesis = self.interact(SYNTHESIS_PROMPT.format(chunks[0] if chunks else ""))
         
         return {
             "synthesis": synthesis["response"],
             "source_count": len(research_results)
         }
     
+    @staticmethod
+    def _chunk_sections(sections) -> List[str]:
+        """
+        Greedily pack text sections into chunks within MAX_SYNTHESIS_CHARS.
+        
+        Args:
+            sections (Iterable[str]): Sections no longer than the budget
+        
+        Returns:
+            List[str]: Chunks of sections joined by blank lines
+        """
+        chunks: List[str] = []
+        current: List[str] = []
+        size = 0
+        
+        for section in sections:
+            if current and size + len(section) + 2 > MAX_SYNTHESIS_CHARS:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(section)
+            size += len(section) + 2
+        
+        if current:
+            chunks.append("\n\n".join(current))
+        return chunks
+    
     def add_source(self, title: str, url: str, relevance: float = 1.0) -> None:
         """
         Add a source to the agent's source list.
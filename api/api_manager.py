@@ -1,10 +1,74 @@
 import asyncio
-from typing import Dict, Any, Optional, List, Callable
+import importlib.util
+import json
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, List, Callable, Mapping, Tuple
 import aiohttp
 import logging
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 from core.error_handler import ErrorHandler, AgentError, ErrorSeverity
 from core.config_manager import ConfigManager
 
+# Responses worth retrying, and methods that are safe to send more than once
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+# HTTP/2 multiplexes concurrent requests over one connection; it needs httpx with h2
+HTTP2_AVAILABLE = httpx is not None and importlib.util.find_spec("h2") is not None
+
+# Connection-level failures, from whichever HTTP backend is in use
+TRANSPORT_ERRORS: Tuple[type, ...] = (aiohttp.ClientError, asyncio.TimeoutError)
+if httpx is not None:
+    TRANSPORT_ERRORS += (httpx.TransportError,)
+
+# Unparseable success bodies; retrying would only repeat them, and
+# aiohttp's ContentTypeError would otherwise pass as a ClientError
+DECODE_ERRORS: Tuple[type, ...] = (aiohttp.ContentTypeError, json.JSONDecodeError)
+
+# Retry backoff bounds in seconds
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+def _retry_after(headers) -> Optional[float]:
+    """
+    Read a Retry-After header given either as seconds or as an HTTP date.
+    
+    :param headers: Response headers
+    :return: Seconds to wait, or None if the header is absent or malformed
+    """
+    value = headers.get('Retry-After')
+    if value is None:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def _backoff(attempt: int) -> float:
+    """
+    Exponential backoff with full jitter, so concurrent clients do not retry in lockstep.
+    
+    :param attempt: Zero-based attempt number
+    :return: Seconds to wait
+    """
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
 class APIConnectionError(AgentError):
     """Exception raised for API connection and communication errors."""
     pass
@@ -23,7 +87,9 @@ class APIManager:
         config_manager: ConfigManager,
         error_handler: ErrorHandler,
         default_timeout: int = 30,
-        max_retries: int = 3
+        max_retries: int = 3,
+        connect_timeout: float = 5,
+        use_http2: bool = True
     ):
         """
         Initialize APIManager with configuration and error handling.
@@ -32,14 +98,132 @@ class APIManager:
         :param error_handler: Error handling system
         :param default_timeout: Default timeout for API requests in seconds
         :param max_retries: Maximum number of retry attempts for failed requests
+        :param connect_timeout: Seconds allowed to obtain a connection, so
+            unreachable hosts fail fast and leave the budget for retries
+        :param use_http2: Send requests over HTTP/2 via httpx when it is
+            installed with h2; otherwise aiohttp (HTTP/1.1) is used
         """
         self._config_manager = config_manager
         self._error_handler = error_handler
         self._default_timeout = default_timeout
         self._max_retries = max_retries
+        self._connect_timeout = connect_timeout
         
         # Rate limit tracking per endpoint
         self._rate_limits: Dict[str, Dict[str, Any]] = {}
+        
+        # Shared keep-alive client, created on first request inside the event loop
+        self._use_http2 = use_http2 and HTTP2_AVAILABLE
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._http2_client: Optional['httpx.AsyncClient'] = None
+        self._session_lock = asyncio.Lock()
+
+    async def _get_http2_client(self) -> 'httpx.AsyncClient':
+        """
+        Get the shared HTTP/2 client, creating it on first use.
+        
+        :return: Shared httpx client
+        """
+        async with self._session_lock:
+            if self._http2_client is None or self._http2_client.is_closed:
+                self._http2_client = httpx.AsyncClient(
+                    http2=True,
+                    timeout=httpx.Timeout(self._default_timeout, connect=self._connect_timeout),
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+                )
+            return self._http2_client
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared HTTP session, creating it on first use.
+        
+        Reusing one session keeps connections alive across requests,
+        avoiding a TCP/TLS handshake per call.
+        
+        :return: Shared client session
+        """
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    keepalive_timeout=30,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(
+                        total=self._default_timeout,
+                        connect=self._connect_timeout,
+                        sock_connect=self._connect_timeout,
+                        sock_read=self._default_timeout
+                    )
+                )
+            return self._session
+
+    async def __aenter__(self) -> 'APIManager':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the shared HTTP clients and their connection pools.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+        if self._http2_client is not None:
+            await self._http2_client.aclose()
+        self._http2_client = None
+
+    async def _send(
+        self, 
+        method: str, 
+        url: str, 
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]]
+    ) -> Tuple[int, str, Mapping[str, str], Any]:
+        """
+        Send one request over the configured backend, releasing the
+        connection before returning.
+        
+        :param method: HTTP method
+        :param url: API endpoint URL
+        :param headers: Optional request headers
+        :param params: Optional query parameters
+        :param data: Optional request body
+        :return: Status code, reason, response headers and the parsed JSON
+            body (None for error responses and empty bodies)
+        """
+        if self._use_http2:
+            client = await self._get_http2_client()
+            response = await client.request(
+                method, 
+                url, 
+                headers=headers, 
+                params=params, 
+                json=data
+            )
+            # Bodiless successes such as 204 No Content have nothing to parse
+            payload = response.json() if response.status_code < 400 and response.content else None
+            return response.status_code, response.reason_phrase, response.headers, payload
+        
+        # Reuse pooled connections (the session carries the default timeout)
+        session = await self._get_session()
+        async with session.request(
+            method, 
+            url, 
+            headers=headers, 
+            params=params, 
+            json=data
+        ) as response:
+            payload = await response.json() if response.status < 400 else None
+            return response.status, response.reason, response.headers, payload
 
     async def make_request(
         self, 
@@ -64,58 +248,61 @@ class APIManager:
         # Check rate limits
         self._check_rate_limit(url, provider)
         
-        # Prepare request parameters
-        headers = headers or {}
-        params = params or {}
-        data = data or {}
-        
-        # Add default timeout
-        timeout = aiohttp.ClientTimeout(total=self._default_timeout)
+        # Only idempotent requests are retried; others fail on the first error
+        retryable = method.upper() in IDEMPOTENT_METHODS
         
         # Retry mechanism
         for attempt in range(self._max_retries):
+            can_retry = retryable and attempt < self._max_retries - 1
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.request(
-                        method, 
-                        url, 
-                        headers=headers, 
-                        params=params, 
-                        json=data, 
-                        timeout=timeout
-                    ) as response:
-                        # Handle HTTP errors
-                        if response.status >= 400:
-                            raise APIConnectionError(
-                                f"HTTP Error {response.status}: {response.reason}",
-                                severity=ErrorSeverity.ERROR,
-                                context={
-                                    'url': url,
-                                    'method': method,
-                                    'status_code': response.status
-                                }
-                            )
-                        
-                        # Parse and return response
-                        return await response.json()
-            
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                # Log and potentially retry
-                self._error_handler.log(
-                    f"API Request Error (Attempt {attempt + 1}): {str(e)}",
-                    level=logging.WARNING
+                status, reason, response_headers, payload = await self._send(
+                    method, url, headers, params, data
                 )
                 
-                # Last attempt
-                if attempt == self._max_retries - 1:
+                # Return parsed response
+                if status < 400:
+                    return payload
+                
+                # Handle HTTP errors; client errors are never retried
+                if not can_retry or status not in RETRYABLE_STATUS_CODES:
+                    raise APIConnectionError(
+                        f"HTTP Error {status}: {reason}",
+                        severity=ErrorSeverity.ERROR,
+                        context={
+                            'url': url,
+                            'method': method,
+                            'status_code': status
+                        }
+                    )
+                
+                retry_after = _retry_after(response_headers)
+                error = f"HTTP Error {status}: {reason}"
+            
+            except DECODE_ERRORS as e:
+                raise APIConnectionError(
+                    f"Invalid JSON response from {url}",
+                    severity=ErrorSeverity.ERROR,
+                    context={'url': url, 'method': method, 'error': str(e)}
+                )
+            
+            except TRANSPORT_ERRORS as e:
+                if not can_retry:
                     raise APIConnectionError(
-                        f"Failed to connect to {url} after {self._max_retries} attempts",
+                        f"Failed to connect to {url} after {attempt + 1} attempts",
                         severity=ErrorSeverity.CRITICAL,
                         context={'url': url, 'error': str(e)}
                     )
                 
-                # Wait before retry with exponential backoff
-                await asyncio.sleep(2 ** attempt)
+                retry_after = None
+                error = str(e)
+            
+            # Log and retry once the connection is released, at the time the
+            # server asked for or after a jittered backoff
+            self._error_handler.log(
+                f"API Request Error (Attempt {attempt + 1}): {error}",
+                level=logging.WARNING
+            )
+            await asyncio.sleep(retry_after if retry_after is not None else _backoff(attempt))
 
     def register_rate_limit(
         self, 
@@ -133,11 +320,14 @@ class APIManager:
         :param provider: Optional provider name
         """
         key = provider or endpoint
+        
+        # Token bucket: starts full and refills continuously at limit/period
         self._rate_limits[key] = {
             'limit': limit,
             'period': period,
-            'requests': [],
-            'last_reset': None
+            'rate': limit / period,
+            'tokens': float(limit),
+            'last_refill': time.monotonic()
         }
 
     def _check_rate_limit(self, url: str, provider: Optional[str] = None):
@@ -154,16 +344,17 @@ class APIManager:
             return
         
         rate_limit = self._rate_limits[key]
-        current_time = asyncio.get_event_loop().time()
+        current_time = time.monotonic()
         
-        # Remove old requests outside the rate limit period
-        rate_limit['requests'] = [
-            req for req in rate_limit['requests'] 
-            if current_time - req < rate_limit['period']
-        ]
+        # Refill tokens for the time elapsed since the last check
+        rate_limit['tokens'] = min(
+            rate_limit['limit'],
+            rate_limit['tokens'] + (current_time - rate_limit['last_refill']) * rate_limit['rate']
+        )
+        rate_limit['last_refill'] = current_time
         
         # Check if limit is exceeded
-        if len(rate_limit['requests']) >= rate_limit['limit']:
+        if rate_limit['tokens'] < 1:
             raise RateLimitError(
                 f"Rate limit exceeded for {key}",
                 severity=ErrorSeverity.WARNING,
@@ -173,8 +364,8 @@ class APIManager:
                 }
             )
         
-        # Record this request
-        rate_limit['requests'].append(current_time)
+        # Consume a token for this request
+        rate_limit['tokens'] -= 1
 
     def parse_response(
         self, 
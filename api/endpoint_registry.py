@@ -4,18 +4,31 @@ import os
 from core.error_handler import AgentError, ErrorSeverity
 from core.config_manager import ConfigManager
 import uuid
-from dataclasses import dataclass, asdict, field
-from enum import Enum, auto
+from collections import defaultdict
+from dataclasses import dataclass, field
+from enum import Enum
 
-class EndpointType(Enum):
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Mutations appended to the log before it is folded back into the snapshot
+COMPACT_EVERY = 100
+
+class EndpointType(str, Enum):
     """
     Enumeration of different endpoint types.
+    
+    String-valued, so it serializes to JSON natively and stored values
+    do not depend on declaration order.
     """
-    REST = auto()
-    GRAPHQL = auto()
-    WEBSOCKET = auto()
-    RPC = auto()
-    GRPC = auto()
+    REST = 'rest'
+    GRAPHQL = 'graphql'
+    WEBSOCKET = 'websocket'
+    RPC = 'rpc'
+    GRPC = 'grpc'
+
 
 class EndpointRegistryError(AgentError):
     """Exception raised for endpoint registry-related errors."""
@@ -39,6 +52,57 @@ class Endpoint:
     required_scopes: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+def _endpoint_default(obj: Any) -> Dict[str, Any]:
+    """
+    Stdlib JSON fallback for endpoints: their field mapping, without the
+    deep copy made by asdict().
+    
+    :param obj: Object the encoder cannot serialize natively
+    :return: Endpoint fields
+    """
+    if isinstance(obj, Endpoint):
+        return vars(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize registry data compactly, using orjson when available.
+    
+    :param obj: Object to serialize; endpoints may appear anywhere in it
+    :return: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        # orjson encodes dataclasses and str enums natively
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=_endpoint_default, separators=(',', ':')).encode()
+
+def _loads(data: bytes) -> Any:
+    """
+    Deserialize registry data, using orjson when available.
+    
+    :param data: JSON document
+    :return: Decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _endpoint_from_dict(data: Dict[str, Any]) -> Endpoint:
+    """
+    Rebuild an endpoint from its stored dictionary.
+    
+    :param data: Stored endpoint fields
+    :return: Endpoint
+    """
+    endpoint_type = data.get('endpoint_type')
+    if isinstance(endpoint_type, str):
+        # Registries written before the enum was string-valued store member names
+        if endpoint_type in EndpointType.__members__:
+            data['endpoint_type'] = EndpointType[endpoint_type]
+        else:
+            data['endpoint_type'] = EndpointType(endpoint_type)
+    return Endpoint(**data)
+
 class EndpointRegistry:
     """
     Centralized registry for managing and cataloging API endpoints 
@@ -61,6 +125,10 @@ class EndpointRegistry:
         self._registry_dir = os.path.join(os.getcwd(), registry_dir)
         self._registry_path = os.path.join(self._registry_dir, registry_file)
         
+        # Mutations since the last snapshot, one JSON line each
+        self._log_path = f"{self._registry_path}.log"
+        self._pending_ops = 0
+        
         # Ensure registry directory exists
         os.makedirs(self._registry_dir, exist_ok=True)
         
@@ -71,42 +139,127 @@ class EndpointRegistry:
         
         # Load existing registry
         self._endpoints: Dict[str, Endpoint] = self._load_registry()
+        
+        # Secondary indexes: attribute value -> endpoint IDs, in registration order
+        self._by_provider: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._by_type: Dict[EndpointType, Dict[str, None]] = defaultdict(dict)
+        self._by_tag: Dict[str, Dict[str, None]] = defaultdict(dict)
+        for endpoint in self._endpoints.values():
+            self._index(endpoint)
+
+    def _index(self, endpoint: Endpoint):
+        """
+        Add an endpoint to the provider, type and tag indexes.
+        
+        :param endpoint: Endpoint to index
+        """
+        self._by_provider[endpoint.provider][endpoint.id] = None
+        self._by_type[endpoint.endpoint_type][endpoint.id] = None
+        for tag in endpoint.tags:
+            self._by_tag[tag][endpoint.id] = None
+
+    def _unindex(self, endpoint: Endpoint):
+        """
+        Remove an endpoint from the provider, type and tag indexes.
+        
+        :param endpoint: Endpoint to remove
+        """
+        self._by_provider[endpoint.provider].pop(endpoint.id, None)
+        self._by_type[endpoint.endpoint_type].pop(endpoint.id, None)
+        for tag in endpoint.tags:
+            self._by_tag[tag].pop(endpoint.id, None)
 
     def _load_registry(self) -> Dict[str, Endpoint]:
         """
-        Load existing endpoint registry from file.
+        Load the endpoint snapshot and replay the mutation log over it.
         
         :return: Dictionary of endpoints
         """
         try:
-            with open(self._registry_path, 'r') as f:
-                raw_endpoints = json.load(f)
-                return {
-                    endpoint_id: Endpoint(**endpoint_data) 
-                    for endpoint_id, endpoint_data in raw_endpoints.items()
-                }
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+            with open(self._registry_path, 'rb') as f:
+                raw_endpoints = _loads(f.read())
+            endpoints = {
+                endpoint_id: _endpoint_from_dict(endpoint_data) 
+                for endpoint_id, endpoint_data in raw_endpoints.items()
+            }
+        except (ValueError, FileNotFoundError):
+            endpoints = {}
+        
+        try:
+            with open(self._log_path, 'rb+') as f:
+                # End of the last complete mutation
+                good_offset = 0
+                for line in f:
+                    try:
+                        # Each mutation is written with its newline in one call,
+                        # so a line without one is a torn write as well
+                        if not line.endswith(b'\n'):
+                            raise ValueError("incomplete line")
+                        entry = _loads(line)
+                    except ValueError:
+                        # A torn final line from an interrupted write: cut it off
+                        # so later appends start on a line of their own
+                        f.truncate(good_offset)
+                        break
+                    
+                    if entry['op'] == 'put':
+                        endpoints[entry['id']] = _endpoint_from_dict(entry['data'])
+                    else:
+                        endpoints.pop(entry['id'], None)
+                    self._pending_ops += 1
+                    good_offset += len(line)
+        except FileNotFoundError:
+            pass
+        
+        return endpoints
 
-    def _save_registry(self):
+    def _append_op(self, op: str, endpoint_id: str):
         """
-        Save current endpoint registry to file.
+        Durably record a single mutation, compacting once enough have accumulated.
+        
+        :param op: 'put' to store the endpoint's current state, 'delete' to remove it
+        :param endpoint_id: Unique endpoint identifier
         """
+        entry = {'op': op, 'id': endpoint_id}
+        if op == 'put':
+            entry['data'] = self._endpoints[endpoint_id]
+        
         try:
-            with open(self._registry_path, 'w') as f:
-                json.dump(
-                    {
-                        endpoint.id: asdict(endpoint) 
-                        for endpoint in self._endpoints.values()
-                    }, 
-                    f, 
-                    indent=2
-                )
+            with open(self._log_path, 'ab') as f:
+                f.write(_dumps(entry) + b'\n')
+                f.flush()
+                os.fsync(f.fileno())
         except IOError as e:
             raise EndpointRegistryError(
                 f"Failed to save endpoint registry: {str(e)}",
                 severity=ErrorSeverity.CRITICAL
             )
+        
+        self._pending_ops += 1
+        if self._pending_ops >= COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """
+        Atomically rewrite the snapshot from memory and truncate the mutation log.
+        """
+        tmp_path = f"{self._registry_path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps(self._endpoints))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._registry_path)
+            
+            # The snapshot now holds every logged mutation
+            open(self._log_path, 'w').close()
+        except IOError as e:
+            raise EndpointRegistryError(
+                f"Failed to save endpoint registry: {str(e)}",
+                severity=ErrorSeverity.CRITICAL
+            )
+        
+        self._pending_ops = 0
 
     def register_endpoint(
         self, 
@@ -144,9 +297,10 @@ class EndpointRegistry:
         
         # Store endpoint
         self._endpoints[endpoint.id] = endpoint
+        self._index(endpoint)
         
         # Save registry
-        self._save_registry()
+        self._append_op('put', endpoint.id)
         
         return endpoint.id
 
@@ -177,11 +331,20 @@ class EndpointRegistry:
         :param endpoint_type: Optional endpoint type to filter
         :return: List of matching endpoints
         """
-        return [
-            endpoint for endpoint in self._endpoints.values()
-            if (provider is None or endpoint.provider == provider) and
-               (endpoint_type is None or endpoint.endpoint_type == endpoint_type)
-        ]
+        if provider is None and endpoint_type is None:
+            return list(self._endpoints.values())
+        
+        if provider is None:
+            return [self._endpoints[i] for i in self._by_type.get(endpoint_type, {})]
+        
+        provider_ids = self._by_provider.get(provider, {})
+        if endpoint_type is None:
+            return [self._endpoints[i] for i in provider_ids]
+        
+        # Walk the smaller index and check membership in the other
+        type_ids = self._by_type.get(endpoint_type, {})
+        smaller, larger = sorted((provider_ids, type_ids), key=len)
+        return [self._endpoints[i] for i in smaller if i in larger]
 
     def update_endpoint(
         self, 
@@ -202,12 +365,14 @@ class EndpointRegistry:
         
         # Update endpoint
         current_endpoint = self._endpoints[endpoint_id]
+        self._unindex(current_endpoint)
         for key, value in updates.items():
             if hasattr(current_endpoint, key):
                 setattr(current_endpoint, key, value)
+        self._index(current_endpoint)
         
         # Save registry
-        self._save_registry()
+        self._append_op('put', endpoint_id)
 
     def delete_endpoint(self, endpoint_id: str):
         """
@@ -222,10 +387,10 @@ class EndpointRegistry:
             )
         
         # Remove endpoint
-        del self._endpoints[endpoint_id]
+        self._unindex(self._endpoints.pop(endpoint_id))
         
         # Save registry
-        self._save_registry()
+        self._append_op('delete', endpoint_id)
 
     def find_endpoints_by_tag(self, tag: str) -> List[Endpoint]:
         """
@@ -234,7 +399,4 @@ class EndpointRegistry:
         :param tag: Tag to search for
         :return: List of endpoints with the given tag
         """
-        return [
-            endpoint for endpoint in self._endpoints.values()
-            if tag in endpoint.tags
-        ]
+        return [self._endpoints[i] for i in self._by_tag.get(tag, {})]
@@ -1,8 +1,40 @@
+import copy
+import gc
+import importlib.util
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List
+import torch
 from transformers import pipeline, AutoModelForCausalLM, AutoTokenizer
+from core.response_cache import SemanticResponseCache
+
+# Generations sampled above this temperature are too varied to reuse
+CACHEABLE_TEMPERATURE = 0.3
+
+def _model_load_kwargs() -> Dict[str, Any]:
+    """
+    Choose weight precision, placement and attention kernel for the available hardware
+    
+    :return: Keyword arguments for from_pretrained
+    """
+    # CPUs run half precision slowly, so keep full-precision weights there
+    if not torch.cuda.is_available():
+        return {}
+    
+    kwargs = {
+        'torch_dtype': torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    }
+    # low_cpu_mem_usage and device_map both need accelerate (transformers raises
+    # ImportError otherwise); without it the pipeline places the model
+    if importlib.util.find_spec('accelerate') is not None:
+        kwargs['low_cpu_mem_usage'] = True
+        kwargs['device_map'] = 'auto'
+    if importlib.util.find_spec('flash_attn') is not None:
+        kwargs['attn_implementation'] = 'flash_attention_2'
+    return kwargs
 
 class HuggingFaceAPI:
     """
@@ -11,12 +43,15 @@ class HuggingFaceAPI:
     
     def __init__(self, 
                  api_token: Optional[str] = None, 
-                 default_model: str = 'gpt2'):
+                 default_model: str = 'gpt2',
+                 max_cached_models: int = 2):
         """
         Initialize HuggingFace API client
         
         :param api_token: HuggingFace API token
         :param default_model: Default model to use for inference
+        :param max_cached_models: Loaded pipelines kept in memory before the
+            least recently used one is evicted
         """
         self.api_token = api_token
         self.default_model = default_model
@@ -24,11 +59,17 @@ class HuggingFaceAPI:
         # Logging
         self.logger = logging.getLogger(__name__)
         
-        # Model cache
-        self._model_cache: Dict[str, Any] = {}
+        # Loaded inference pipelines, least recently used first
+        self._model_cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._max_cached_models = max_cached_models
+        
+        # Keep-alive session for Hub API calls
+        self._session = requests.Session()
+        self._session.headers.update(self._get_headers())
+        self._session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
         
-        # Inference pipelines
-        self._pipelines: Dict[str, Any] = {}
+        # Low-temperature generations, keyed by exact prompt and settings
+        self._response_cache = SemanticResponseCache(embedding_model=None)
     
     def _get_headers(self) -> Dict[str, str]:
         """
@@ -54,7 +95,7 @@ class HuggingFaceAPI:
         params = filter_params or {}
         
         try:
-            response = requests.get(url, params=params, headers=self._get_headers())
+            response = self._session.get(url, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -74,25 +115,55 @@ class HuggingFaceAPI:
         :return: Loaded model
         """
         if not force_reload and model_name in self._model_cache:
+            self._model_cache.move_to_end(model_name)
             return self._model_cache[model_name]
         
+        # Free the old copy (or the least recently used model) before loading
+        self._model_cache.pop(model_name, None)
+        while self._model_cache and len(self._model_cache) >= self._max_cached_models:
+            self._evict_oldest_model()
+        
         try:
             # Load tokenizer and model
             tokenizer = AutoTokenizer.from_pretrained(model_name)
-            model = AutoModelForCausalLM.from_pretrained(model_name)
+            load_kwargs = _model_load_kwargs()
+            model = AutoModelForCausalLM.from_pretrained(model_name, **load_kwargs)
             
-            # Create inference pipeline
-            pipe = pipeline(task, model=model, tokenizer=tokenizer)
+            # Create inference pipeline, on the GPU unless device_map already placed the model
+            pipeline_kwargs = {}
+            if load_kwargs and 'device_map' not in load_kwargs:
+                pipeline_kwargs['device'] = 0
+            pipe = pipeline(task, model=model, tokenizer=tokenizer, **pipeline_kwargs)
             
             # Cache the pipeline
             self._model_cache[model_name] = pipe
-            self._pipelines[model_name] = pipe
             
             return pipe
         except Exception as e:
             self.logger.error(f"Error loading model {model_name}: {e}")
             raise
     
+    @staticmethod
+    def _count_tokens(tokenizer: Any, texts: List[str]) -> int:
+        """
+        Count tokens across texts with a single batched tokenizer call
+        
+        :param tokenizer: Pipeline tokenizer
+        :param texts: Texts to count
+        :return: Total number of tokens
+        """
+        return sum(len(ids) for ids in tokenizer(texts)['input_ids'])
+    
+    def _evict_oldest_model(self):
+        """
+        Drop the least recently used pipeline and release its memory
+        """
+        _, pipe = self._model_cache.popitem(last=False)
+        del pipe
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    
     def generate_text(self, 
                       prompt: str, 
                       model_name: Optional[str] = None,
@@ -111,6 +182,18 @@ class HuggingFaceAPI:
         """
         model_name = model_name or self.default_model
         
+        cacheable = temperature <= CACHEABLE_TEMPERATURE
+        cache_namespace = (model_name, max_length, num_return_sequences, round(temperature, 1))
+        if cacheable:
+            lookup_start = time.time()
+            cached = self._response_cache.lookup(cache_namespace, prompt)
+            if cached is not None:
+                # Copied so callers can't alter the cache; timing reflects this call
+                generation = copy.deepcopy(cached)
+                generation['metadata']['response_time'] = time.time() - lookup_start
+                generation['metadata']['cached'] = True
+                return generation
+        
         try:
             # Load or retrieve model
             model = self.load_model(model_name)
@@ -127,23 +210,102 @@ class HuggingFaceAPI:
             )
             
             # Calculate tokens
-            tokens_used = len(model.tokenizer.encode(prompt)) + sum(
-                len(model.tokenizer.encode(result['generated_text'])) 
-                for result in results
+            tokens_used = self._count_tokens(
+                model.tokenizer, 
+                [prompt] + [result['generated_text'] for result in results]
             )
             
-            return {
+            generation = {
                 'model': model_name,
                 'results': results,
                 'metadata': {
                     'response_time': time.time() - start_time,
-                    'tokens_used': tokens_used
+                    'tokens_used': tokens_used,
+                    'cached': False
                 }
             }
+            if cacheable:
+                self._response_cache.update(cache_namespace, prompt, copy.deepcopy(generation))
+            
+            return generation
         except Exception as e:
             self.logger.error(f"Text generation error: {e}")
             raise
     
+    def generate_text_batch(self, 
+                            prompts: List[str], 
+                            model_name: Optional[str] = None,
+                            max_length: int = 200,
+                            num_return_sequences: int = 1,
+                            temperature: float = 0.7,
+                            batch_size: int = 8) -> Dict[str, Any]:
+        """
+        Generate text for several prompts, running them through the model in
+        padded batches instead of one forward pass per prompt
+        
+        :param prompts: Input text prompts
+        :param model_name: Specific model to use
+        :param max_length: Maximum generated text length
+        :param num_return_sequences: Number of text variations per prompt
+        :param temperature: Sampling temperature for creativity
+        :param batch_size: Number of prompts per forward pass
+        :return: Generation results, one list of sequences per prompt
+        """
+        model_name = model_name or self.default_model
+        
+        try:
+            # Load or retrieve model
+            model = self.load_model(model_name)
+            
+            # Causal LM tokenizers often lack a pad token, which batching needs
+            tokenizer = model.tokenizer
+            if tokenizer.pad_token_id is None:
+                if tokenizer.eos_token is not None:
+                    tokenizer.pad_token = tokenizer.eos_token
+                else:
+                    tokenizer.pad_token_id = model.model.config.eos_token_id
+            
+            # Decoder-only models continue from the last position, so shorter
+            # prompts must be padded on the left or they generate after padding
+            if not getattr(model.model.config, 'is_encoder_decoder', False):
+                tokenizer.padding_side = 'left'
+            
+            # Start timing
+            start_time = time.time()
+            
+            # Generate text
+            results = model(
+                prompts, 
+                batch_size=batch_size,
+                max_length=max_length, 
+                num_return_sequences=num_return_sequences,
+                temperature=temperature,
+                pad_token_id=model.tokenizer.pad_token_id
+            )
+            
+            # Calculate tokens
+            tokens_used = self._count_tokens(
+                model.tokenizer, 
+                prompts + [
+                    result['generated_text'] 
+                    for sequences in results 
+                    for result in sequences
+                ]
+            )
+            
+            return {
+                'model': model_name,
+                'results': results,
+                'metadata': {
+                    'response_time': time.time() - start_time,
+                    'tokens_used': tokens_used,
+                    'prompt_count': len(prompts)
+                }
+            }
+        except Exception as e:
+            self.logger.error(f"Batch text generation error: {e}")
+            raise
+    
     def fine_tune_model(self, 
                         model_name: str, 
                         training_data: List[str],
@@ -0,0 +1,228 @@
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize a cached result, using orjson when available
+
+    :param obj: Result to serialize
+    :return: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str).encode()
+
+def _loads(data: bytes) -> Any:
+    """
+    Deserialize a cached result, using orjson when available
+
+    :param data: JSON document
+    :return: Decoded result
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class CacheBackend(Protocol):
+    """
+    Storage interface for cached LLM results
+    """
+
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None): ...
+
+    def delete(self, key: str): ...
+
+    def clear(self): ...
+
+class InMemoryCacheBackend:
+    """
+    In-process LRU cache with optional per-entry expiry
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the in-memory backend
+
+        :param max_entries: Maximum number of cached results
+        """
+        self.max_entries = max_entries
+
+        # key -> (monotonic expiry time or None, value)
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        
+        # Copies in and out, so callers mutating a result can't alter the cache
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (expires_at, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+class RedisCacheBackend:
+    """
+    Redis-backed cache shared across processes (requires the redis package)
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "llm-cache:"):
+        """
+        Initialize the Redis backend
+
+        :param url: Redis connection URL
+        :param prefix: Key prefix isolating cached results
+        """
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self._client.get(self._prefix + key)
+        return _loads(data) if data is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._client.set(self._prefix + key, _dumps(value), px=int(ttl * 1000) if ttl else None)
+
+    def delete(self, key: str):
+        self._client.delete(self._prefix + key)
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=self._prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+class MemcachedCacheBackend:
+    """
+    Memcached-backed cache shared across processes (requires pymemcache)
+    """
+
+    def __init__(self, server: Tuple[str, int] = ("localhost", 11211)):
+        """
+        Initialize the Memcached backend
+
+        :param server: Memcached (host, port)
+        """
+        from pymemcache.client.base import Client
+
+        self._client = Client(server)
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self._client.get(key)
+        return _loads(data) if data is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        # Memcached expiry is whole seconds; 0 means no expiry
+        self._client.set(key, _dumps(value), expire=max(1, int(ttl)) if ttl else 0)
+
+    def delete(self, key: str):
+        self._client.delete(key)
+
+    def clear(self):
+        self._client.flush_all()
+
+class LLMCache:
+    """
+    Content-addressed cache for deterministic (temperature 0) LLM results
+    """
+
+    def __init__(self,
+                 backend: Optional[CacheBackend] = None,
+                 default_ttl: Optional[float] = None):
+        """
+        Initialize the LLM cache
+
+        :param backend: Storage backend; defaults to an in-process LRU
+        :param default_ttl: Seconds a result stays cached; None keeps it until evicted
+        """
+        self.backend = backend or InMemoryCacheBackend()
+        self.default_ttl = default_ttl
+
+    @staticmethod
+    def is_cacheable(constraints: Dict[str, Any]) -> bool:
+        """
+        Only deterministic, non-streaming requests are safe to replay. The
+        temperature must be explicitly 0: providers sample by default
+
+        :param constraints: Inference constraints
+        :return: Whether the result may be cached
+        """
+        return constraints.get('temperature') == 0 and not constraints.get('stream', False)
+
+    @staticmethod
+    def make_key(provider: str,
+                 model: Optional[str],
+                 prompt: str,
+                 constraints: Dict[str, Any]) -> str:
+        """
+        Build a content-addressed key for a request
+
+        :param provider: Provider name
+        :param model: Model name, if known
+        :param prompt: Input prompt
+        :param constraints: Inference constraints
+        :return: Hex SHA-256 digest
+        """
+        payload = json.dumps({
+            'provider': provider,
+            'model': model,
+            'prompt': prompt,
+            'temperature': constraints.get('temperature', 0),
+            'constraints': constraints
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached result
+
+        :param key: Key from make_key
+        :return: Cached result, or None on a miss
+        """
+        return self.backend.get(key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Store a result
+
+        :param key: Key from make_key
+        :param value: Result to cache
+        :param ttl: Seconds to keep the result; defaults to default_ttl
+        """
+        self.backend.set(key, value, ttl if ttl is not None else self.default_ttl)
+
+    def clear(self):
+        """
+        Remove all cached results
+        """
+        self.backend.clear()
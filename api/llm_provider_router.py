@@ -1,7 +1,19 @@
+import asyncio
+import json
 import logging
-from typing import Dict, Any, Callable, Optional, List
+import time
+from typing import Dict, Any, Awaitable, Callable, Optional, List, Set, Tuple
 from enum import Enum, auto
 
+from api.llm_cache import LLMCache
+from api.retry_handler import CircuitBreaker
+
+# Micro-batching defaults, overridable per provider via config['batching']
+DEFAULT_MAX_BATCH_SIZE = 16
+DEFAULT_MAX_WAIT_MS = 20
+DEFAULT_MAX_INFLIGHT_BATCHES = 10
+DEFAULT_BUCKET_CHARS = 256
+
 class LLMProvider(Enum):
     OPENAI = auto()
     ANTHROPIC = auto()
@@ -9,6 +21,146 @@ class LLMProvider(Enum):
     GOOGLE = auto()
     AZURE = auto()
 
+# Provider scoring weights. Price, latency and throughput are penalized by
+# their ratio to the best provider; uptime is 1 - failure rate; capability
+# is a bonus when the task matches config['capabilities'], constraint a
+# penalty when the provider cannot satisfy max_tokens
+DEFAULT_SCORING_WEIGHTS = {
+    'price': 0.3,
+    'uptime': 0.3,
+    'latency': 0.025,
+    'throughput': 0.05,
+    'capability': 0.3,
+    'constraint': 0.5
+}
+
+def capability_match(task: str, capabilities: List[str]) -> bool:
+    """
+    Check whether a task mentions any of a provider's declared capabilities
+    
+    :param task: Task description
+    :param capabilities: Capability keywords, e.g. ['code', 'vision']
+    :return: Whether any capability appears in the task
+    """
+    task = task.lower()
+    return any(capability.lower() in task for capability in capabilities)
+
+class AllProvidersFailedError(RuntimeError):
+    """
+    Raised when every provider in the fallback chain failed or was skipped
+    """
+    
+    def __init__(self, chain: List[LLMProvider]):
+        """
+        :param chain: Providers tried, in fallback order
+        """
+        super().__init__("All LLM providers failed")
+        self.chain = chain
+
+class _BatchCollector:
+    """
+    Collects concurrent prompts that share a provider and constraints and
+    sends them as one batch once max_batch_size is reached or max_wait_ms passes.
+    Prompts are grouped into length buckets so a batch holds prompts of
+    similar length, limiting padding in the provider's batch
+    """
+    
+    def __init__(self,
+                 send: Callable[[List[str]], Awaitable[List[Any]]],
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 max_inflight: int = DEFAULT_MAX_INFLIGHT_BATCHES,
+                 bucket_chars: int = DEFAULT_BUCKET_CHARS):
+        """
+        Initialize the collector on the running event loop
+        
+        :param send: Coroutine function sending a list of prompts, returning one result per prompt
+        :param max_batch_size: Maximum prompts per batch
+        :param max_wait_ms: Longest a prompt waits, from its bucket's first arrival, for the batch to fill
+        :param max_inflight: Maximum batches sent concurrently
+        :param bucket_chars: Width of each prompt length bucket in characters
+        """
+        self.loop = asyncio.get_running_loop()
+        self._send = send
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max_wait_ms / 1000
+        self._bucket_chars = max(1, bucket_chars)
+        self._inflight = asyncio.Semaphore(max_inflight)
+        
+        # Pending (prompt, future) pairs and the flush timer of each length bucket
+        self._buckets: Dict[int, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._flushes: set = set()
+    
+    async def submit(self, prompt: str) -> Any:
+        """
+        Queue a prompt and wait for its share of the batched result
+        
+        :param prompt: Input prompt
+        :return: Provider result for this prompt
+        """
+        future = self.loop.create_future()
+        bucket = len(prompt) // self._bucket_chars
+        
+        pending = self._buckets.setdefault(bucket, [])
+        pending.append((prompt, future))
+        
+        if len(pending) >= self._max_batch_size:
+            self._flush_bucket(bucket)
+        elif len(pending) == 1:
+            self._timers[bucket] = self.loop.call_later(
+                self._max_wait, self._flush_bucket, bucket
+            )
+        
+        return await future
+    
+    def _flush_bucket(self, bucket: int):
+        """
+        Start sending a bucket's pending prompts as one batch
+        
+        :param bucket: Length bucket to flush
+        """
+        timer = self._timers.pop(bucket, None)
+        if timer is not None:
+            timer.cancel()
+        
+        batch = self._buckets.pop(bucket, None)
+        if not batch:
+            return
+        
+        flush = self.loop.create_task(self._flush(batch))
+        self._flushes.add(flush)
+        flush.add_done_callback(self._flushes.discard)
+    
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]):
+        """
+        Send one batch and resolve each caller's future
+        
+        :param batch: Queued (prompt, future) pairs
+        """
+        try:
+            async with self._inflight:
+                results = list(await self._send([prompt for prompt, _ in batch]))
+            
+            # A short result list would leave some callers waiting forever
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"Batch of {len(batch)} prompts returned {len(results)} results"
+                )
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
 class LLMProviderRouter:
     """
     Intelligent routing system for Language Model providers
@@ -17,15 +169,21 @@ class LLMProviderRouter:
     
     def __init__(self, 
                  providers: Optional[Dict[LLMProvider, Dict[str, Any]]] = None,
-                 default_provider: LLMProvider = LLMProvider.OPENAI):
+                 default_provider: LLMProvider = LLMProvider.OPENAI,
+                 cache: Optional[LLMCache] = None,
+                 weights: Optional[Dict[str, float]] = None):
         """
         Initialize LLM Provider Router
         
         :param providers: Configuration for each LLM provider
         :param default_provider: Fallback provider if others fail
+        :param cache: Optional cache replaying deterministic (temperature 0) results
+        :param weights: Overrides for DEFAULT_SCORING_WEIGHTS
         """
         self.providers = providers or {}
         self.default_provider = default_provider
+        self.cache = cache
+        self.weights = {**DEFAULT_SCORING_WEIGHTS, **(weights or {})}
         
         # Provider connection and inference clients
         self._clients: Dict[LLMProvider, Any] = {}
@@ -33,6 +191,19 @@ class LLMProviderRouter:
         # Performance and cost tracking
         self._provider_metrics: Dict[LLMProvider, Dict[str, Any]] = {}
         
+        # Task-independent provider scores, recomputed only for providers whose
+        # config or metrics changed since the last selection
+        self._score_cache: Dict[LLMProvider, float] = {}
+        self._score_dirty: Set[LLMProvider] = set(self.providers)
+        self._best_values: Dict[str, Optional[float]] = {}
+        
+        # Per-provider circuit breakers; providers with an open circuit are
+        # skipped in the fallback chain
+        self._circuits: Dict[LLMProvider, CircuitBreaker] = {}
+        
+        # Micro-batch collectors keyed by provider and constraints
+        self._batch_collectors: Dict[Any, _BatchCollector] = {}
+        
         # Logging
         self.logger = logging.getLogger(__name__)
     
@@ -49,6 +220,8 @@ class LLMProviderRouter:
         """
         self.providers[provider] = config
         self._clients[provider] = client
+        self._circuits[provider] = CircuitBreaker(**config.get('circuit_breaker', {}))
+        self._score_dirty.add(provider)
         
         # Initialize metrics
         self._provider_metrics[provider] = {
@@ -56,7 +229,9 @@ class LLMProviderRouter:
             'successful_calls': 0,
             'failed_calls': 0,
             'avg_response_time': 0,
-            'total_tokens_used': 0
+            'total_tokens_used': 0,
+            'cache_hits': 0,
+            'cache_misses': 0
         }
     
     def select_model(self, 
@@ -69,42 +244,140 @@ class LLMProviderRouter:
         :param constraints: Optional constraints like max_tokens, cost_limit
         :return: Selected LLM Provider
         """
-        constraints = constraints or {}
+        if not self.providers:
+            return self.default_provider
+        
+        # Select top provider
+        return max(self.providers, key=self._task_scorer(task, constraints or {}))
+    
+    def _provider_chain(self, 
+                        task: str, 
+                        constraints: Dict[str, Any]) -> List[LLMProvider]:
+        """
+        Rank registered providers for a task, best first, as the fallback chain
+        
+        :param task: Description of the task
+        :param constraints: Inference constraints
+        :return: Providers with a client, in fallback order
+        """
+        chain = sorted(
+            (provider for provider in self.providers if provider in self._clients),
+            key=self._task_scorer(task, constraints),
+            reverse=True
+        )
+        
+        # Fall back to the default provider even if it is not in self.providers
+        if self.default_provider in self._clients and self.default_provider not in chain:
+            chain.append(self.default_provider)
+        
+        return chain
+    
+    def _task_scorer(self, 
+                     task: str, 
+                     constraints: Dict[str, Any]) -> Callable[[LLMProvider], float]:
+        """
+        Build the scoring function for a task from the cached provider scores
         
-        # Define provider suitability scoring
+        :param task: Description of the task
+        :param constraints: Inference constraints
+        :return: Function scoring a provider; higher is better
+        """
+        self._refresh_scores()
+        weights = self.weights
+        
+        # Adjust the cached score for this task and its constraints
         def score_provider(provider: LLMProvider) -> float:
-            metrics = self._provider_metrics.get(provider, {})
             config = self.providers.get(provider, {})
-            
-            # Base score calculation
-            score = 1.0
-            
-            # Penalize providers with high failure rates
-            if metrics.get('total_calls', 0) > 0:
-                failure_rate = metrics.get('failed_calls', 0) / metrics['total_calls']
-                score *= (1 - failure_rate)
+            score = self._score_cache.get(provider, 0.0)
             
             # Consider task-specific capabilities
-            if provider == LLMProvider.OPENAI and 'gpt-4' in config.get('models', []):
-                score *= 1.2  # Bonus for advanced models
+            if capability_match(task, config.get('capabilities', [])):
+                score += weights['capability']
             
             # Check constraints
             if 'max_tokens' in constraints:
                 provider_max_tokens = config.get('max_tokens', float('inf'))
                 if provider_max_tokens < constraints['max_tokens']:
-                    score *= 0.5
+                    score -= weights['constraint']
             
             return score
         
-        # Rank providers
-        ranked_providers = sorted(
-            self.providers.keys(), 
-            key=score_provider, 
-            reverse=True
+        return score_provider
+    
+    def _refresh_scores(self):
+        """
+        Recompute cached scores for providers marked dirty, or for all
+        providers when the best value of a criterion has moved
+        """
+        if not self._score_dirty:
+            return
+        
+        # Best observed value of each criterion, as the reference for ratios
+        best_values = {
+            'price': self._best_value('price', min),
+            'avg_response_time': self._best_value('avg_response_time', min),
+            'throughput': self._best_value('throughput', max)
+        }
+        if best_values != self._best_values:
+            self._best_values = best_values
+            self._score_dirty.update(self.providers)
+        
+        for provider in self._score_dirty:
+            if provider in self.providers:
+                self._score_cache[provider] = self._score_provider(provider)
+        self._score_dirty.clear()
+    
+    def _score_provider(self, provider: LLMProvider) -> float:
+        """
+        Score a provider independently of the task: 0.3 (the uptime weight)
+        for a provider that never fails and is best on every criterion,
+        lower in proportion to how far it trails
+        
+        :param provider: Provider to score
+        :return: Task-independent score; higher is better
+        """
+        metrics = self._provider_metrics.get(provider, {})
+        config = self.providers.get(provider, {})
+        weights = self.weights
+        best_price = self._best_values['price']
+        best_latency = self._best_values['avg_response_time']
+        best_throughput = self._best_values['throughput']
+        
+        # Relative shortfall against the best provider; unknown values are neutral
+        price = config.get('price')
+        r_price = price / best_price - 1 if price and best_price else 0.0
+        latency = metrics.get('avg_response_time')
+        r_latency = latency / best_latency - 1 if latency and best_latency else 0.0
+        throughput = config.get('throughput')
+        r_throughput = best_throughput / throughput - 1 if throughput and best_throughput else 0.0
+        
+        failure_rate = 0.0
+        if metrics.get('total_calls', 0) > 0:
+            failure_rate = metrics.get('failed_calls', 0) / metrics['total_calls']
+        
+        return (
+            weights['uptime'] * (1 - failure_rate)
+            - weights['price'] * r_price
+            - weights['latency'] * r_latency
+            - weights['throughput'] * r_throughput
         )
+    
+    def _best_value(self, 
+                    key: str, 
+                    best: Callable[[List[float]], float]) -> Optional[float]:
+        """
+        Find the best positive value of a criterion across providers
         
-        # Select top provider or fallback
-        return ranked_providers[0] if ranked_providers else self.default_provider
+        :param key: Config key, or metrics key for avg_response_time
+        :param best: min or max, depending on which direction is better
+        :return: Best value, or None if no provider reports one
+        """
+        source = self._provider_metrics if key == 'avg_response_time' else self.providers
+        values = [
+            source.get(provider, {}).get(key) for provider in self.providers
+        ]
+        values = [value for value in values if value and value > 0]
+        return best(values) if values else None
     
     def route_inference(self, 
                         prompt: str, 
@@ -113,56 +386,336 @@ class LLMProviderRouter:
         """
         Route inference request to the most suitable provider
         
+        :param prompt: Input prompt
+        :param task: Task description
+        :param constraints: Optional inference constraints; 'cache_ttl'
+            overrides how long a deterministic result stays cached
+        :return: Inference result
+        """
+        constraints = dict(constraints or {})
+        cache_ttl = constraints.pop('cache_ttl', None)
+        
+        # Try providers best first, skipping any whose circuit is open
+        chain = self._provider_chain(task, constraints)
+        for provider in chain:
+            if self._circuits[provider].is_open():
+                continue
+            
+            cache_key, cached = self._cache_lookup(provider, prompt, constraints)
+            if cached is not None:
+                return cached
+            
+            try:
+                # Measure inference time
+                start_time = time.perf_counter()
+                result = self._clients[provider].generate(prompt, **constraints)
+                response_time = time.perf_counter() - start_time
+            except Exception as e:
+                # Move on to the next provider
+                self._record_failure(provider, e)
+                continue
+            
+            return self._record_success(provider, result, response_time, cache_key, cache_ttl)
+        
+        raise AllProvidersFailedError(chain)
+    
+    async def route_inference_concurrent(self, 
+                                         prompts: List[str], 
+                                         task: str, 
+                                         constraints: Optional[Dict[str, Any]] = None,
+                                         concurrency: int = 10) -> List[Any]:
+        """
+        Route independent prompts as separate concurrent requests, e.g. for
+        majority-vote sampling, with at most `concurrency` in flight
+        
+        :param prompts: Input prompts
+        :param task: Task description
+        :param constraints: Optional inference constraints shared by all prompts
+        :param concurrency: Maximum concurrent provider calls
+        :return: Inference results in the same order as prompts; a failed
+            prompt yields its exception instead of a result
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def route_one(prompt: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._route_one_async(prompt, task, constraints)
+        
+        return await asyncio.gather(
+            *(route_one(prompt) for prompt in prompts),
+            return_exceptions=True
+        )
+    
+    async def _route_one_async(self, 
+                               prompt: str, 
+                               task: str, 
+                               constraints: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Async counterpart of route_inference, running the blocking client
+        call in a worker thread
+        
         :param prompt: Input prompt
         :param task: Task description
         :param constraints: Optional inference constraints
         :return: Inference result
         """
-        selected_provider = self.select_model(task, constraints)
+        constraints = dict(constraints or {})
+        cache_ttl = constraints.pop('cache_ttl', None)
         
-        try:
-            client = self._clients[selected_provider]
+        chain = self._provider_chain(task, constraints)
+        for provider in chain:
+            if self._circuits[provider].is_open():
+                continue
             
-            # Measure inference time
-            start_time = time.time()
-            result = client.generate(prompt, **constraints)
+            cache_key, cached = self._cache_lookup(provider, prompt, constraints)
+            if cached is not None:
+                return cached
             
-            # Update metrics
-            metrics = self._provider_metrics[selected_provider]
-            metrics['total_calls'] += 1
-            metrics['successful_calls'] += 1
-            metrics['avg_response_time'] = (
-                metrics['avg_response_time'] * (metrics['successful_calls'] - 1) + 
-                (time.time() - start_time)
-            ) / metrics['successful_calls']
-            metrics['total_tokens_used'] += result.get('tokens_used', 0)
+            try:
+                start_time = time.perf_counter()
+                result = await asyncio.to_thread(
+                    self._clients[provider].generate, prompt, **constraints
+                )
+                response_time = time.perf_counter() - start_time
+            except Exception as e:
+                self._record_failure(provider, e)
+                continue
             
-            return {
-                'provider': selected_provider,
+            return self._record_success(provider, result, response_time, cache_key, cache_ttl)
+        
+        raise AllProvidersFailedError(chain)
+    
+    def _cache_lookup(self, 
+                      provider: LLMProvider, 
+                      prompt: str, 
+                      constraints: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Replay a deterministic request from the cache without a provider call
+        
+        :param provider: Provider about to be called
+        :param prompt: Input prompt
+        :param constraints: Inference constraints
+        :return: Cache key (None if the request is not cacheable) and the
+            cached inference result, if any
+        """
+        if self.cache is None or not LLMCache.is_cacheable(constraints):
+            return None, None
+        
+        cache_key = LLMCache.make_key(
+            provider.name,
+            constraints.get('model', self.providers.get(provider, {}).get('model')),
+            prompt,
+            constraints
+        )
+        cached = self.cache.get(cache_key)
+        
+        metrics = self._provider_metrics[provider]
+        if cached is None:
+            metrics['cache_misses'] += 1
+            return cache_key, None
+        
+        metrics['cache_hits'] += 1
+        return cache_key, {
+            'provider': provider,
+            'result': cached,
+            'metadata': {
+                'response_time': 0.0,
+                'tokens_used': 0,
+                'cache_hit': True
+            }
+        }
+    
+    def _record_success(self, 
+                        provider: LLMProvider, 
+                        result: Dict[str, Any], 
+                        response_time: float,
+                        cache_key: Optional[str] = None,
+                        cache_ttl: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Update metrics, circuit and cache after a successful provider call
+        
+        :param provider: Provider that answered
+        :param result: Provider result
+        :param response_time: Call duration in seconds
+        :param cache_key: Key to cache the result under, if cacheable
+        :param cache_ttl: Optional cache TTL override
+        :return: Inference result
+        """
+        self._circuits[provider].record_success()
+        
+        if cache_key is not None:
+            self.cache.set(cache_key, result, cache_ttl)
+        
+        # Update metrics (incremental mean of response time)
+        metrics = self._provider_metrics[provider]
+        tokens_used = result.get('tokens_used', 0)
+        metrics['total_calls'] += 1
+        metrics['successful_calls'] += 1
+        metrics['avg_response_time'] += (
+            (response_time - metrics['avg_response_time']) / metrics['successful_calls']
+        )
+        metrics['total_tokens_used'] += tokens_used
+        self._score_dirty.add(provider)
+        
+        return {
+            'provider': provider,
+            'result': result,
+            'metadata': {
+                'response_time': response_time,
+                'tokens_used': tokens_used
+            }
+        }
+    
+    def _record_failure(self, provider: LLMProvider, error: Exception):
+        """
+        Log a failed provider call and update its metrics and circuit
+        
+        :param provider: Provider that failed
+        :param error: Exception raised by the client
+        """
+        self.logger.error(f"Provider {provider} failed: {error}")
+        
+        # Update failure metrics
+        metrics = self._provider_metrics[provider]
+        metrics['total_calls'] += 1
+        metrics['failed_calls'] += 1
+        self._score_dirty.add(provider)
+        self._circuits[provider].record_failure()
+    
+    async def route_inference_async(self, 
+                                    prompt: str, 
+                                    task: str, 
+                                    constraints: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Route an inference request through the selected provider's micro-batch
+        collector, so concurrent calls with the same constraints share one
+        provider request
+        
+        :param prompt: Input prompt
+        :param task: Task description
+        :param constraints: Optional inference constraints
+        :return: Inference result
+        """
+        constraints = constraints or {}
+        
+        # Try providers best first, skipping any whose circuit is open
+        chain = self._provider_chain(task, constraints)
+        for provider in chain:
+            if self._circuits[provider].is_open():
+                continue
+            
+            try:
+                return await self._route_batched(provider, prompt, constraints)
+            except Exception as e:
+                self.logger.error(f"Provider {provider} failed: {e}")
+        
+        raise AllProvidersFailedError(chain)
+    
+    async def route_inference_batch(self, 
+                                    prompts: List[str], 
+                                    task: str, 
+                                    constraints: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Route several prompts for the same task, batching provider calls
+        
+        :param prompts: Input prompts
+        :param task: Task description
+        :param constraints: Optional inference constraints shared by all prompts
+        :return: Inference results in the same order as prompts
+        """
+        return await asyncio.gather(
+            *(self.route_inference_async(prompt, task, constraints) for prompt in prompts)
+        )
+    
+    async def _route_batched(self, 
+                             provider: LLMProvider, 
+                             prompt: str, 
+                             constraints: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Submit a prompt to the collector for a provider and constraints
+        
+        :param provider: Provider to call
+        :param prompt: Input prompt
+        :param constraints: Inference constraints passed to the client
+        :return: Inference result
+        """
+        # Serialized so unhashable constraint values (e.g. stop=[...]) still form a key
+        key = (provider, json.dumps(constraints, sort_keys=True, default=str))
+        collector = self._batch_collectors.get(key)
+        
+        if collector is None or collector.loop is not asyncio.get_running_loop():
+            batching = self.providers.get(provider, {}).get('batching', {})
+            collector = _BatchCollector(
+                lambda prompts: self._send_batch(provider, prompts, constraints),
+                max_batch_size=batching.get('batch_size', DEFAULT_MAX_BATCH_SIZE),
+                max_wait_ms=batching.get('wait_ms', DEFAULT_MAX_WAIT_MS),
+                max_inflight=batching.get('max_inflight', DEFAULT_MAX_INFLIGHT_BATCHES),
+                bucket_chars=batching.get('bucket_chars', DEFAULT_BUCKET_CHARS)
+            )
+            self._batch_collectors[key] = collector
+        
+        return await collector.submit(prompt)
+    
+    async def _send_batch(self, 
+                          provider: LLMProvider, 
+                          prompts: List[str], 
+                          constraints: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Send a batch of prompts in one provider call, falling back to
+        concurrent single calls when the client has no generate_batch
+        
+        :param provider: Provider to call
+        :param prompts: Input prompts
+        :param constraints: Inference constraints passed to the client
+        :return: One inference result per prompt
+        """
+        client = self._clients[provider]
+        metrics = self._provider_metrics[provider]
+        
+        start_time = time.perf_counter()
+        try:
+            if hasattr(client, 'generate_batch'):
+                results = await asyncio.to_thread(client.generate_batch, prompts, **constraints)
+            else:
+                results = await asyncio.gather(
+                    *(asyncio.to_thread(client.generate, prompt, **constraints) for prompt in prompts)
+                )
+            if len(results) != len(prompts):
+                raise ValueError(
+                    f"{provider} returned {len(results)} results for {len(prompts)} prompts"
+                )
+        except Exception:
+            metrics['total_calls'] += len(prompts)
+            metrics['failed_calls'] += len(prompts)
+            self._score_dirty.add(provider)
+            self._circuits[provider].record_failure()
+            raise
+        response_time = time.perf_counter() - start_time
+        self._circuits[provider].record_success()
+        
+        # Every prompt in the batch shares the batch's response time
+        metrics['total_calls'] += len(prompts)
+        metrics['successful_calls'] += len(prompts)
+        metrics['avg_response_time'] += (
+            (response_time - metrics['avg_response_time']) * len(prompts) / metrics['successful_calls']
+        )
+        self._score_dirty.add(provider)
+        
+        responses = []
+        for result in results:
+            tokens_used = result.get('tokens_used', 0)
+            metrics['total_tokens_used'] += tokens_used
+            responses.append({
+                'provider': provider,
                 'result': result,
                 'metadata': {
-                    'response_time': time.time() - start_time,
-                    'tokens_used': result.get('tokens_used', 0)
+                    'response_time': response_time,
+                    'tokens_used': tokens_used,
+                    'batch_size': len(prompts)
                 }
-            }
+            })
         
-        except Exception as e:
-            # Log and handle provider failure
-            self.logger.error(f"Provider {selected_provider} failed: {e}")
-            
-            # Update failure metrics
-            metrics = self._provider_metrics[selected_provider]
-            metrics['total_calls'] += 1
-            metrics['failed_calls'] += 1
-            
-            # Attempt fallback to default provider
-            if selected_provider != self.default_provider:
-                return self.route_inference(prompt, task, {
-                    **constraints, 
-                    'fallback_mode': True
-                })
-            
-            raise RuntimeError("All LLM providers failed")
+        return responses
     
     def get_provider_status(self) -> Dict[LLMProvider, Dict[str, Any]]:
         """
@@ -1,9 +1,11 @@
-from typing import Dict, Any, Optional, Union, List
+from typing import Dict, Any, Callable, Optional, Tuple, Union, List
+import functools
 import json
 from datetime import datetime
 from core.error_handler import AgentError, ErrorSeverity
 from enum import Enum, auto
 import re
+import numpy as np
 
 class ResponseParserError(AgentError):
     """Exception raised for response parsing errors."""
@@ -22,11 +24,86 @@ class DataType(Enum):
     DICT = auto()
     NULL = auto()
 
+def _to_str(value: Any, format_spec: Optional[str]) -> str:
+    return str(value)
+
+def _to_int(value: Any, format_spec: Optional[str]) -> int:
+    return int(value)
+
+def _to_float(value: Any, format_spec: Optional[str]) -> float:
+    return float(value)
+
+def _to_bool(value: Any, format_spec: Optional[str]) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ['true', '1', 'yes', 'y']
+    return bool(value)
+
+def _to_datetime(value: Any, format_spec: Optional[str]) -> datetime:
+    # Handle different datetime formats
+    if format_spec:
+        return datetime.strptime(str(value), format_spec)
+    return datetime.fromisoformat(str(value))
+
+def _to_list(value: Any, format_spec: Optional[str]) -> list:
+    if not isinstance(value, list):
+        return [value]
+    return value
+
+def _to_dict(value: Any, format_spec: Optional[str]) -> dict:
+    if not isinstance(value, dict):
+        raise ValueError("Cannot convert to dictionary")
+    return value
+
+def _unique(values: List[Any]) -> List[Any]:
+    """
+    Remove duplicates, keeping first occurrences in order.
+    """
+    try:
+        return list(dict.fromkeys(values))
+    except TypeError:
+        # Unhashable values (e.g. nested dicts) need a linear scan
+        unique_values = []
+        for value in values:
+            if value not in unique_values:
+                unique_values.append(value)
+        return unique_values
+
+# Marks a missing key while walking a nested path
+_MISSING = object()
+
+@functools.lru_cache(maxsize=4096)
+def _split_path(path: str) -> Tuple[str, ...]:
+    return tuple(path.split('.'))
+
+# Converters whose columns can be cast in one NumPy call
+_NUMPY_DTYPES = {
+    _to_int: np.int64,
+    _to_float: np.float64
+}
+
 class ResponseParser:
     """
     Centralized parser for normalizing and validating API responses
     across different service providers.
     """
+    # Compiles validation patterns; replace with a compatible compiler
+    # (anything returning an object with .match(str)) for faster matching
+    pattern_compiler: Callable[[str], Any] = staticmethod(re.compile)
+    
+    # Converters for each supported target type, as DataType or builtin type
+    _CONVERTERS: Dict[Union[type, DataType], Callable[[Any, Optional[str]], Any]] = {
+        DataType.STRING: _to_str, str: _to_str,
+        DataType.INTEGER: _to_int, int: _to_int,
+        DataType.FLOAT: _to_float, float: _to_float,
+        DataType.BOOLEAN: _to_bool, bool: _to_bool,
+        DataType.DATETIME: _to_datetime, datetime: _to_datetime,
+        DataType.LIST: _to_list, list: _to_list,
+        DataType.DICT: _to_dict, dict: _to_dict
+    }
+    
+    # Compiled validation patterns, keyed by pattern string
+    _pattern_cache: Dict[str, Any] = {}
+
     @staticmethod
     def normalize_response(
         response: Dict[str, Any], 
@@ -89,7 +166,7 @@ class ResponseParser:
 
         # Check for unexpected fields in strict mode
         if strict:
-            unexpected_fields = set(response.keys()) - set(schema.keys())
+            unexpected_fields = response.keys() - schema.keys()
             if unexpected_fields:
                 raise ResponseParserError(
                     f"Unexpected fields: {unexpected_fields}",
@@ -99,8 +176,104 @@ class ResponseParser:
 
         return normalized_response
 
-    @staticmethod
+    @classmethod
+    def normalize_batch(
+        cls,
+        responses: List[Dict[str, Any]], 
+        schema: Optional[Dict[str, Union[type, Dict[str, Any]]]] = None,
+        strict: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Normalize many responses against one schema, converting each field
+        as a column so type dispatch happens once per field instead of per row.
+        
+        :param responses: Raw API responses
+        :param schema: Optional schema for validation and type conversion
+        :param strict: If True, raises error on missing or unexpected fields
+        :return: Normalized responses, in input order
+        """
+        # If no schema, return responses as-is
+        if not schema:
+            return list(responses)
+
+        normalized_responses = [{} for _ in responses]
+
+        for key, type_spec in schema.items():
+            rows = [i for i, response in enumerate(responses) if key in response]
+            if strict and len(rows) < len(responses):
+                raise ResponseParserError(
+                    f"Missing required field: {key}",
+                    severity=ErrorSeverity.ERROR,
+                    context={'schema': schema, 'missing_rows': len(responses) - len(rows)}
+                )
+
+            column = [responses[i][key] for i in rows]
+
+            if isinstance(type_spec, dict):
+                # Nested schema
+                if 'type' in type_spec:
+                    column = cls._convert_column(
+                        column, 
+                        type_spec['type'], 
+                        type_spec.get('format'),
+                        type_spec.get('optional', False)
+                    )
+
+                    if 'validation' in type_spec:
+                        for value in column:
+                            cls._validate_value(value, type_spec['validation'])
+            else:
+                column = cls._convert_column(column, type_spec)
+
+            for i, value in zip(rows, column):
+                normalized_responses[i][key] = value
+
+        # Check for unexpected fields in strict mode
+        if strict:
+            unexpected_fields = set().union(*responses) - set(schema.keys())
+            if unexpected_fields:
+                raise ResponseParserError(
+                    f"Unexpected fields: {unexpected_fields}",
+                    severity=ErrorSeverity.WARNING,
+                    context={'unexpected_fields': list(unexpected_fields)}
+                )
+
+        return normalized_responses
+
+    @classmethod
+    def _convert_column(
+        cls,
+        column: List[Any], 
+        target_type: Union[type, DataType], 
+        format_spec: Optional[str] = None,
+        optional: bool = False
+    ) -> List[Any]:
+        """
+        Convert a column of values to specified type, casting numeric
+        columns in one NumPy call when possible.
+        
+        :param column: Values to convert
+        :param target_type: Target type for conversion
+        :param format_spec: Optional format specification
+        :param optional: Whether the field is optional
+        :return: Converted values
+        """
+        dtype = _NUMPY_DTYPES.get(cls._CONVERTERS.get(target_type))
+        if dtype is not None and None not in column:
+            try:
+                return np.asarray(column, dtype=dtype).tolist()
+            except (ValueError, TypeError, OverflowError):
+                # Convert value by value so the offending value is reported
+                pass
+
+        return [
+            cls._convert_type(value, target_type, format_spec, optional)
+            for value in column
+        ]
+
+    @classmethod
     def _convert_type(
+        cls,
         value: Any, 
         target_type: Union[type, DataType], 
         format_spec: Optional[str] = None,
@@ -124,40 +297,12 @@ class ResponseParser:
                 severity=ErrorSeverity.ERROR
             )
 
+        converter = cls._CONVERTERS.get(target_type)
+        if converter is None:
+            return value
+
         try:
-            # Type conversion
-            if target_type == DataType.STRING or target_type == str:
-                return str(value)
-            
-            elif target_type == DataType.INTEGER or target_type == int:
-                return int(value)
-            
-            elif target_type == DataType.FLOAT or target_type == float:
-                return float(value)
-            
-            elif target_type == DataType.BOOLEAN or target_type == bool:
-                if isinstance(value, str):
-                    return value.lower() in ['true', '1', 'yes', 'y']
-                return bool(value)
-            
-            elif target_type == DataType.DATETIME or target_type == datetime:
-                # Handle different datetime formats
-                if format_spec:
-                    return datetime.strptime(str(value), format_spec)
-                return datetime.fromisoformat(str(value))
-            
-            elif target_type == DataType.LIST or target_type == list:
-                if not isinstance(value, list):
-                    return [value]
-                return value
-            
-            elif target_type == DataType.DICT or target_type == dict:
-                if not isinstance(value, dict):
-                    raise ValueError("Cannot convert to dictionary")
-                return value
-            
-            else:
-                return value
+            return converter(value, format_spec)
 
         except (ValueError, TypeError) as e:
             raise ResponseParserError(
@@ -170,8 +315,22 @@ class ResponseParser:
                 }
             )
 
-    @staticmethod
+    @classmethod
+    def _compiled_pattern(cls, pattern: str) -> Any:
+        """
+        Get the compiled form of a validation pattern, compiling it once.
+        
+        :param pattern: Regular expression
+        :return: Compiled pattern
+        """
+        compiled = cls._pattern_cache.get(pattern)
+        if compiled is None:
+            compiled = cls._pattern_cache[pattern] = cls.pattern_compiler(pattern)
+        return compiled
+
+    @classmethod
     def _validate_value(
+        cls,
         value: Any, 
         validation_rules: Dict[str, Any]
     ):
@@ -184,7 +343,7 @@ class ResponseParser:
         # Regex pattern validation
         if 'pattern' in validation_rules:
             pattern = validation_rules['pattern']
-            if not re.match(pattern, str(value)):
+            if not cls._compiled_pattern(pattern).match(str(value)):
                 raise ResponseParserError(
                     f"Value does not match pattern: {pattern}",
                     severity=ErrorSeverity.ERROR,
@@ -235,17 +394,12 @@ class ResponseParser:
         :param default: Default value if path is not found
         :return: Extracted value or default
         """
-        keys = path.split('.')
         current = response
 
-        for key in keys:
-            if not isinstance(current, dict):
+        for key in _split_path(path):
+            current = current.get(key, _MISSING) if isinstance(current, dict) else _MISSING
+            if current is _MISSING:
                 return default
-            
-            if key not in current:
-                return default
-            
-            current = current[key]
 
         return current
 
@@ -264,24 +418,43 @@ class ResponseParser:
         if not responses:
             return {}
 
-        merged = responses[0].copy()
+        merged: Dict[str, Any] = {}
+
+        if strategy == 'overwrite':
+            for response in responses:
+                merged.update(response)
+            return merged
+
+        if strategy not in ('append', 'unique'):
+            # Unknown strategy: the first value of each key wins
+            for response in responses:
+                for key, value in response.items():
+                    merged.setdefault(key, value)
+            return merged
 
-        for response in responses[1:]:
+        # Keys whose merged value is a list, accumulated in one pass so
+        # inputs are never mutated or re-copied per response
+        accumulated: Dict[str, List[Any]] = {}
+
+        for response in responses:
             for key, value in response.items():
-                if key not in merged:
-                    merged[key] = value
-                else:
-                    if strategy == 'overwrite':
+                values = accumulated.get(key)
+                if values is None:
+                    if key not in merged:
                         merged[key] = value
-                    elif strategy == 'append':
-                        if isinstance(merged[key], list):
-                            merged[key].extend(value if isinstance(value, list) else [value])
-                        else:
-                            merged[key] = [merged[key], value]
-                    elif strategy == 'unique':
-                        if isinstance(merged[key], list):
-                            merged[key] = list(set(merged[key] + (value if isinstance(value, list) else [value])))
-                        else:
-                            merged[key] = value
+                        continue
+                    current = merged[key]
+                    if strategy == 'unique' and not isinstance(current, list):
+                        merged[key] = value
+                        continue
+                    values = accumulated[key] = list(current) if isinstance(current, list) else [current]
+
+                if isinstance(value, list):
+                    values.extend(value)
+                else:
+                    values.append(value)
+
+        for key, values in accumulated.items():
+            merged[key] = _unique(values) if strategy == 'unique' else values
 
         return merged
@@ -1,10 +1,12 @@
 import asyncio
 import random
-from typing import Callable, Any, Optional, Dict, Union, List
+from collections import deque
+from typing import Callable, Any, Deque, Optional, Dict, Union, List, Tuple, Type
 import logging
 from core.error_handler import AgentError, ErrorSeverity
 import time
 import inspect
+import functools
 from enum import Enum, auto
 
 class RetryStrategy(Enum):
@@ -16,6 +18,15 @@ class RetryStrategy(Enum):
     EXPONENTIAL = auto()
     FIBONACCI = auto()
 
+# Uncapped backoff delay before retry attempt i (1-based) from base delay b
+_STRATEGY_FNS: Dict[RetryStrategy, Callable[[int, float], float]] = {
+    RetryStrategy.CONSTANT: lambda i, b: b,
+    RetryStrategy.LINEAR: lambda i, b: b * i,
+    RetryStrategy.EXPONENTIAL: lambda i, b: b * (1 << (i - 1)),
+    # Fibonacci-like sequence for delays
+    RetryStrategy.FIBONACCI: lambda i, b: b * (1.618 ** i)
+}
+
 class CircuitState(Enum):
     """
     Enumeration of circuit breaker states.
@@ -28,6 +39,92 @@ class RetryHandlerError(AgentError):
     """Exception raised for retry-related errors."""
     pass
 
+class CircuitBreaker:
+    """
+    Standalone circuit breaker that opens after too many failures within
+    a rolling time window, for guarding individual providers or endpoints.
+    """
+    __slots__ = (
+        '_failure_threshold', '_window', '_reset_timeout',
+        '_failures', '_state', '_opened_at'
+    )
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        window: float = 60.0,
+        reset_timeout: float = 30.0
+    ):
+        """
+        Initialize CircuitBreaker.
+        
+        :param failure_threshold: Failures within the window that open the circuit
+        :param window: Rolling window in seconds over which failures are counted
+        :param reset_timeout: Time to wait before letting a trial request through
+        """
+        self._failure_threshold = failure_threshold
+        self._window = window
+        self._reset_timeout = reset_timeout
+        
+        self._failures: Deque[float] = deque()
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        Current circuit state, moving from OPEN to HALF_OPEN once the reset timeout passes.
+        """
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self._reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+        return self._state
+
+    def is_open(self) -> bool:
+        """
+        Check whether requests are currently blocked.
+        
+        :return: True while the circuit is open
+        """
+        return self.state == CircuitState.OPEN
+
+    def record_success(self):
+        """
+        Record a successful request, closing the circuit.
+        """
+        self._state = CircuitState.CLOSED
+        self._failures.clear()
+
+    def record_failure(self):
+        """
+        Record a failed request, opening the circuit if the trial request
+        failed or the window holds too many failures.
+        """
+        now = time.monotonic()
+        
+        if self.state == CircuitState.HALF_OPEN:
+            self._open(now)
+            return
+        
+        self._failures.append(now)
+        while self._failures and now - self._failures[0] > self._window:
+            self._failures.popleft()
+        
+        if len(self._failures) >= self._failure_threshold:
+            self._open(now)
+
+    def _open(self, now: float):
+        """
+        Open the circuit.
+        
+        :param now: Monotonic time the circuit opened
+        """
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._failures.clear()
+
 class RetryHandler:
     """
     Advanced retry mechanism with configurable backoff strategies
@@ -62,6 +159,13 @@ class RetryHandler:
         self._backoff_strategy = backoff_strategy
         self._jitter = jitter
         
+        # Capped delay before each retry, fixed by the strategy
+        strategy_fn = _STRATEGY_FNS.get(backoff_strategy, _STRATEGY_FNS[RetryStrategy.CONSTANT])
+        self._delays = tuple(
+            min(strategy_fn(attempt, base_delay), max_delay)
+            for attempt in range(1, max_retries + 1)
+        )
+        
         # Circuit breaker configuration
         self._circuit_failure_threshold = circuit_failure_threshold
         self._circuit_reset_timeout = circuit_reset_timeout
@@ -79,29 +183,76 @@ class RetryHandler:
         :param attempt: Current retry attempt number
         :return: Delay in seconds
         """
-        base_delay = self._base_delay
-
-        # Calculate delay based on strategy
-        if self._backoff_strategy == RetryStrategy.CONSTANT:
-            delay = base_delay
-        elif self._backoff_strategy == RetryStrategy.LINEAR:
-            delay = base_delay * attempt
-        elif self._backoff_strategy == RetryStrategy.EXPONENTIAL:
-            delay = base_delay * (2 ** (attempt - 1))
-        elif self._backoff_strategy == RetryStrategy.FIBONACCI:
-            # Fibonacci-like sequence for delays
-            delay = base_delay * (1.618 ** attempt)
-        else:
-            delay = base_delay
-
-        # Apply maximum delay limit
-        delay = min(delay, self._max_delay)
+        delay = self._delays[min(attempt, len(self._delays)) - 1]
 
         # Add jitter to prevent synchronized retries
         jitter_amount = delay * self._jitter
-        delay += random.uniform(-jitter_amount, jitter_amount)
+        return max(0.0, delay + random.uniform(-jitter_amount, jitter_amount))
+
+    def _check_circuit(self):
+        """
+        Block the call if the circuit is open, moving to half-open once
+        the reset timeout has passed.
+        """
+        if self._circuit_state == CircuitState.OPEN:
+            # Check if circuit can be reset
+            if time.time() - self._last_failure_time >= self._circuit_reset_timeout:
+                self._circuit_state = CircuitState.HALF_OPEN
+            else:
+                raise RetryHandlerError(
+                    "Circuit is open. Requests are currently blocked.",
+                    severity=ErrorSeverity.WARNING
+                )
 
-        return max(0, delay)
+    def _record_success(self):
+        """
+        Reset the circuit after a successful call.
+        """
+        if self._circuit_state == CircuitState.HALF_OPEN:
+            self._circuit_state = CircuitState.CLOSED
+        self._failure_count = 0
+
+    def _record_failure(self, error: Exception, attempt: int) -> float:
+        """
+        Record a failed attempt, raising if the circuit opens or retries
+        are exhausted.
+        
+        :param error: Exception raised by the attempt
+        :param attempt: Current retry attempt number
+        :return: Delay in seconds before the next attempt
+        """
+        # Increment failure count
+        self._failure_count += 1
+        
+        # Check circuit breaker threshold
+        if self._failure_count >= self._circuit_failure_threshold:
+            self._circuit_state = CircuitState.OPEN
+            self._last_failure_time = time.time()
+            
+            raise RetryHandlerError(
+                f"Circuit breaker opened after {self._failure_count} consecutive failures",
+                severity=ErrorSeverity.CRITICAL,
+                context={'last_error': str(error)}
+            )
+        
+        # Last attempt
+        if attempt == self._max_retries:
+            raise RetryHandlerError(
+                f"Failed after {self._max_retries} attempts",
+                severity=ErrorSeverity.ERROR,
+                context={'last_error': str(error)}
+            )
+        
+        # Calculate delay
+        delay = self._calculate_delay(attempt)
+        
+        # Log retry attempt
+        logging.warning(
+            f"Retry attempt {attempt}: {str(error)}. "
+            f"Waiting {delay:.2f} seconds."
+        )
+        
+        return delay
 
     async def retry(
         self, 
@@ -112,24 +263,34 @@ class RetryHandler:
         """
         Execute a function with retry and circuit breaker mechanism.
         
+        :param func: Function to execute (async or sync)
+        :param args: Positional arguments for the function
+        :param kwargs: Keyword arguments for the function
+        :return: Result of the function
+        """
+        return await self._retry(func, inspect.iscoroutinefunction(func), args, kwargs)
+
+    async def _retry(
+        self, 
+        func: Callable[..., Any], 
+        is_async: bool, 
+        args: Tuple[Any, ...], 
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        """
+        Retry loop shared by retry and decorated functions.
+        
         :param func: Function to execute
+        :param is_async: Whether func is a coroutine function
         :param args: Positional arguments for the function
         :param kwargs: Keyword arguments for the function
         :return: Result of the function
         """
-        # Check if function is async
-        is_async = inspect.iscoroutinefunction(func)
+        self._check_circuit()
 
-        # Circuit breaker check
-        if self._circuit_state == CircuitState.OPEN:
-            # Check if circuit can be reset
-            if time.time() - self._last_failure_time >= self._circuit_reset_timeout:
-                self._circuit_state = CircuitState.HALF_OPEN
-            else:
-                raise RetryHandlerError(
-                    "Circuit is open. Requests are currently blocked.",
-                    severity=ErrorSeverity.WARNING
-                )
+        # Bind loop invariants to locals
+        retry_on = self._retry_on
+        record_failure = self._record_failure
 
         for attempt in range(1, self._max_retries + 1):
             try:
@@ -138,48 +299,46 @@ class RetryHandler:
                     result = await func(*args, **kwargs)
                 else:
                     result = func(*args, **kwargs)
-                
-                # Success: reset circuit
-                if self._circuit_state == CircuitState.HALF_OPEN:
-                    self._circuit_state = CircuitState.CLOSED
-                self._failure_count = 0
-                
-                return result
-
-            except self._retry_on as e:
-                # Increment failure count
-                self._failure_count += 1
-                
-                # Check circuit breaker threshold
-                if self._failure_count >= self._circuit_failure_threshold:
-                    self._circuit_state = CircuitState.OPEN
-                    self._last_failure_time = time.time()
-                    
-                    raise RetryHandlerError(
-                        f"Circuit breaker opened after {self._failure_count} consecutive failures",
-                        severity=ErrorSeverity.CRITICAL,
-                        context={'last_error': str(e)}
-                    )
-                
-                # Last attempt
-                if attempt == self._max_retries:
-                    raise RetryHandlerError(
-                        f"Failed after {self._max_retries} attempts",
-                        severity=ErrorSeverity.ERROR,
-                        context={'last_error': str(e)}
-                    )
-                
-                # Calculate and apply delay
-                delay = self._calculate_delay(attempt)
-                
-                # Log retry attempt
-                logging.warning(
-                    f"Retry attempt {attempt}: {str(e)}. "
-                    f"Waiting {delay:.2f} seconds."
-                )
-                
+            except retry_on as e:
+                # Wait before retry
+                await asyncio.sleep(record_failure(e, attempt))
+                continue
+            
+            self._record_success()
+            return result
+
+    def retry_sync(
+        self, 
+        func: Callable[..., Any], 
+        *args, 
+        **kwargs
+    ) -> Any:
+        """
+        Execute a synchronous function with retry and circuit breaker
+        mechanism, blocking between attempts.
+        
+        :param func: Function to execute
+        :param args: Positional arguments for the function
+        :param kwargs: Keyword arguments for the function
+        :return: Result of the function
+        """
+        self._check_circuit()
+
+        # Bind loop invariants to locals
+        retry_on = self._retry_on
+        record_failure = self._record_failure
+        sleep = time.sleep
+
+        for attempt in range(1, self._max_retries + 1):
+            try:
+                result = func(*args, **kwargs)
+            except retry_on as e:
                 # Wait before retry
-                await asyncio.sleep(delay)
+                sleep(record_failure(e, attempt))
+                continue
+            
+            self._record_success()
+            return result
 
     def decorator(
         self, 
@@ -196,15 +355,30 @@ class RetryHandler:
         :param backoff_strategy: Override default backoff strategy
         :return: Decorated function
         """
+        # Build the handler once at decoration time; calls share it, and
+        # with it the circuit breaker state
+        if max_retries is None and backoff_strategy is None:
+            handler = self
+        else:
+            handler = RetryHandler(
+                max_retries=max_retries or self._max_retries,
+                base_delay=self._base_delay,
+                max_delay=self._max_delay,
+                backoff_strategy=backoff_strategy or self._backoff_strategy,
+                jitter=self._jitter,
+                circuit_failure_threshold=self._circuit_failure_threshold,
+                circuit_reset_timeout=self._circuit_reset_timeout,
+                retry_on=self._retry_on
+            )
+        
         def decorator_wrapper(f):
-            # Create a wrapper that uses the retry method
+            # Resolved once here rather than on every call; decorated functions
+            # are always awaitable (use retry_sync to retry blocking calls)
+            is_async = inspect.iscoroutinefunction(f)
+            
+            @functools.wraps(f)
             async def wrapper(*args, **kwargs):
-                # Create a temporary RetryHandler with potential overrides
-                temp_handler = RetryHandler(
-                    max_retries=max_retries or self._max_retries,
-                    backoff_strategy=backoff_strategy or self._backoff_strategy
-                )
-                return await temp_handler.retry(f, *args, **kwargs)
+                return await handler._retry(f, is_async, args, kwargs)
             
             return wrapper
         
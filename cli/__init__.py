@@ -1,3 +1,9 @@
-from .agent_cli import HackathonAgentCLI
-
 __all__ = ['HackathonAgentCLI']
+
+def __getattr__(name):
+    # Imported on first use so cli.history_ring and cli.credential_manager
+    # load without the agent CLI's dependencies (rich, the agents package)
+    if name == 'HackathonAgentCLI':
+        from .agent_cli import HackathonAgentCLI
+        return HackathonAgentCLI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,12 +2,13 @@ import sys
 import logging
 import warnings
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from rich.console import Console
 from rich.logging import RichHandler
 from dotenv import load_dotenv
 
 from agents import BaseAgent
+from .history_ring import DEFAULT_CAPACITY, HistoryRing
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
@@ -23,6 +24,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger("autonomos_assistant_cli")
 
+# Conversation window passed to the agent
+DEFAULT_MAX_HISTORY_TURNS = 50
+DEFAULT_MAX_HISTORY_TOKENS = 4000
+
+# Cheap token estimate used for the history budget
+CHARS_PER_TOKEN = 4
+
 class HackathonAgentCLI:
     """
     CLI Interface for the Hackathon Agent
@@ -32,7 +40,11 @@ class HackathonAgentCLI:
     def __init__(
         self, 
         agent: BaseAgent, 
-        log_file: str = 'agent_interactions.log'
+        log_file: str = 'agent_interactions.log',
+        max_history_turns: int = DEFAULT_MAX_HISTORY_TURNS,
+        max_history_tokens: int = DEFAULT_MAX_HISTORY_TOKENS,
+        history_file: Optional[str] = None,
+        history_capacity: int = DEFAULT_CAPACITY
     ):
         """
         Initialize CLI with a specific agent and logging configuration
@@ -40,10 +52,20 @@ class HackathonAgentCLI:
         Args:
             agent (BaseAgent): The agent to interact with
             log_file (str, optional): Path for logging interactions
+            max_history_turns (int, optional): Most recent turns passed to the agent
+            max_history_tokens (int, optional): Approximate token budget for the history
+            history_file (str, optional): File backing the session's conversation history;
+                by default a temporary file removed when the session ends
+            history_capacity (int, optional): Bytes of history kept on disk
         """
         self.agent = agent
         self.console = Console()
-        self.conversation_history = []
+        self.max_history_turns = max_history_turns
+        self.max_history_tokens = max_history_tokens
+        
+        # Turns live in a memory-mapped ring, so only the window passed
+        # to the agent is ever held as a Python string
+        self.conversation_history = HistoryRing(history_file, history_capacity)
         
         # Configure file logging
         file_handler = logging.FileHandler(log_file)
@@ -68,7 +90,10 @@ class HackathonAgentCLI:
                 # Interact with the agent
                 response = self.agent.interact(
                     user_input, 
-                    conversation_history="\n".join(self.conversation_history)
+                    conversation_history=self.conversation_history.get_window(
+                        self.max_history_tokens * CHARS_PER_TOKEN,
+                        self.max_history_turns
+                    )
                 )
                 
                 # Log response to file only
@@ -79,8 +104,7 @@ class HackathonAgentCLI:
                 self.console.print(f"[bold green]{self.agent.name}: [/bold green]{response['response']}")
                 
                 # Update conversation history
-                self.conversation_history.append(f"User: {user_input}")
-                self.conversation_history.append(f"{self.agent.name}: {response['response']}")
+                self.conversation_history.append(f"User: {user_input}\n{self.agent.name}: {response['response']}")
             
             except Exception as e:
                 logger.error(f"Error during interaction: {e}")
@@ -99,4 +123,5 @@ class HackathonAgentCLI:
             logger.error(f"Unexpected error: {e}")
             self.console.print(f"[bold red]Error inesperado: {e}[/bold red]")
         finally:
+            self.conversation_history.close()
             sys.exit(0)
@@ -3,9 +3,13 @@
 Centralized Credential Management CLI for Autonomos Lab Agents
 """
 import os
-import json
+import atexit
+import threading
+import warnings
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+from core import _json
 
 class CredentialManager:
     """
@@ -15,12 +19,179 @@ class CredentialManager:
     
     CREDENTIAL_FILE = Path(os.path.expanduser("~/.autonomos_credentials.json"))
     
+    # Seconds to wait after a change before writing, so bursts of
+    # set_credential calls cost a single file write
+    FLUSH_DELAY = 5.0
+    
+    # Parsed credential file, valid while the file's mtime is unchanged
+    _cache: Optional[Dict[str, Dict[str, str]]] = None
+    _cache_mtime: int = 0
+    
+    # Unwritten changes by (service, key) and the pending flush
+    _dirty: bool = False
+    _pending: Dict[Tuple[str, str], str] = {}
+    _flush_timer: Optional[threading.Timer] = None
+    _lock = threading.RLock()
+    
+    # 'json' stores credentials in CREDENTIAL_FILE; 'keyring' uses the OS
+    # keyring (requires the keyring package) with JSON as the fallback
+    BACKEND = os.environ.get('CREDENTIAL_BACKEND', 'json').lower()
+    KEYRING_PREFIX = "autonomos:"
+    
+    # Keyring lookups by (service, key); the keyring cannot be enumerated,
+    # so service names are tracked in an index entry of their own
+    _keyring_cache: Dict[Tuple[str, str], str] = {}
+    _keyring_module = None
+    
+    @classmethod
+    def _keyring(cls):
+        """
+        Get the keyring module if the keyring backend is selected and available
+        
+        Returns:
+            module: keyring, or None to use the JSON file
+        """
+        if cls.BACKEND != 'keyring':
+            return None
+        
+        if cls._keyring_module is None:
+            try:
+                import keyring
+                import keyring.backends.fail
+                import keyring.errors
+            except ImportError:
+                return cls._use_json("keyring is not installed")
+            
+            # keyring imports fine without a usable backend (e.g. headless
+            # Linux); probe it once instead of failing on the first lookup
+            try:
+                if isinstance(keyring.get_keyring(), keyring.backends.fail.Keyring):
+                    return cls._use_json("no keyring backend is available")
+                keyring.get_password(f"{cls.KEYRING_PREFIX}_index", "services")
+            except keyring.errors.KeyringError as e:
+                return cls._use_json(f"the keyring is unavailable ({e})")
+            cls._keyring_module = keyring
+        
+        return cls._keyring_module
+    
+    @classmethod
+    def _use_json(cls, reason: str):
+        """
+        Switch to the JSON credential file after the keyring failed
+        
+        Args:
+            reason (str): Why the keyring cannot be used
+        
+        Returns:
+            None, so callers can return the result as "no keyring"
+        """
+        warnings.warn(f"{reason}; falling back to the JSON credential file")
+        cls.BACKEND = 'json'
+        cls._keyring_module = None
+        cls._keyring_cache.clear()
+        return None
+    
+    @classmethod
+    def _json_fallback(cls) -> Dict[str, Dict[str, str]]:
+        """
+        Get credentials stored in the JSON file before the keyring was enabled
+        
+        Returns:
+            dict: Credentials by service and key, empty if there is no file
+        """
+        if not cls._dirty and not cls.CREDENTIAL_FILE.exists():
+            return {}
+        return cls._load()
+    
+    @classmethod
+    def _keyring_services(cls) -> List[str]:
+        """
+        Read the index of services stored in the keyring
+        
+        Returns:
+            list: Service names
+        """
+        index = cls._keyring().get_password(f"{cls.KEYRING_PREFIX}_index", "services")
+        return _json.loads(index) if index else []
+    
     @classmethod
     def _ensure_credential_file(cls):
         """Ensure the credential file exists with proper permissions"""
         if not cls.CREDENTIAL_FILE.exists():
-            cls.CREDENTIAL_FILE.touch(mode=0o600)  # Read/write for owner only
-            cls.CREDENTIAL_FILE.write_text(json.dumps({}))
+            _json.dump_atomic(cls.CREDENTIAL_FILE, {}, mode=0o600)  # Read/write for owner only
+    
+    @classmethod
+    def _load(cls) -> Dict[str, Dict[str, str]]:
+        """
+        Get the parsed credentials, re-reading the file only if it changed
+        
+        Returns:
+            dict: Credentials by service and key
+        """
+        cls._ensure_credential_file()
+        
+        mtime = os.stat(cls.CREDENTIAL_FILE).st_mtime_ns
+        if cls._cache is None or mtime != cls._cache_mtime:
+            credentials = _json.load(cls.CREDENTIAL_FILE)
+            
+            # Another process wrote the file; keep its changes and
+            # reapply this process's unwritten ones on top
+            for (service, key), value in cls._pending.items():
+                credentials.setdefault(service, {})[key] = value
+            
+            cls._cache = credentials
+            cls._cache_mtime = mtime
+        
+        return cls._cache
+    
+    @classmethod
+    def _save(cls, credentials: Dict[str, Dict[str, str]]):
+        """
+        Atomically replace the credential file and remember its new mtime
+        
+        Args:
+            credentials (dict): Credentials by service and key
+        """
+        _json.dump_atomic(cls.CREDENTIAL_FILE, credentials, indent=True)
+        
+        cls._cache = credentials
+        cls._cache_mtime = os.stat(cls.CREDENTIAL_FILE).st_mtime_ns
+    
+    @classmethod
+    def flush(cls):
+        """Write pending credential changes to the file now"""
+        with cls._lock:
+            if cls._flush_timer is not None:
+                cls._flush_timer.cancel()
+                cls._flush_timer = None
+            
+            if cls._dirty:
+                # Merge with the file first in case it changed since the last read
+                cls._save(cls._load())
+                cls._pending.clear()
+                cls._dirty = False
+    
+    @classmethod
+    def _schedule_flush(cls):
+        """Mark the cache dirty and flush it after FLUSH_DELAY unless already scheduled"""
+        cls._dirty = True
+        if cls._flush_timer is None:
+            cls._flush_timer = threading.Timer(cls.FLUSH_DELAY, cls.flush)
+            cls._flush_timer.daemon = True
+            cls._flush_timer.start()
+    
+    @classmethod
+    def invalidate(cls):
+        """Drop the cached credentials so the next access re-reads the file"""
+        with cls._lock:
+            if cls._flush_timer is not None:
+                cls._flush_timer.cancel()
+                cls._flush_timer = None
+            cls._dirty = False
+            cls._pending.clear()
+            cls._cache = None
+            cls._cache_mtime = 0
+            cls._keyring_cache.clear()
     
     @classmethod
     def set_credential(cls, service: str, key: str, value: str):
@@ -32,20 +203,36 @@ class CredentialManager:
             key (str): Credential key (e.g., 'bot_token', 'api_key')
             value (str): Credential value
         """
-        cls._ensure_credential_file()
-        
-        # Read existing credentials
-        with open(cls.CREDENTIAL_FILE, 'r') as f:
-            credentials = json.load(f)
+        keyring = cls._keyring()
+        if keyring is not None:
+            try:
+                with cls._lock:
+                    keyring.set_password(f"{cls.KEYRING_PREFIX}{service}", key, value)
+                    cls._keyring_cache[(service, key)] = value
+                    
+                    services = cls._keyring_services()
+                    if service not in services:
+                        services.append(service)
+                        keyring.set_password(
+                            f"{cls.KEYRING_PREFIX}_index", "services", _json.dumps(services).decode()
+                        )
+                
+                print(f"Credential for {service} ({key}) set successfully.")
+                return
+            except keyring.errors.KeyringError as e:
+                cls._use_json(f"the keyring is unavailable ({e})")
         
-        # Update credentials
-        if service not in credentials:
-            credentials[service] = {}
-        credentials[service][key] = value
-        
-        # Write back to file
-        with open(cls.CREDENTIAL_FILE, 'w') as f:
-            json.dump(credentials, f, indent=2)
+        with cls._lock:
+            credentials = cls._load()
+            
+            # Update credentials
+            if service not in credentials:
+                credentials[service] = {}
+            credentials[service][key] = value
+            cls._pending[(service, key)] = value
+            
+            # Written back to file by the next flush
+            cls._schedule_flush()
         
         print(f"Credential for {service} ({key}) set successfully.")
     
@@ -61,23 +248,38 @@ class CredentialManager:
         Returns:
             str: Credential value or empty string if not found
         """
-        cls._ensure_credential_file()
+        keyring = cls._keyring()
+        if keyring is not None:
+            try:
+                value = cls._keyring_cache.get((service, key))
+                if value is None:
+                    value = keyring.get_password(f"{cls.KEYRING_PREFIX}{service}", key) or ''
+                    cls._keyring_cache[(service, key)] = value
+                if value:
+                    return value
+                # Credentials set before switching backends stay in the file
+                return cls._json_fallback().get(service, {}).get(key, '')
+            except keyring.errors.KeyringError as e:
+                cls._use_json(f"the keyring is unavailable ({e})")
         
-        with open(cls.CREDENTIAL_FILE, 'r') as f:
-            credentials = json.load(f)
-        
-        return credentials.get(service, {}).get(key, '')
+        return cls._load().get(service, {}).get(key, '')
     
     @classmethod
     def list_services(cls):
         """List all services with stored credentials"""
-        cls._ensure_credential_file()
-        
-        with open(cls.CREDENTIAL_FILE, 'r') as f:
-            credentials = json.load(f)
+        keyring = cls._keyring()
+        services = None
+        if keyring is not None:
+            try:
+                services = cls._keyring_services()
+                services += [name for name in cls._json_fallback() if name not in services]
+            except keyring.errors.KeyringError as e:
+                cls._use_json(f"the keyring is unavailable ({e})")
+        if services is None:
+            services = cls._load().keys()
         
         print("Stored Services:")
-        for service in credentials.keys():
+        for service in services:
             print(f"- {service}")
     
     @classmethod
@@ -88,13 +290,22 @@ class CredentialManager:
         Args:
             backup_path (str, optional): Path to backup file
         """
+        if cls._keyring() is not None:
+            print("Credentials are stored in the OS keyring; back up the keyring instead.")
+            return
+        
         if not backup_path:
             backup_path = f"{cls.CREDENTIAL_FILE}.backup"
         
+        cls.flush()
+        
         import shutil
         shutil.copy2(cls.CREDENTIAL_FILE, backup_path)
         print(f"Credentials backed up to {backup_path}")
 
+# Persist pending credential changes on interpreter exit
+atexit.register(CredentialManager.flush)
+
 def main():
     """CLI interface for credential management"""
     import argparse
@@ -113,6 +324,8 @@ def main():
         if not all([args.service, args.key, args.value]):
             parser.error("set requires --service, --key, and --value")
         CredentialManager.set_credential(args.service, args.key, args.value)
+        # A one-off command gains nothing from batching; write before exiting
+        CredentialManager.flush()
     
     elif args.action == 'get':
         if not all([args.service, args.key]):
@@ -0,0 +1,103 @@
+"""
+File-backed ring buffer for CLI conversation history
+"""
+import mmap
+import struct
+import tempfile
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+# Each record is a little-endian uint32 payload length followed by UTF-8 text
+_HEADER = struct.Struct('<I')
+
+DEFAULT_CAPACITY = 1024 * 1024
+
+class HistoryRing:
+    """
+    Append-only ring of conversation turns stored in a memory-mapped file.
+    Once the file is full, the oldest turns are overwritten, so memory use
+    stays bounded no matter how long the session runs.
+    """
+
+    def __init__(self, path: Optional[str] = None, capacity: int = DEFAULT_CAPACITY):
+        """
+        Create (or truncate) the history file and map it
+
+        Args:
+            path (str, optional): History file path; by default an anonymous
+                temporary file that is removed when closed
+            capacity (int, optional): Ring size in bytes
+        """
+        self._capacity = capacity
+        self._file = open(path, 'w+b') if path is not None else tempfile.TemporaryFile()
+        self._file.truncate(capacity)
+        self._mm = mmap.mmap(self._file.fileno(), capacity)
+
+        # (offset, payload length) of each live record, oldest first
+        self._records: Deque[Tuple[int, int]] = deque()
+        self._tail = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, text: str):
+        """
+        Write a turn at the tail, overwriting the oldest turns if needed
+
+        Args:
+            text (str): Turn text
+        """
+        data = text.encode('utf-8')
+
+        # A single oversized turn keeps only its most recent bytes
+        max_payload = self._capacity - _HEADER.size
+        if len(data) > max_payload:
+            data = data[-max_payload:]
+        size = _HEADER.size + len(data)
+
+        start = self._tail
+        if start + size > self._capacity:
+            # Records past the tail are the oldest; wrapping turns them into dead space
+            while self._records and self._records[0][0] >= start:
+                self._records.popleft()
+            start = 0
+
+        # Drop the oldest records the new one overwrites
+        end = start + size
+        while self._records and start <= self._records[0][0] < end:
+            self._records.popleft()
+
+        _HEADER.pack_into(self._mm, start, len(data))
+        self._mm[start + _HEADER.size:end] = data
+        self._records.append((start + _HEADER.size, len(data)))
+        self._tail = end
+
+    def get_window(self, n_bytes: int, max_records: Optional[int] = None) -> str:
+        """
+        Read the most recent turns that fit in a byte budget
+
+        Args:
+            n_bytes (int): Maximum payload bytes to read; the latest turn is always included
+            max_records (int, optional): Maximum number of turns
+
+        Returns:
+            str: Turns joined by newlines, oldest first
+        """
+        parts = []
+        total = 0
+
+        for offset, length in reversed(self._records):
+            if parts and (total + length > n_bytes or len(parts) == max_records):
+                break
+            parts.append(self._mm[offset:offset + length].decode('utf-8', errors='replace'))
+            total += length
+
+        parts.reverse()
+        return "\n".join(parts)
+
+    def close(self):
+        """
+        Unmap and close the history file
+        """
+        self._mm.close()
+        self._file.close()
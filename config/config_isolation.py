@@ -1,9 +1,19 @@
 import logging
-from typing import Dict, Any, Optional
-import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 import os
-import copy
+import threading
 import uuid
+from datetime import datetime
+
+from core import _json
+
+# Maximum number of parsed tenant configs kept in memory
+CONFIG_CACHE_SIZE = 1024
+
+# Upper bound on threads reading tenant configs in list_tenant_configs
+MAX_LIST_WORKERS = 32
 
 class ConfigIsolation:
     """
@@ -11,15 +21,25 @@ class ConfigIsolation:
     Provides methods for creating, retrieving, and managing tenant-specific configurations.
     """
     
-    def __init__(self, config_base_dir: str = 'config/tenant_configs'):
+    def __init__(
+        self, 
+        config_base_dir: str = 'config/tenant_configs',
+        cache_size: int = CONFIG_CACHE_SIZE
+    ):
         """
         Initialize ConfigIsolation.
         
         :param config_base_dir: Base directory for storing tenant configurations
+        :param cache_size: Maximum number of parsed tenant configs kept in memory
         """
         self.config_base_dir = config_base_dir
+        self.cache_size = cache_size
         self.logger = logging.getLogger(__name__)
         
+        # tenant_id -> (config.json mtime_ns, parsed config), least recently used first
+        self._cfg_cache: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         # Ensure base configuration directory exists
         os.makedirs(config_base_dir, exist_ok=True)
     
@@ -33,17 +53,17 @@ class ConfigIsolation:
         Create a tenant-specific configuration.
         
         :param tenant_id: Unique tenant identifier
-        :param base_config: Base configuration to start from
+        :param base_config: Base configuration to start from; must be JSON-serializable
         :param overrides: Tenant-specific configuration overrides
         :return: Boolean indicating successful config creation
         """
         try:
             # Start with a deep copy of base configuration or empty dict
-            tenant_config = copy.deepcopy(base_config) if base_config else {}
+            tenant_config = _json.clone(base_config) if base_config else {}
             
-            # Apply tenant-specific overrides
+            # Apply tenant-specific overrides (copied so their lists aren't shared with the cache)
             if overrides:
-                self._deep_update(tenant_config, overrides)
+                self._deep_update(tenant_config, _json.clone(overrides))
             
             # Add tenant-specific metadata
             tenant_config['tenant_id'] = tenant_id
@@ -56,8 +76,8 @@ class ConfigIsolation:
             
             # Save configuration
             config_path = os.path.join(tenant_config_dir, 'config.json')
-            with open(config_path, 'w') as f:
-                json.dump(tenant_config, f, indent=2)
+            _json.dump_atomic(config_path, tenant_config, indent=True)
+            self._cache_config(tenant_id, config_path, tenant_config)
             
             self.logger.info(f"Created configuration for tenant {tenant_id}")
             return True
@@ -74,22 +94,48 @@ class ConfigIsolation:
         Retrieve tenant-specific configuration.
         
         :param tenant_id: Unique tenant identifier
-        :return: Tenant configuration or None
+        :return: Copy of the tenant configuration or None
         """
         try:
-            config_path = os.path.join(self.config_base_dir, tenant_id, 'config.json')
-            
-            if not os.path.exists(config_path):
-                self.logger.warning(f"No configuration found for tenant {tenant_id}")
-                return None
-            
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            config = self._load_config(tenant_id)
+            return _json.clone(config) if config is not None else None
         
         except Exception as e:
             self.logger.error(f"Error retrieving tenant configuration: {e}")
             return None
     
+    def _load_config(
+        self, 
+        tenant_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached tenant configuration, re-reading it if the file changed.
+        The result is shared with the cache and must not be mutated.
+        
+        :param tenant_id: Unique tenant identifier
+        :return: Cached tenant configuration or None
+        """
+        config_path = os.path.join(self.config_base_dir, tenant_id, 'config.json')
+        
+        try:
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except FileNotFoundError:
+            with self._cache_lock:
+                self._cfg_cache.pop(tenant_id, None)
+            self.logger.warning(f"No configuration found for tenant {tenant_id}")
+            return None
+        
+        # Reuse the parsed config while the file is unchanged
+        with self._cache_lock:
+            cached = self._cfg_cache.get(tenant_id)
+            if cached is not None and cached[0] == mtime_ns:
+                self._cfg_cache.move_to_end(tenant_id)
+                return cached[1]
+        
+        config = _json.load(config_path)
+        self._store_cached(tenant_id, mtime_ns, config)
+        return config
+    
     def update_tenant_config(
         self, 
         tenant_id: str, 
@@ -104,22 +150,23 @@ class ConfigIsolation:
         """
         try:
             # Retrieve existing configuration
-            current_config = self.get_tenant_config(tenant_id)
+            current_config = self._load_config(tenant_id)
             
             if not current_config:
                 self.logger.error(f"Cannot update config for non-existent tenant {tenant_id}")
                 return False
             
-            # Apply updates
-            self._deep_update(current_config, updates)
+            # Apply updates to a copy; the cache keeps the old config until the write succeeds
+            updated_config = _json.clone(current_config)
+            self._deep_update(updated_config, _json.clone(updates))
             
             # Update modification timestamp
-            current_config['updated_at'] = datetime.now().isoformat()
+            updated_config['updated_at'] = datetime.now().isoformat()
             
             # Save updated configuration
             config_path = os.path.join(self.config_base_dir, tenant_id, 'config.json')
-            with open(config_path, 'w') as f:
-                json.dump(current_config, f, indent=2)
+            _json.dump_atomic(config_path, updated_config, indent=True)
+            self._cache_config(tenant_id, config_path, updated_config)
             
             self.logger.info(f"Updated configuration for tenant {tenant_id}")
             return True
@@ -147,6 +194,8 @@ class ConfigIsolation:
             
             # Remove entire tenant configuration directory
             import shutil
+            with self._cache_lock:
+                self._cfg_cache.pop(tenant_id, None)
             shutil.rmtree(tenant_config_dir)
             
             self.logger.info(f"Deleted configuration for tenant {tenant_id}")
@@ -156,29 +205,95 @@ class ConfigIsolation:
             self.logger.error(f"Error deleting tenant configuration: {e}")
             return False
     
+    def _cache_config(
+        self, 
+        tenant_id: str, 
+        config_path: str, 
+        config: Dict[str, Any]
+    ):
+        """
+        Cache a config just written to disk under the file's new mtime.
+        
+        :param tenant_id: Unique tenant identifier
+        :param config_path: Path the config was written to
+        :param config: Tenant configuration
+        """
+        self._store_cached(tenant_id, os.stat(config_path).st_mtime_ns, config)
+    
+    def _store_cached(
+        self, 
+        tenant_id: str, 
+        mtime_ns: int, 
+        config: Dict[str, Any]
+    ):
+        """
+        Insert a parsed config, evicting the least recently used when full.
+        
+        :param tenant_id: Unique tenant identifier
+        :param mtime_ns: Modification time of the config file the config matches
+        :param config: Tenant configuration
+        """
+        with self._cache_lock:
+            self._cfg_cache[tenant_id] = (mtime_ns, config)
+            self._cfg_cache.move_to_end(tenant_id)
+            
+            while len(self._cfg_cache) > self.cache_size:
+                self._cfg_cache.popitem(last=False)
+    
     def _deep_update(
         self, 
         original: Dict[str, Any], 
         updates: Dict[str, Any]
     ):
         """
-        Recursively update a nested dictionary.
+        Update a nested dictionary in place, merging nested dictionaries.
         
         :param original: Original dictionary to update
         :param updates: Dictionary with updates to apply
         """
-        for key, value in updates.items():
-            if isinstance(value, dict):
-                # Recursively update nested dictionaries
-                original[key] = self._deep_update(
-                    original.get(key, {}), 
-                    value
-                )
-            else:
-                # Replace or add non-dictionary values
-                original[key] = value
+        # Explicit stack instead of recursion: no per-level call overhead
+        # and no RecursionError on deeply nested updates
+        stack = [(original, updates)]
+        while stack:
+            target, source = stack.pop()
+            if target is source:
+                continue
+            
+            for key, value in source.items():
+                if isinstance(value, dict):
+                    # Merge into a fresh dict when needed so updates are never aliased
+                    nested = target.get(key)
+                    if not isinstance(nested, dict):
+                        nested = target[key] = {}
+                    stack.append((nested, value))
+                else:
+                    # Replace or add non-dictionary values
+                    target[key] = value
+    
+    def _matching_config(
+        self, 
+        tenant_id: str, 
+        filter_criteria: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a tenant configuration if it matches the filter.
+        
+        :param tenant_id: Unique tenant identifier
+        :param filter_criteria: Optional dictionary of filter conditions
+        :return: Copy of the tenant configuration, or None if missing or filtered out
+        """
+        try:
+            config = self._load_config(tenant_id)
+        except Exception as e:
+            self.logger.error(f"Error retrieving tenant configuration: {e}")
+            return None
         
-        return original
+        # Apply filtering if criteria provided; only matches are copied
+        if config and (not filter_criteria or all(
+            config.get(k) == v for k, v in filter_criteria.items()
+        )):
+            return _json.clone(config)
+        return None
     
     def list_tenant_configs(
         self, 
@@ -191,19 +306,20 @@ class ConfigIsolation:
         :return: List of tenant configurations
         """
         try:
-            tenant_configs = []
-            
-            # Iterate through tenant config directories
-            for tenant_id in os.listdir(self.config_base_dir):
-                config = self.get_tenant_config(tenant_id)
-                
-                # Apply filtering if criteria provided
-                if config and (not filter_criteria or all(
-                    config.get(k) == v for k, v in filter_criteria.items()
-                )):
-                    tenant_configs.append(config)
-            
-            return tenant_configs
+            # Tenant config directories; scandir gets the file type without extra stats
+            with os.scandir(self.config_base_dir) as entries:
+                tenant_ids = [entry.name for entry in entries if entry.is_dir()]
+            
+            if not tenant_ids:
+                return []
+            
+            # Overlap the per-tenant reads; filtering happens in the workers
+            with ThreadPoolExecutor(max_workers=min(MAX_LIST_WORKERS, len(tenant_ids))) as executor:
+                configs = executor.map(
+                    lambda tenant_id: self._matching_config(tenant_id, filter_criteria), 
+                    tenant_ids
+                )
+                return [config for config in configs if config]
         
         except Exception as e:
             self.logger.error(f"Error listing tenant configurations: {e}")
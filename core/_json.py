@@ -0,0 +1,80 @@
+"""
+JSON (de)serialization shared by the file-backed stores, using orjson when available
+"""
+import json
+import os
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize to JSON
+
+    :param obj: Object to serialize
+    :param indent: Indent by two spaces; only worth it for files people edit by hand
+    :return: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        # NumPy scalars show up in metrics; the stdlib encoder accepts them as floats
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Deserialize JSON
+
+    :param data: JSON document
+    :return: Decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load(path: str) -> Any:
+    """
+    Read and deserialize a JSON file
+
+    :param path: File path
+    :return: Decoded object
+    """
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+def dump_atomic(path: str, obj: Any, indent: bool = False, mode: int = 0o600):
+    """
+    Write a JSON file so readers see either the old or the new contents, never a partial write
+
+    :param path: Destination path
+    :param obj: Object to serialize
+    :param indent: Indent by two spaces
+    :param mode: Permission bits for the file
+    """
+    data = dumps(obj, indent)
+    tmp_path = f'{path}.tmp'
+
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        # os.open applies the umask and leaves a leftover tmp file's mode alone
+        os.fchmod(fd, mode)
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+def clone(obj: Any) -> Any:
+    """
+    Deep-copy a JSON-serializable object; much faster than copy.deepcopy for plain data
+
+    :param obj: Object made of dicts, lists, strings, numbers, booleans and None
+    :return: Independent copy
+    """
+    return loads(dumps(obj))
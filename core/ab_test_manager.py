@@ -1,13 +1,75 @@
 import logging
 import logging
-from typing import Dict, Any, List, Optional
-import json
+import math
+import numbers
+from typing import BinaryIO, Dict, Any, List, Optional, Set, Tuple
+import atexit
 import os
+import threading
+import time
 import uuid
 from datetime import datetime, timedelta
 import numpy as np
 import random
 
+try:
+    from scipy import stats
+except ImportError:
+    stats = None
+
+from core import _json
+
+# Milliseconds between background writes of changed experiments, unless
+# overridden by the AB_FLUSH_INTERVAL_MS environment variable
+DEFAULT_FLUSH_INTERVAL_MS = 1000
+
+# Seconds an event timestamp is reused before datetime.now() is called again
+TIMESTAMP_RESOLUTION = 0.1
+
+# p-value below which a variant's difference from the base variant is significant
+SIGNIFICANCE_LEVEL = 0.05
+
+def _welch_t_test(
+    base_mean: float, 
+    base_var: float, 
+    base_count: float, 
+    means: np.ndarray, 
+    variances: np.ndarray, 
+    counts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Welch's t-test of each variant against the base variant from summary statistics.
+    
+    :param base_mean: Base variant mean
+    :param base_var: Base variant sample variance
+    :param base_count: Base variant sample size
+    :param means: Variant means
+    :param variances: Variant sample variances
+    :param counts: Variant sample sizes
+    :return: t statistics and two-sided p-values (NaN where undefined)
+    """
+    if stats is not None:
+        t_stats, p_values = stats.ttest_ind_from_stats(
+            means, np.sqrt(variances), counts, 
+            base_mean, np.sqrt(base_var), base_count, 
+            equal_var=False
+        )
+        return np.atleast_1d(t_stats), np.atleast_1d(p_values)
+    
+    # Without SciPy, approximate the t distribution with a normal one
+    t_stats = (means - base_mean) / np.sqrt(variances / counts + base_var / base_count)
+    p_values = np.array([math.erfc(abs(t) / math.sqrt(2)) for t in t_stats])
+    return t_stats, p_values
+
+def _finite_or_none(value: float) -> Optional[float]:
+    """
+    Convert a NumPy scalar to a JSON-safe float.
+    
+    :param value: Scalar that may be NaN or infinite
+    :return: The value as a float, or None if it is not finite
+    """
+    return float(value) if np.isfinite(value) else None
+
 class ABTestManager:
     """
     Manages A/B testing for agent configurations, prompts, and model variations.
@@ -17,22 +79,71 @@ class ABTestManager:
     def __init__(
         self, 
         experiment_dir: str = 'data/ab_tests',
-        token_tracker: Optional['TokenTracker'] = None
+        token_tracker: Optional['TokenTracker'] = None,
+        flush_interval: Optional[float] = None
     ):
         """
         Initialize ABTestManager.
         
         :param experiment_dir: Directory to store A/B test configurations and results
         :param token_tracker: Optional TokenTracker for cost tracking
+        :param flush_interval: Seconds between background writes of changed experiments;
+            defaults to AB_FLUSH_INTERVAL_MS (in milliseconds), else one second
         """
         self.experiment_dir = experiment_dir
         self.token_tracker = token_tracker
         self.logger = logging.getLogger(__name__)
         
+        if flush_interval is None:
+            flush_interval = self._env_flush_interval()
+        self.flush_interval = flush_interval
+        
+        # Experiment configs held in memory; changed ones are written by a
+        # background thread instead of on every assignment or interaction
+        self._experiments: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Set[str] = set()
+        self._lock = threading.RLock()
+        
+        # Held across snapshot and replace so concurrent flushes (background
+        # thread, flush_now, close) write in order and never share a tmp file
+        self._write_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flushing = threading.Event()
+        self._closed = False
+        
+        # Participants and raw interactions live in append-only JSONL logs so
+        # each event is one line written rather than a rewrite of the config
+        self._participants: Dict[str, Dict[str, str]] = {}
+        self._log_files: Dict[Tuple[str, str], BinaryIO] = {}
+        
+        # (monotonic bucket, ISO timestamp) shared by events in the same bucket
+        self._ts_cache: Tuple[int, str] = (-1, '')
+        
         # Ensure experiment directory exists
         os.makedirs(experiment_dir, exist_ok=True)
         os.makedirs(os.path.join(experiment_dir, 'configs'), exist_ok=True)
         os.makedirs(os.path.join(experiment_dir, 'results'), exist_ok=True)
+        os.makedirs(os.path.join(experiment_dir, 'logs'), exist_ok=True)
+    
+    def _env_flush_interval(self) -> float:
+        """
+        Read the flush interval from AB_FLUSH_INTERVAL_MS, ignoring invalid values.
+        
+        :return: Flush interval in seconds
+        """
+        value = os.environ.get('AB_FLUSH_INTERVAL_MS')
+        if value:
+            try:
+                interval_ms = float(value)
+                if interval_ms > 0:
+                    return interval_ms / 1000
+            except ValueError:
+                pass
+            self.logger.warning(
+                f"Ignoring invalid AB_FLUSH_INTERVAL_MS={value!r}; "
+                f"using {DEFAULT_FLUSH_INTERVAL_MS} ms"
+            )
+        return DEFAULT_FLUSH_INTERVAL_MS / 1000
     
     def create_experiment(
         self, 
@@ -67,7 +178,7 @@ class ABTestManager:
                 'allocation_strategy': allocation_strategy,
                 'sample_size': sample_size,
                 'status': 'active',
-                'participants': {},
+                'variant_counts': {variant['id']: 0 for variant in variants},
                 'results': {
                     variant['id']: {
                         'total_interactions': 0,
@@ -77,14 +188,10 @@ class ABTestManager:
             }
             
             # Save experiment configuration
-            config_path = os.path.join(
-                self.experiment_dir, 
-                'configs', 
-                f'{experiment_id}.json'
-            )
-            
-            with open(config_path, 'w') as f:
-                json.dump(experiment_config, f, indent=2)
+            with self._lock:
+                self._experiments[experiment_id] = experiment_config
+                self._participants[experiment_id] = {}
+                self._mark_dirty(experiment_id)
             
             self.logger.info(
                 f"Created A/B test experiment: {experiment_name} "
@@ -110,58 +217,52 @@ class ABTestManager:
         :return: Selected variant configuration
         """
         try:
-            # Load experiment configuration
-            config_path = os.path.join(
-                self.experiment_dir, 
-                'configs', 
-                f'{experiment_id}.json'
-            )
-            
-            with open(config_path, 'r') as f:
-                experiment_config = json.load(f)
-            
-            # Check experiment status
-            if experiment_config['status'] != 'active':
-                self.logger.warning(f"Experiment {experiment_id} is not active")
-                return None
-            
-            # Check sample size
-            if (experiment_config['sample_size'] and 
-                len(experiment_config['participants']) >= experiment_config['sample_size']):
-                self.logger.warning(f"Experiment {experiment_id} has reached sample size")
-                return None
-            
-            # Allocation strategy
-            variants = experiment_config['variants']
-            
-            if experiment_config['allocation_strategy'] == 'random':
-                # Randomly select variant
-                selected_variant = random.choice(variants)
-            
-            elif experiment_config['allocation_strategy'] == 'balanced':
-                # Select variant with fewest participants
-                variant_counts = {
-                    variant['id']: sum(
-                        1 for p_id, p_data in experiment_config['participants'].items()
-                        if p_data['variant_id'] == variant['id']
-                    )
-                    for variant in variants
-                }
-                selected_variant = min(variants, key=lambda v: variant_counts.get(v['id'], 0))
-            
-            else:
-                # Default to random
-                selected_variant = random.choice(variants)
-            
-            # Record participant
-            experiment_config['participants'][user_id] = {
-                'variant_id': selected_variant['id'],
-                'assigned_at': datetime.now().isoformat()
-            }
+            with self._lock:
+                experiment_config = self._load_experiment(experiment_id)
+                participants = self._participants[experiment_id]
+            
+                # Check experiment status
+                if experiment_config['status'] != 'active':
+                    self.logger.warning(f"Experiment {experiment_id} is not active")
+                    return None
+            
+                # Check sample size
+                if (experiment_config['sample_size'] and 
+                    len(participants) >= experiment_config['sample_size']):
+                    self.logger.warning(f"Experiment {experiment_id} has reached sample size")
+                    return None
+            
+                # Allocation strategy
+                variants = experiment_config['variants']
+                variant_counts = experiment_config['variant_counts']
+            
+                if experiment_config['allocation_strategy'] == 'random':
+                    # Randomly select variant
+                    selected_variant = random.choice(variants)
+            
+                elif experiment_config['allocation_strategy'] == 'balanced':
+                    # Select variant with fewest participants
+                    selected_variant = min(variants, key=lambda v: variant_counts.get(v['id'], 0))
+            
+                else:
+                    # Default to random
+                    selected_variant = random.choice(variants)
+            
+                # Record participant, moving a reassigned user out of their old variant
+                previous_variant_id = participants.get(user_id)
+                if previous_variant_id is not None:
+                    variant_counts[previous_variant_id] -= 1
+                variant_counts[selected_variant['id']] = variant_counts.get(selected_variant['id'], 0) + 1
+                
+                participants[user_id] = selected_variant['id']
+                self._append_log(experiment_id, 'participants', {
+                    'user_id': user_id,
+                    'variant_id': selected_variant['id'],
+                    'assigned_at': self._timestamp()
+                })
             
-            # Save updated configuration
-            with open(config_path, 'w') as f:
-                json.dump(experiment_config, f, indent=2)
+                # Save updated configuration
+                self._mark_dirty(experiment_id)
             
             return selected_variant
         
@@ -184,42 +285,57 @@ class ABTestManager:
         :return: Boolean indicating successful recording
         """
         try:
-            # Load experiment configuration
-            config_path = os.path.join(
-                self.experiment_dir, 
-                'configs', 
-                f'{experiment_id}.json'
-            )
-            
-            with open(config_path, 'r') as f:
-                experiment_config = json.load(f)
-            
-            # Retrieve user's variant
-            if user_id not in experiment_config['participants']:
-                self.logger.warning(f"User {user_id} not found in experiment {experiment_id}")
-                return False
-            
-            variant_id = experiment_config['participants'][user_id]['variant_id']
-            
-            # Update variant results
-            variant_results = experiment_config['results'][variant_id]
-            variant_results['total_interactions'] += 1
+            with self._lock:
+                experiment_config = self._load_experiment(experiment_id)
+            
+                # Retrieve user's variant
+                variant_id = self._participants[experiment_id].get(user_id)
+                if variant_id is None:
+                    self.logger.warning(f"User {user_id} not found in experiment {experiment_id}")
+                    return False
+            
+                # Only numbers are aggregated; other values (e.g. 'model') are
+                # kept in the interaction log. Picked out before anything changes
+                numeric_metrics = {
+                    metric_name: metric_value 
+                    for metric_name, metric_value in interaction_metrics.items() 
+                    if isinstance(metric_value, numbers.Real)
+                }
             
-            # Aggregate metrics
-            for metric_name, metric_value in interaction_metrics.items():
-                if metric_name not in variant_results['metrics']:
-                    variant_results['metrics'][metric_name] = {
-                        'total': 0,
-                        'count': 0
-                    }
+                # Update variant results
+                variant_results = experiment_config['results'][variant_id]
+                variant_results['total_interactions'] += 1
+            
+                # Aggregate metrics
+                for metric_name, metric_value in numeric_metrics.items():
+                    if metric_name not in variant_results['metrics']:
+                        variant_results['metrics'][metric_name] = {
+                            'mean': 0.0,
+                            'm2': 0.0,
+                            'n': 0
+                        }
                 
-                metric_data = variant_results['metrics'][metric_name]
-                metric_data['total'] += metric_value
-                metric_data['count'] += 1
-            
-            # Save updated configuration
-            with open(config_path, 'w') as f:
-                json.dump(experiment_config, f, indent=2)
+                    # Welford's online update: mean and variance without keeping raw samples
+                    # Computed before any field is assigned, so a failure cannot
+                    # leave n counting a sample the mean never saw
+                    metric_data = variant_results['metrics'][metric_name]
+                    delta = metric_value - metric_data['mean']
+                    n = metric_data['n'] + 1
+                    mean = metric_data['mean'] + delta / n
+                    if metric_data['m2'] is not None:
+                        metric_data['m2'] += delta * (metric_value - mean)
+                    metric_data['mean'] = mean
+                    metric_data['n'] = n
+            
+                self._append_log(experiment_id, 'interactions', {
+                    'user_id': user_id,
+                    'variant_id': variant_id,
+                    'metrics': interaction_metrics,
+                    'recorded_at': self._timestamp()
+                })
+            
+                # Save updated configuration
+                self._mark_dirty(experiment_id)
             
             # Optional: Track token usage if token tracker is available
             if self.token_tracker:
@@ -242,6 +358,183 @@ class ABTestManager:
             self.logger.error(f"Error recording interaction metrics: {e}")
             return False
     
+    def _timestamp(self) -> str:
+        """
+        Current time for event logs, refreshed at most every TIMESTAMP_RESOLUTION
+        seconds so bursts of events share one formatted timestamp.
+        
+        :return: ISO 8601 timestamp
+        """
+        bucket = int(time.monotonic() / TIMESTAMP_RESOLUTION)
+        if bucket != self._ts_cache[0]:
+            self._ts_cache = (bucket, datetime.now().isoformat())
+        return self._ts_cache[1]
+    
+    def _config_path(self, experiment_id: str) -> str:
+        """
+        Path of an experiment's configuration file.
+        
+        :param experiment_id: Unique experiment identifier
+        :return: Configuration file path
+        """
+        return os.path.join(self.experiment_dir, 'configs', f'{experiment_id}.json')
+    
+    def _log_path(self, experiment_id: str, log_name: str) -> str:
+        """
+        Path of one of an experiment's append-only event logs.
+        
+        :param experiment_id: Unique experiment identifier
+        :param log_name: 'participants' or 'interactions'
+        :return: JSONL log file path
+        """
+        return os.path.join(self.experiment_dir, 'logs', f'{experiment_id}_{log_name}.jsonl')
+    
+    def _append_log(self, experiment_id: str, log_name: str, record: Dict[str, Any]):
+        """
+        Append one event to an experiment log, opening it on first use.
+        
+        :param experiment_id: Unique experiment identifier
+        :param log_name: 'participants' or 'interactions'
+        :param record: Event to append
+        """
+        if self._closed:
+            raise RuntimeError("ABTestManager is closed")
+        
+        log_file = self._log_files.get((experiment_id, log_name))
+        if log_file is None:
+            log_file = open(self._log_path(experiment_id, log_name), 'ab', buffering=0)
+            self._log_files[(experiment_id, log_name)] = log_file
+        log_file.write(_json.dumps(record) + b'\n')
+    
+    def _load_experiment(self, experiment_id: str) -> Dict[str, Any]:
+        """
+        Get an experiment configuration, reading it and replaying its
+        participant log on first use.
+        
+        :param experiment_id: Unique experiment identifier
+        :return: Cached experiment configuration
+        """
+        experiment_config = self._experiments.get(experiment_id)
+        if experiment_config is None:
+            experiment_config = _json.load(self._config_path(experiment_id))
+            
+            participants: Dict[str, str] = {}
+            if 'participants' in experiment_config:
+                # Experiments saved with participants inline: move them to the log
+                for user_id, participant in experiment_config.pop('participants').items():
+                    participants[user_id] = participant['variant_id']
+                    self._append_log(experiment_id, 'participants', {'user_id': user_id, **participant})
+                self._mark_dirty(experiment_id)
+            elif os.path.exists(self._log_path(experiment_id, 'participants')):
+                with open(self._log_path(experiment_id, 'participants'), 'rb') as f:
+                    for line in f:
+                        participant = _json.loads(line)
+                        participants[participant['user_id']] = participant['variant_id']
+            
+            # Metrics aggregated as total/count before Welford's update was used;
+            # without a sum of squares their variance is unknown (m2 None)
+            for variant_results in experiment_config['results'].values():
+                for metric_data in variant_results['metrics'].values():
+                    if 'n' not in metric_data:
+                        n = metric_data.pop('count')
+                        total = metric_data.pop('total')
+                        sumsq = metric_data.pop('sumsq', None)
+                        mean = total / n if n else 0.0
+                        metric_data['mean'] = mean
+                        metric_data['m2'] = sumsq - total * mean if sumsq is not None else None
+                        metric_data['n'] = n
+            
+            # The participant log is written immediately but the config only on
+            # flush, so recount from the replayed log rather than trust a stale value
+            variant_counts = {variant['id']: 0 for variant in experiment_config['variants']}
+            for variant_id in participants.values():
+                variant_counts[variant_id] = variant_counts.get(variant_id, 0) + 1
+            experiment_config['variant_counts'] = variant_counts
+            
+            self._experiments[experiment_id] = experiment_config
+            self._participants[experiment_id] = participants
+        return experiment_config
+    
+    def _mark_dirty(self, experiment_id: str):
+        """
+        Queue an experiment for the next background write, starting the
+        flush thread on first use.
+        
+        :param experiment_id: Unique experiment identifier
+        """
+        if self._closed:
+            raise RuntimeError("ABTestManager is closed")
+        
+        self._dirty.add(experiment_id)
+        
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+            atexit.register(self.flush_now)
+    
+    def _flush_loop(self):
+        """
+        Write changed experiments every flush_interval seconds until closed.
+        """
+        while not self._stop_flushing.wait(self.flush_interval):
+            self.flush_now()
+    
+    def flush_now(self, experiment_id: Optional[str] = None):
+        """
+        Atomically write changed experiment configurations now. However many
+        assignments and interactions an experiment had since its last write,
+        it is serialized and replaced once.
+        
+        :param experiment_id: Experiment to write; None writes all changed experiments
+        """
+        with self._write_lock:
+            with self._lock:
+                if experiment_id is None:
+                    flushed = set(self._dirty)
+                else:
+                    flushed = {experiment_id} & self._dirty
+                
+                pending = {
+                    flushed_id: _json.dumps(self._experiments[flushed_id], indent=True)
+                    for flushed_id in flushed
+                }
+                self._dirty -= flushed
+            
+            # Mutations only need _lock, so they continue while the files are written;
+            # anything changed meanwhile is dirty again and goes out on the next flush
+            for flushed_id, data in pending.items():
+                config_path = self._config_path(flushed_id)
+                tmp_path = f'{config_path}.tmp'
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp_path, config_path)
+                except OSError as e:
+                    self.logger.error(f"Error saving A/B test experiment {flushed_id}: {e}")
+                    with self._lock:
+                        self._dirty.add(flushed_id)
+    
+    def close(self):
+        """
+        Stop the background writer, write any pending changes and close
+        the event logs. Further changes to experiments are refused.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        
+        self._stop_flushing.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            atexit.unregister(self.flush_now)
+        self.flush_now()
+        
+        with self._lock:
+            for log_file in self._log_files.values():
+                log_file.close()
+            self._log_files.clear()
+    
     def analyze_experiment_results(
         self, 
         experiment_id: str
@@ -254,36 +547,36 @@ class ABTestManager:
         """
         try:
             # Load experiment configuration
-            config_path = os.path.join(
-                self.experiment_dir, 
-                'configs', 
-                f'{experiment_id}.json'
-            )
-            
-            with open(config_path, 'r') as f:
-                experiment_config = json.load(f)
+            with self._lock:
+                experiment_config = self._load_experiment(experiment_id)
             
             # Prepare results analysis
             results_analysis = {
                 'experiment_name': experiment_config['name'],
-                'total_participants': len(experiment_config['participants']),
+                'total_participants': len(self._participants[experiment_id]),
                 'variants': {}
             }
             
             # Analyze each variant
             for variant_id, variant_results in experiment_config['results'].items():
                 variant_analysis = {
+                    'participants': experiment_config['variant_counts'].get(variant_id, 0),
                     'total_interactions': variant_results['total_interactions'],
                     'metrics': {}
                 }
                 
                 # Calculate metrics
                 for metric_name, metric_data in variant_results['metrics'].items():
-                    if metric_data['count'] > 0:
+                    n = metric_data['n']
+                    if n > 0:
                         variant_analysis['metrics'][metric_name] = {
-                            'mean': metric_data['total'] / metric_data['count'],
-                            'total': metric_data['total'],
-                            'count': metric_data['count']
+                            'mean': metric_data['mean'],
+                            'variance': (
+                                metric_data['m2'] / (n - 1) 
+                                if n > 1 and metric_data['m2'] is not None else None
+                            ),
+                            'total': metric_data['mean'] * n,
+                            'count': n
                         }
                 
                 results_analysis['variants'][variant_id] = variant_analysis
@@ -300,8 +593,8 @@ class ABTestManager:
                 f'{experiment_id}_analysis.json'
             )
             
-            with open(analysis_path, 'w') as f:
-                json.dump(results_analysis, f, indent=2)
+            with open(analysis_path, 'wb') as f:
+                f.write(_json.dumps(results_analysis, indent=True))
             
             return results_analysis
         
@@ -316,42 +609,56 @@ class ABTestManager:
         """
         Calculate statistical significance between variants.
         
+        Each variant is compared with the first one using Welch's t-test on
+        the per-metric aggregates, vectorized across variants.
+        
         :param experiment_config: Experiment configuration dictionary
         :return: Dictionary with statistical significance results
         """
         try:
-            # Placeholder for statistical significance calculation
-            # In a real implementation, this would use more sophisticated statistical tests
             significance_results = {
-                'method': 'basic_comparison',
+                'method': 'welch_t_test',
+                'significance_level': SIGNIFICANCE_LEVEL,
                 'metric_comparisons': {}
             }
             
-            variants = list(experiment_config['results'].keys())
+            results = experiment_config['results']
+            variants = list(results.keys())
             base_variant = variants[0]
             
-            for metric_name in experiment_config['results'][base_variant]['metrics']:
-                base_metric = experiment_config['results'][base_variant]['metrics'][metric_name]
+            for metric_name in results[base_variant]['metrics']:
+                # Base variant first, then every other variant that reported the metric
+                compared = [
+                    variant for variant in variants[1:] 
+                    if metric_name in results[variant]['metrics']
+                ]
+                metrics = [results[variant]['metrics'][metric_name] for variant in [base_variant] + compared]
+                
+                means = np.array([m['mean'] for m in metrics], dtype=float)
+                m2s = np.array([m['m2'] for m in metrics], dtype=float)
+                counts = np.array([m['n'] for m in metrics], dtype=float)
                 
-                comparisons = {}
-                for variant in variants[1:]:
-                    variant_metric = experiment_config['results'][variant]['metrics'][metric_name]
-                    
-                    # Basic percentage difference
-                    base_mean = base_metric['total'] / base_metric['count']
-                    variant_mean = variant_metric['total'] / variant_metric['count']
-                    
-                    percentage_difference = (
-                        (variant_mean - base_mean) / base_mean * 100 
-                        if base_mean != 0 else 0
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    variances = m2s / (counts - 1)
+                    t_stats, p_values = _welch_t_test(
+                        means[0], variances[0], counts[0], 
+                        means[1:], variances[1:], counts[1:]
+                    )
+                    percentage_differences = np.where(
+                        means[0] != 0, 
+                        (means[1:] - means[0]) / means[0] * 100, 
+                        0.0
                     )
-                    
-                    comparisons[variant] = {
-                        'percentage_difference': percentage_difference,
-                        'statistically_significant': abs(percentage_difference) > 10  # Placeholder threshold
-                    }
                 
-                significance_results['metric_comparisons'][metric_name] = comparisons
+                significance_results['metric_comparisons'][metric_name] = {
+                    variant: {
+                        'percentage_difference': _finite_or_none(percentage_differences[i]),
+                        't_statistic': _finite_or_none(t_stats[i]),
+                        'p_value': _finite_or_none(p_values[i]),
+                        'statistically_significant': bool(p_values[i] < SIGNIFICANCE_LEVEL)
+                    }
+                    for i, variant in enumerate(compared)
+                }
             
             return significance_results
         
@@ -1,4 +1,4 @@
-from typing import Dict, Any, Type
+from typing import Dict, Any, Iterable, List, Tuple, Type
 from abc import ABC, abstractmethod
 
 class BaseAgent(ABC):
@@ -7,8 +7,8 @@ class BaseAgent(ABC):
         pass
 
 class AgentFactory:
-    _agents: Dict[str, Type[BaseAgent]] = {}
-    _configurations: Dict[str, Dict[str, Any]] = {}
+    # name -> (agent class, default constructor arguments)
+    _constructors: Dict[str, Tuple[Type[BaseAgent], Dict[str, Any]]] = {}
 
     @classmethod
     def register_agent(cls, name: str, agent_class: Type[BaseAgent], config: Dict[str, Any] = None):
@@ -19,9 +19,21 @@ class AgentFactory:
         :param agent_class: The agent class to register
         :param config: Optional configuration for the agent type
         """
-        cls._agents[name] = agent_class
-        if config:
-            cls._configurations[name] = config
+        # Copied so later changes to the caller's dict don't leak into the defaults
+        cls._constructors[name] = (agent_class, dict(config or {}))
+
+    @classmethod
+    def _get_constructor(cls, name: str) -> Tuple[Type[BaseAgent], Dict[str, Any]]:
+        """
+        Look up a registered agent type.
+        
+        :param name: Name of the agent type
+        :return: Agent class and its default configuration
+        """
+        try:
+            return cls._constructors[name]
+        except KeyError:
+            raise ValueError(f"No agent type registered with name: {name}") from None
 
     @classmethod
     def create_agent(cls, name: str, **kwargs) -> BaseAgent:
@@ -32,14 +44,20 @@ class AgentFactory:
         :param kwargs: Additional arguments for agent initialization
         :return: An instance of the specified agent type
         """
-        if name not in cls._agents:
-            raise ValueError(f"No agent type registered with name: {name}")
-        
-        agent_class = cls._agents[name]
-        config = cls._configurations.get(name, {})
-        config.update(kwargs)
+        agent_class, defaults = cls._get_constructor(name)
+        return agent_class(**{**defaults, **kwargs})
+
+    @classmethod
+    def create_many(cls, name: str, kwargs_iter: Iterable[Dict[str, Any]]) -> List[BaseAgent]:
+        """
+        Create several agents of one type, looking the type up only once.
         
-        return agent_class(**config)
+        :param name: Name of the agent type to create
+        :param kwargs_iter: Additional initialization arguments for each agent
+        :return: Agent instances in the order of kwargs_iter
+        """
+        agent_class, defaults = cls._get_constructor(name)
+        return [agent_class(**{**defaults, **kwargs}) for kwargs in kwargs_iter]
 
     @classmethod
     def list_available_agents(cls) -> Dict[str, Dict[str, Any]]:
@@ -49,6 +67,6 @@ class AgentFactory:
         :return: Dictionary of registered agent types and their configurations
         """
         return {
-            name: cls._configurations.get(name, {}) 
-            for name in cls._agents.keys()
+            name: dict(defaults) 
+            for name, (_, defaults) in cls._constructors.items()
         }
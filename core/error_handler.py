@@ -1,6 +1,6 @@
 import logging
 import traceback
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Union
 import json
 from datetime import datetime
 import os
@@ -0,0 +1,215 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+import numpy as np
+
+# Sentence-transformers model suggested for near-duplicate matching
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Seconds a cached response is reused before it must be recomputed
+DEFAULT_TTL = 3600.0
+
+class SemanticResponseCache:
+    """
+    Bounded LRU cache of model responses. Queries match exactly or, when an
+    embedding model is configured, by cosine similarity to earlier queries.
+    """
+
+    def __init__(self,
+                 embedding_model: Optional[str] = None,
+                 threshold: float = 0.92,
+                 max_entries: int = 256,
+                 ttl: Optional[float] = DEFAULT_TTL):
+        """
+        Initialize the response cache
+
+        :param embedding_model: Sentence-transformers model for near-duplicate
+            matching, e.g. DEFAULT_EMBEDDING_MODEL; None (the default, or the
+            package being unavailable) means exact matches only
+        :param threshold: Minimum cosine similarity for a semantic hit
+        :param max_entries: Maximum number of cached responses
+        :param ttl: Seconds a response stays valid; None keeps it until evicted
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        # (namespace, query) -> (monotonic expiry time or None, normalized
+        # query embedding or None, response)
+        self._entries: "OrderedDict[Tuple[Hashable, str], Tuple[Optional[float], Optional[np.ndarray], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._embedding_model_name = embedding_model
+        self._embedding_model = None
+
+        # Embedding of the last looked-up query, reused when it is stored
+        self._last_query: Optional[Tuple[str, np.ndarray]] = None
+
+    @property
+    def semantic(self) -> bool:
+        """
+        Whether near-duplicate matching is enabled
+        """
+        return bool(self._embedding_model_name)
+
+    def _embed(self, query: str) -> Optional[np.ndarray]:
+        """
+        Embed a query, lazily loading the embedding model
+
+        :param query: Query text
+        :return: Unit-length embedding, or None if semantic matching is unavailable
+        """
+        if self._embedding_model is None and self._embedding_model_name:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                self._embedding_model_name = None
+                return None
+            self._embedding_model = SentenceTransformer(self._embedding_model_name)
+
+        if self._embedding_model is None:
+            return None
+
+        last_query = self._last_query
+        if last_query is not None and last_query[0] == query:
+            return last_query[1]
+
+        vector = np.asarray(
+            self._embedding_model.encode([query], normalize_embeddings=True)[0],
+            dtype=np.float32
+        )
+        self._last_query = (query, vector)
+        return vector
+
+    def _lookup_exact(self, namespace: Hashable, query: str) -> Optional[Any]:
+        """
+        Look up a response cached for exactly this query, dropping expired entries
+
+        :param namespace: Partition key
+        :param query: Query or prompt text
+        :return: Cached response, or None on a miss
+        """
+        now = time.monotonic()
+        key = (namespace, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def _lookup_similar(self, namespace: Hashable, vector: np.ndarray) -> Optional[Any]:
+        """
+        Look up the response to the most similar unexpired query
+
+        :param namespace: Partition key
+        :param vector: Unit-length query embedding
+        :return: Cached response, or None if nothing is similar enough
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                (cached_key, cached_vector)
+                for cached_key, (expires_at, cached_vector, _) in self._entries.items()
+                if cached_key[0] == namespace and cached_vector is not None
+                and (expires_at is None or expires_at > now)
+            ]
+            if not candidates:
+                return None
+
+            scores = np.stack([cached_vector for _, cached_vector in candidates]) @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+
+            best_key = candidates[best][0]
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][2]
+
+    def _store(self, namespace: Hashable, query: str, vector: Optional[np.ndarray], response: Any):
+        """
+        Store a response, evicting the least recently used entry when full
+
+        :param namespace: Partition key
+        :param query: Query or prompt text
+        :param vector: Query embedding, or None
+        :param response: Response to cache
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        key = (namespace, query)
+        with self._lock:
+            self._entries[key] = (expires_at, vector, response)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def lookup(self, namespace: Hashable, query: str) -> Optional[Any]:
+        """
+        Look up a cached response
+
+        :param namespace: Partition key, e.g. the model and generation settings
+        :param query: Query or prompt text
+        :return: Cached response, or None on a miss
+        """
+        cached = self._lookup_exact(namespace, query)
+        if cached is not None or not self.semantic:
+            return cached
+
+        vector = self._embed(query)
+        if vector is None:
+            return None
+        return self._lookup_similar(namespace, vector)
+
+    async def lookup_async(self, namespace: Hashable, query: str) -> Optional[Any]:
+        """
+        Look up a cached response, embedding the query in a worker thread
+        so the event loop is not blocked
+
+        :param namespace: Partition key, e.g. the model and generation settings
+        :param query: Query or prompt text
+        :return: Cached response, or None on a miss
+        """
+        cached = self._lookup_exact(namespace, query)
+        if cached is not None or not self.semantic:
+            return cached
+
+        vector = await asyncio.to_thread(self._embed, query)
+        if vector is None:
+            return None
+        return self._lookup_similar(namespace, vector)
+
+    def update(self, namespace: Hashable, query: str, response: Any):
+        """
+        Store a response, evicting the least recently used entry when full
+
+        :param namespace: Partition key, e.g. the model and generation settings
+        :param query: Query or prompt text
+        :param response: Response to cache
+        """
+        vector = self._embed(query) if self.semantic else None
+        self._store(namespace, query, vector, response)
+
+    async def update_async(self, namespace: Hashable, query: str, response: Any):
+        """
+        Store a response, embedding the query in a worker thread
+
+        :param namespace: Partition key, e.g. the model and generation settings
+        :param query: Query or prompt text
+        :param response: Response to cache
+        """
+        vector = await asyncio.to_thread(self._embed, query) if self.semantic else None
+        self._store(namespace, query, vector, response)
+
+    def clear(self):
+        """
+        Remove all cached responses
+        """
+        with self._lock:
+            self._entries.clear()
+        self._last_query = None
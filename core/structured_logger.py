@@ -1,10 +1,31 @@
 import logging
+import logging.handlers
 import json
 import os
 import uuid
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    """
+    Serialize a log record compactly, using orjson when available.
+    
+    :param payload: Log record
+    :return: JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            payload, 
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+    return json.dumps(payload, separators=(',', ':'), default=str)
+
 class StructuredLogger:
     """
     Advanced structured logging system with JSON formatting, 
@@ -43,11 +64,13 @@ class StructuredLogger:
         )
         
         # Custom JSON formatter
+        session_id = self._session_id
+        
         class JsonFormatter(logging.Formatter):
             def format(self, record):
                 log_record = {
                     'timestamp': datetime.now().isoformat(),
-                    'session_id': self._session_id,
+                    'session_id': session_id,
                     'level': record.levelname,
                     'logger': record.name,
                     'module': record.module,
@@ -60,7 +83,7 @@ class StructuredLogger:
                 if hasattr(record, 'extra'):
                     log_record['extra'] = record.extra
                 
-                return json.dumps(log_record)
+                return _dumps(log_record)
         
         # Configure file handler
         formatter = JsonFormatter()
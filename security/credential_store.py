@@ -4,6 +4,7 @@ from typing import Dict, Any, Optional, List
 from cryptography.fernet import Fernet
 from core.error_handler import AgentError, ErrorSeverity
 import hashlib
+import threading
 import uuid
 
 class CredentialError(AgentError):
@@ -35,6 +36,9 @@ class CredentialStore:
         
         # Access control
         self._access_control: Dict[str, List[str]] = {}
+        
+        # Serializes writes and key rotation when the store is shared across threads
+        self._lock = threading.RLock()
 
     def _generate_credential_id(self, provider: str, username: str) -> str:
         """
@@ -84,23 +88,24 @@ class CredentialStore:
             'data': credential
         }
         
-        # Encrypt if encryption is enabled
-        if self._cipher_suite:
-            encrypted_data = self._cipher_suite.encrypt(
-                json.dumps(credential_data).encode()
-            ).decode()
+        with self._lock:
+            # Encrypt if encryption is enabled
+            if self._cipher_suite:
+                encrypted_data = self._cipher_suite.encrypt(
+                    json.dumps(credential_data).encode()
+                ).decode()
             
-            # Store encrypted
-            with open(os.path.join(self._store_path, f"{credential_id}.enc"), 'w') as f:
-                f.write(encrypted_data)
-        else:
-            # Store unencrypted (not recommended)
-            with open(os.path.join(self._store_path, f"{credential_id}.json"), 'w') as f:
-                json.dump(credential_data, f, indent=2)
+                # Store encrypted
+                with open(os.path.join(self._store_path, f"{credential_id}.enc"), 'w') as f:
+                    f.write(encrypted_data)
+            else:
+                # Store unencrypted (not recommended)
+                with open(os.path.join(self._store_path, f"{credential_id}.json"), 'w') as f:
+                    json.dump(credential_data, f, indent=2)
         
-        # Set access control if roles provided
-        if allowed_roles:
-            self._access_control[credential_id] = allowed_roles
+            # Set access control if roles provided
+            if allowed_roles:
+                self._access_control[credential_id] = allowed_roles
         
         return credential_id
 
@@ -245,23 +250,24 @@ class CredentialStore:
         # Create new cipher suite
         new_cipher_suite = Fernet(new_encryption_key.encode())
         
-        # Rotate all encrypted credentials
-        for filename in os.listdir(self._store_path):
-            if filename.endswith('.enc'):
-                filepath = os.path.join(self._store_path, filename)
+        with self._lock:
+            # Rotate all encrypted credentials
+            for filename in os.listdir(self._store_path):
+                if filename.endswith('.enc'):
+                    filepath = os.path.join(self._store_path, filename)
                 
-                # Read and decrypt with old key
-                with open(filepath, 'r') as f:
-                    encrypted_data = f.read()
-                    decrypted_data = self._cipher_suite.decrypt(encrypted_data.encode()).decode()
+                    # Read and decrypt with old key
+                    with open(filepath, 'r') as f:
+                        encrypted_data = f.read()
+                        decrypted_data = self._cipher_suite.decrypt(encrypted_data.encode()).decode()
                 
-                # Re-encrypt with new key
-                new_encrypted_data = new_cipher_suite.encrypt(decrypted_data.encode()).decode()
+                    # Re-encrypt with new key
+                    new_encrypted_data = new_cipher_suite.encrypt(decrypted_data.encode()).decode()
                 
-                # Write back
-                with open(filepath, 'w') as f:
-                    f.write(new_encrypted_data)
+                    # Write back
+                    with open(filepath, 'w') as f:
+                        f.write(new_encrypted_data)
         
-        # Update encryption key and cipher suite
-        self._encryption_key = new_encryption_key
-        self._cipher_suite = new_cipher_suite
+            # Update encryption key and cipher suite
+            self._encryption_key = new_encryption_key
+            self._cipher_suite = new_cipher_suite
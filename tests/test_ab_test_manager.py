@@ -0,0 +1,118 @@
+import json
+import os
+import statistics
+
+import pytest
+
+from core.ab_test_manager import ABTestManager
+
+VARIANTS = [
+    {'id': 'control', 'prompt': 'Answer briefly'},
+    {'id': 'treatment', 'prompt': 'Answer in detail'}
+]
+
+@pytest.fixture
+def experiment_dir(tmp_path):
+    return str(tmp_path / 'ab_tests')
+
+def test_reload_after_close(experiment_dir):
+    """A new manager sees the participants and metrics of a closed one"""
+    manager = ABTestManager(experiment_dir, flush_interval=3600)
+    experiment_id = manager.create_experiment('reload', VARIANTS, allocation_strategy='balanced')
+    for i in range(4):
+        manager.assign_variant(experiment_id, f'user-{i}')
+        manager.record_interaction(experiment_id, f'user-{i}', {'score': float(i)})
+    before = manager.analyze_experiment_results(experiment_id)
+    manager.close()
+
+    reloaded = ABTestManager(experiment_dir, flush_interval=3600)
+    after = reloaded.analyze_experiment_results(experiment_id)
+
+    assert after['total_participants'] == 4
+    assert after['variants'] == before['variants']
+    assert reloaded.record_interaction(experiment_id, 'user-0', {'score': 10.0})
+    reloaded.close()
+
+def test_closed_manager_refuses_changes(experiment_dir):
+    """Events after close are rejected rather than silently lost"""
+    manager = ABTestManager(experiment_dir, flush_interval=3600)
+    experiment_id = manager.create_experiment('closed', VARIANTS)
+    manager.assign_variant(experiment_id, 'user-1')
+    manager.close()
+
+    assert manager.assign_variant(experiment_id, 'user-2') is None
+    assert not manager.record_interaction(experiment_id, 'user-1', {'score': 1.0})
+
+    # Closing twice is harmless
+    manager.close()
+
+def test_non_numeric_metrics_are_not_aggregated(experiment_dir):
+    """Values such as the model name are logged but leave the aggregates intact"""
+    manager = ABTestManager(experiment_dir, flush_interval=3600)
+    experiment_id = manager.create_experiment('metrics', VARIANTS)
+    manager.assign_variant(experiment_id, 'user-1')
+
+    assert manager.record_interaction(experiment_id, 'user-1', {'latency': 1.0, 'model': 'gpt-4'})
+    assert manager.record_interaction(experiment_id, 'user-1', {'latency': 3.0, 'model': 'gpt-4'})
+
+    analysis = manager.analyze_experiment_results(experiment_id)
+    variant = next(v for v in analysis['variants'].values() if v['total_interactions'])
+    assert variant['total_interactions'] == 2
+    assert set(variant['metrics']) == {'latency'}
+    assert variant['metrics']['latency']['mean'] == 2.0
+    assert variant['metrics']['latency']['count'] == 2
+    manager.close()
+
+def test_online_mean_and_variance_match_samples(experiment_dir):
+    manager = ABTestManager(experiment_dir, flush_interval=3600)
+    experiment_id = manager.create_experiment('welford', VARIANTS)
+    manager.assign_variant(experiment_id, 'user-1')
+
+    samples = [1.0, 4.0, 2.5, 7.0, 3.5]
+    for sample in samples:
+        manager.record_interaction(experiment_id, 'user-1', {'latency': sample})
+
+    analysis = manager.analyze_experiment_results(experiment_id)
+    variant = next(v for v in analysis['variants'].values() if v['total_interactions'])
+    assert variant['metrics']['latency']['mean'] == pytest.approx(statistics.mean(samples))
+    assert variant['metrics']['latency']['variance'] == pytest.approx(statistics.variance(samples))
+    manager.close()
+
+def test_reload_recounts_unflushed_assignments(experiment_dir):
+    """Assignments logged after the last flush are counted on reload"""
+    manager = ABTestManager(experiment_dir, flush_interval=3600)
+    experiment_id = manager.create_experiment('crash', VARIANTS, allocation_strategy='balanced')
+    manager.flush_now()
+
+    # Participant logs are written per event; the config is now stale on disk
+    for i in range(3):
+        manager.assign_variant(experiment_id, f'user-{i}')
+
+    reloaded = ABTestManager(experiment_dir, flush_interval=3600)
+    analysis = reloaded.analyze_experiment_results(experiment_id)
+
+    assert analysis['total_participants'] == 3
+    assert sum(v['participants'] for v in analysis['variants'].values()) == 3
+
+    manager.close()
+    reloaded.close()
+
+def test_flush_now_writes_config(experiment_dir):
+    """Changes reach the config file on flush_now, not on every event"""
+    manager = ABTestManager(experiment_dir, flush_interval=3600)
+    experiment_id = manager.create_experiment('flush', VARIANTS, allocation_strategy='balanced')
+    config_path = os.path.join(experiment_dir, 'configs', f'{experiment_id}.json')
+    assert not os.path.exists(config_path)
+
+    manager.assign_variant(experiment_id, 'user-1')
+    manager.assign_variant(experiment_id, 'user-2')
+    manager.record_interaction(experiment_id, 'user-1', {'latency': 1.0})
+    manager.flush_now()
+
+    with open(config_path) as f:
+        config = json.load(f)
+    assert config['variant_counts'] == {'control': 1, 'treatment': 1}
+    assert sum(r['total_interactions'] for r in config['results'].values()) == 1
+    assert 'participants' not in config
+
+    manager.close()
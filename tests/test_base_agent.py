@@ -6,6 +6,8 @@ from dotenv import load_dotenv
 # Load environment variables for testing
 load_dotenv()
 
+pytestmark = pytest.mark.integration
+
 class TestBaseAgent:
     @pytest.fixture
     def base_agent(self):
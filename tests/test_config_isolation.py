@@ -0,0 +1,79 @@
+import json
+import os
+
+import pytest
+
+from config.config_isolation import ConfigIsolation
+
+@pytest.fixture
+def isolation(tmp_path):
+    return ConfigIsolation(config_base_dir=str(tmp_path / 'tenants'))
+
+def test_get_returns_independent_copies(isolation):
+    """Mutating a returned config must not leak into the cache"""
+    assert isolation.create_tenant_config('acme', {'limits': {'rpm': 60}, 'models': ['small']})
+
+    config = isolation.get_tenant_config('acme')
+    config['limits']['rpm'] = 0
+    config['models'].append('large')
+
+    fresh = isolation.get_tenant_config('acme')
+    assert fresh['limits'] == {'rpm': 60}
+    assert fresh['models'] == ['small']
+
+def test_external_edit_invalidates_cache(isolation):
+    """A config file changed on disk is re-read on the next access"""
+    isolation.create_tenant_config('acme', {'plan': 'free'})
+    assert isolation.get_tenant_config('acme')['plan'] == 'free'
+
+    config_path = os.path.join(isolation.config_base_dir, 'acme', 'config.json')
+    with open(config_path) as f:
+        config = json.load(f)
+    config['plan'] = 'pro'
+    with open(config_path, 'w') as f:
+        json.dump(config, f)
+    # Guarantee a new mtime even on filesystems with coarse timestamps
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert isolation.get_tenant_config('acme')['plan'] == 'pro'
+
+def test_update_merges_nested_values(isolation):
+    isolation.create_tenant_config('acme', {'limits': {'rpm': 60, 'tpm': 1000}})
+    assert isolation.update_tenant_config('acme', {'limits': {'rpm': 120}})
+
+    config = isolation.get_tenant_config('acme')
+    assert config['limits'] == {'rpm': 120, 'tpm': 1000}
+    assert 'updated_at' in config
+
+def test_failed_update_keeps_cached_config(isolation):
+    """The cache is only replaced once the new config has been written"""
+    isolation.create_tenant_config('acme', {'plan': 'free'})
+    isolation.get_tenant_config('acme')
+
+    # A directory where the temporary file goes makes the atomic write fail
+    os.mkdir(os.path.join(isolation.config_base_dir, 'acme', 'config.json.tmp'))
+
+    assert not isolation.update_tenant_config('acme', {'plan': 'pro'})
+    assert isolation.get_tenant_config('acme')['plan'] == 'free'
+
+def test_cache_is_bounded(tmp_path):
+    isolation = ConfigIsolation(config_base_dir=str(tmp_path / 'tenants'), cache_size=2)
+    for tenant_id in ('a', 'b', 'c'):
+        isolation.create_tenant_config(tenant_id, {'name': tenant_id})
+
+    assert list(isolation._cfg_cache) == ['b', 'c']
+    # Evicted tenants are read back from disk
+    assert isolation.get_tenant_config('a')['name'] == 'a'
+
+def test_list_and_delete(isolation):
+    isolation.create_tenant_config('acme', {'plan': 'pro'})
+    isolation.create_tenant_config('globex', {'plan': 'free'})
+
+    assert len(isolation.list_tenant_configs()) == 2
+    pro = isolation.list_tenant_configs({'plan': 'pro'})
+    assert [config['tenant_id'] for config in pro] == ['acme']
+
+    assert isolation.delete_tenant_config('acme')
+    assert isolation.get_tenant_config('acme') is None
+    assert [config['tenant_id'] for config in isolation.list_tenant_configs()] == ['globex']
@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+from api import endpoint_registry
+from api.endpoint_registry import EndpointRegistry, EndpointType
+from core.config_manager import ConfigManager
+
+@pytest.fixture
+def registry_dir(tmp_path):
+    return str(tmp_path / 'registry')
+
+def open_registry(tmp_path, registry_dir):
+    config_manager = ConfigManager(config_dir=str(tmp_path / 'config'), env_file=None, secrets_file=None)
+    return EndpointRegistry(config_manager, registry_dir=registry_dir)
+
+def read_snapshot(registry_dir):
+    with open(os.path.join(registry_dir, 'endpoints.json')) as f:
+        return json.load(f)
+
+def read_log(registry_dir):
+    log_path = os.path.join(registry_dir, 'endpoints.json.log')
+    if not os.path.exists(log_path):
+        return []
+    with open(log_path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def test_mutations_are_logged_and_replayed(tmp_path, registry_dir):
+    registry = open_registry(tmp_path, registry_dir)
+    kept = registry.register_endpoint('chat', 'https://api.example.com', 'example', tags=['llm'])
+    removed = registry.register_endpoint('old', 'https://old.example.com', 'example')
+    registry.update_endpoint(kept, version='2.0')
+    registry.delete_endpoint(removed)
+
+    # Nothing has been compacted yet: the snapshot is still empty
+    assert read_snapshot(registry_dir) == {}
+    assert [entry['op'] for entry in read_log(registry_dir)] == ['put', 'put', 'put', 'delete']
+
+    reloaded = open_registry(tmp_path, registry_dir)
+    assert [endpoint.id for endpoint in reloaded.list_endpoints()] == [kept]
+    assert reloaded.get_endpoint(kept).version == '2.0'
+    assert reloaded.get_endpoint(kept).endpoint_type is EndpointType.REST
+    assert [endpoint.id for endpoint in reloaded.find_endpoints_by_tag('llm')] == [kept]
+
+def test_compact_folds_log_into_snapshot(tmp_path, registry_dir):
+    registry = open_registry(tmp_path, registry_dir)
+    endpoint_id = registry.register_endpoint(
+        'graph', 'https://graph.example.com', 'example', endpoint_type=EndpointType.GRAPHQL
+    )
+    registry.compact()
+
+    assert read_log(registry_dir) == []
+    assert list(read_snapshot(registry_dir)) == [endpoint_id]
+
+    reloaded = open_registry(tmp_path, registry_dir)
+    assert reloaded.get_endpoint(endpoint_id).endpoint_type is EndpointType.GRAPHQL
+    assert reloaded.list_endpoints(endpoint_type=EndpointType.GRAPHQL)[0].id == endpoint_id
+
+def test_log_is_compacted_automatically(tmp_path, registry_dir):
+    registry = open_registry(tmp_path, registry_dir)
+    endpoint_ids = [
+        registry.register_endpoint(f'endpoint-{i}', 'https://api.example.com', 'example')
+        for i in range(endpoint_registry.COMPACT_EVERY)
+    ]
+
+    assert read_log(registry_dir) == []
+    assert list(read_snapshot(registry_dir)) == endpoint_ids
+
+    # Mutations after compaction go to the fresh log on top of the snapshot
+    registry.delete_endpoint(endpoint_ids[0])
+    assert read_log(registry_dir) == [{'op': 'delete', 'id': endpoint_ids[0]}]
+
+    reloaded = open_registry(tmp_path, registry_dir)
+    assert [endpoint.id for endpoint in reloaded.list_endpoints()] == endpoint_ids[1:]
+
+def test_torn_log_line_is_ignored(tmp_path, registry_dir):
+    registry = open_registry(tmp_path, registry_dir)
+    endpoint_id = registry.register_endpoint('chat', 'https://api.example.com', 'example')
+
+    # Simulate a crash part-way through appending the next mutation
+    with open(os.path.join(registry_dir, 'endpoints.json.log'), 'a') as f:
+        f.write('{"op": "put", "id": "trunc')
+
+    reloaded = open_registry(tmp_path, registry_dir)
+    assert [endpoint.id for endpoint in reloaded.list_endpoints()] == [endpoint_id]
+
+def test_mutations_after_torn_line_survive_reload(tmp_path, registry_dir):
+    registry = open_registry(tmp_path, registry_dir)
+    first = registry.register_endpoint('first', 'https://api.example.com', 'example')
+
+    with open(os.path.join(registry_dir, 'endpoints.json.log'), 'a') as f:
+        f.write('{"op": "put", "id": "trunc')
+
+    # Reopening cuts off the torn line, so this append starts a line of its own
+    reopened = open_registry(tmp_path, registry_dir)
+    second = reopened.register_endpoint('second', 'https://api.example.com', 'example')
+
+    reloaded = open_registry(tmp_path, registry_dir)
+    assert [endpoint.id for endpoint in reloaded.list_endpoints()] == [first, second]
+    assert [entry['id'] for entry in read_log(registry_dir)] == [first, second]
@@ -0,0 +1,57 @@
+import pytest
+
+from cli.history_ring import HistoryRing
+
+@pytest.fixture
+def ring(tmp_path):
+    # Each 'turn-N' record takes 10 bytes (4-byte header + 6-byte payload)
+    ring = HistoryRing(str(tmp_path / 'history.bin'), capacity=64)
+    yield ring
+    ring.close()
+
+def test_appends_read_back_in_order(ring):
+    for i in range(3):
+        ring.append(f"turn-{i}")
+
+    assert len(ring) == 3
+    assert ring.get_window(1024) == "turn-0\nturn-1\nturn-2"
+
+def test_wraparound_drops_oldest_turns(ring):
+    for i in range(10):
+        ring.append(f"turn-{i}")
+
+    # Six records fit in 64 bytes; older ones were overwritten after wrapping
+    assert len(ring) == 6
+    assert ring.get_window(1024) == "\n".join(f"turn-{i}" for i in range(4, 10))
+
+def test_wraparound_keeps_turns_readable_across_many_laps(ring):
+    for i in range(100):
+        ring.append(f"t-{i:03d}")
+
+    window = ring.get_window(1024).split("\n")
+    assert window[-1] == "t-099"
+    assert window == [f"t-{i:03d}" for i in range(100 - len(window), 100)]
+
+def test_window_limits(ring):
+    for i in range(5):
+        ring.append(f"turn-{i}")
+
+    assert ring.get_window(12) == "turn-3\nturn-4"
+    assert ring.get_window(1024, max_records=1) == "turn-4"
+    # The latest turn is returned even if it alone exceeds the budget
+    assert ring.get_window(1) == "turn-4"
+
+def test_oversized_turn_keeps_its_end(ring):
+    ring.append("a" * 10 + "b" * 100)
+
+    assert len(ring) == 1
+    assert ring.get_window(1024) == "b" * 60
+
+def test_default_history_file_leaves_no_file_behind(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ring = HistoryRing(capacity=64)
+    ring.append("turn-0")
+
+    assert ring.get_window(1024) == "turn-0"
+    ring.close()
+    assert list(tmp_path.iterdir()) == []
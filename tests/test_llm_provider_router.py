@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from api.llm_cache import LLMCache
+from api.llm_provider_router import AllProvidersFailedError, LLMProvider, LLMProviderRouter
+
+class EchoClient:
+    """Provider client answering every prompt with its upper-cased text"""
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, prompt, **constraints):
+        self.calls.append(prompt)
+        return {'text': prompt.upper(), 'tokens_used': 1}
+
+class BatchEchoClient(EchoClient):
+    """Echo client that also accepts a whole batch in one call"""
+    def __init__(self, drop_last=False):
+        super().__init__()
+        self.batches = []
+        self.drop_last = drop_last
+
+    def generate_batch(self, prompts, **constraints):
+        self.batches.append(list(prompts))
+        results = [{'text': prompt.upper(), 'tokens_used': 1} for prompt in prompts]
+        return results[:-1] if self.drop_last else results
+
+class FailingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, **constraints):
+        self.calls += 1
+        raise ConnectionError("provider unavailable")
+
+def make_router(*providers, cache=None):
+    router = LLMProviderRouter(default_provider=providers[0][0], cache=cache)
+    for provider, config, client in providers:
+        router.register_provider(provider, config, client)
+    return router
+
+def test_concurrent_prompts_share_one_batch():
+    client = BatchEchoClient()
+    router = make_router((LLMProvider.OPENAI, {'batching': {'wait_ms': 50}}, client))
+    prompts = [f"prompt {i}" for i in range(5)]
+
+    responses = asyncio.run(router.route_inference_batch(prompts, 'chat'))
+
+    assert client.batches == [prompts]
+    assert [r['result']['text'] for r in responses] == [p.upper() for p in prompts]
+    assert all(r['metadata']['batch_size'] == 5 for r in responses)
+    assert router.get_provider_status()[LLMProvider.OPENAI]['metrics']['successful_calls'] == 5
+
+def test_batches_are_capped_at_batch_size():
+    client = BatchEchoClient()
+    router = make_router((LLMProvider.OPENAI, {'batching': {'batch_size': 2, 'wait_ms': 50}}, client))
+    prompts = [f"prompt {i}" for i in range(5)]
+
+    responses = asyncio.run(router.route_inference_batch(prompts, 'chat'))
+
+    assert sorted(len(batch) for batch in client.batches) == [1, 2, 2]
+    assert [r['result']['text'] for r in responses] == [p.upper() for p in prompts]
+
+def test_short_batch_result_fails_instead_of_hanging():
+    client = BatchEchoClient(drop_last=True)
+    router = make_router((LLMProvider.OPENAI, {'batching': {'wait_ms': 10}}, client))
+
+    async def route():
+        return await asyncio.wait_for(
+            router.route_inference_batch(['a', 'b', 'c'], 'chat'), timeout=5
+        )
+
+    with pytest.raises(AllProvidersFailedError):
+        asyncio.run(route())
+
+def test_unhashable_constraints_are_batched():
+    client = BatchEchoClient()
+    router = make_router((LLMProvider.OPENAI, {'batching': {'wait_ms': 10}}, client))
+
+    responses = asyncio.run(router.route_inference_batch(['a', 'b'], 'chat', {'stop': ['\n']}))
+
+    assert len(responses) == 2
+    assert client.batches == [['a', 'b']]
+
+def test_deterministic_requests_are_cached():
+    client = EchoClient()
+    router = make_router((LLMProvider.OPENAI, {'model': 'small'}, client), cache=LLMCache())
+
+    first = router.route_inference('hello', 'chat', {'temperature': 0})
+    second = router.route_inference('hello', 'chat', {'temperature': 0})
+
+    assert client.calls == ['hello']
+    assert second['result'] == first['result']
+    assert second['metadata']['cache_hit']
+
+    # Callers may modify what they get back without corrupting the cache
+    second['result']['text'] = 'changed'
+    assert router.route_inference('hello', 'chat', {'temperature': 0})['result']['text'] == 'HELLO'
+
+    metrics = router.get_provider_status()[LLMProvider.OPENAI]['metrics']
+    assert metrics['cache_hits'] == 2
+    assert metrics['cache_misses'] == 1
+
+def test_sampled_requests_are_not_cached():
+    client = EchoClient()
+    router = make_router((LLMProvider.OPENAI, {}, client), cache=LLMCache())
+
+    router.route_inference('hello', 'chat')
+    router.route_inference('hello', 'chat', {'temperature': 0.7})
+
+    assert client.calls == ['hello', 'hello']
+
+def test_open_circuit_skips_failing_provider():
+    failing = FailingClient()
+    fallback = EchoClient()
+    router = make_router(
+        (LLMProvider.OPENAI, {'price': 1, 'circuit_breaker': {'failure_threshold': 1}}, failing),
+        (LLMProvider.ANTHROPIC, {'price': 10}, fallback)
+    )
+
+    first = router.route_inference('hello', 'chat')
+    second = router.route_inference('again', 'chat')
+
+    assert first['provider'] == LLMProvider.ANTHROPIC
+    assert second['provider'] == LLMProvider.ANTHROPIC
+    # The first failure opened the circuit, so the second request never tried it
+    assert failing.calls == 1
+    assert fallback.calls == ['hello', 'again']
+
+def test_all_providers_failing_raises():
+    router = make_router(
+        (LLMProvider.OPENAI, {}, FailingClient()),
+        (LLMProvider.ANTHROPIC, {}, FailingClient())
+    )
+
+    with pytest.raises(AllProvidersFailedError) as excinfo:
+        router.route_inference('hello', 'chat')
+
+    assert set(excinfo.value.chain) == {LLMProvider.OPENAI, LLMProvider.ANTHROPIC}
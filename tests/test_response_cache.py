@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from core.response_cache import SemanticResponseCache
+
+def test_exact_match_by_default():
+    cache = SemanticResponseCache()
+    cache.update('model-a', 'what is rust?', {'answer': 'a language'})
+
+    assert not cache.semantic
+    assert cache.lookup('model-a', 'what is rust?') == {'answer': 'a language'}
+    assert cache.lookup('model-a', 'What is Rust?') is None
+    # Namespaces keep responses for different settings apart
+    assert cache.lookup('model-b', 'what is rust?') is None
+
+def test_entries_expire():
+    cache = SemanticResponseCache(ttl=0.05)
+    cache.update('model-a', 'query', 'answer')
+    assert cache.lookup('model-a', 'query') == 'answer'
+
+    time.sleep(0.06)
+    assert cache.lookup('model-a', 'query') is None
+
+def test_async_lookup_and_update():
+    cache = SemanticResponseCache()
+
+    async def roundtrip():
+        await cache.update_async('model-a', 'query', 'answer')
+        return await cache.lookup_async('model-a', 'query')
+
+    assert asyncio.run(roundtrip()) == 'answer'
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SemanticResponseCache(max_entries=2)
+    cache.update('ns', 'a', 1)
+    cache.update('ns', 'b', 2)
+    cache.lookup('ns', 'a')
+    cache.update('ns', 'c', 3)
+
+    assert cache.lookup('ns', 'b') is None
+    assert cache.lookup('ns', 'a') == 1
+    assert cache.lookup('ns', 'c') == 3
@@ -0,0 +1,61 @@
+import pytest
+
+from api.retry_handler import RetryHandler, RetryHandlerError, RetryStrategy
+
+class Flaky:
+    """Callable failing a fixed number of times before succeeding"""
+    def __init__(self, failures, error=ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, value):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("temporary failure")
+        return value * 2
+
+def make_handler(**kwargs):
+    # No delay between attempts so tests run instantly
+    kwargs.setdefault('base_delay', 0.0)
+    return RetryHandler(backoff_strategy=RetryStrategy.CONSTANT, jitter=0.0, **kwargs)
+
+def test_retry_sync_returns_after_transient_failures():
+    flaky = Flaky(failures=2)
+
+    assert make_handler(max_retries=3).retry_sync(flaky, 21) == 42
+    assert flaky.calls == 3
+
+def test_retry_sync_gives_up_after_max_retries():
+    flaky = Flaky(failures=5)
+
+    with pytest.raises(RetryHandlerError, match="Failed after 3 attempts"):
+        make_handler(max_retries=3).retry_sync(flaky, 1)
+    assert flaky.calls == 3
+
+def test_retry_sync_does_not_retry_other_errors():
+    flaky = Flaky(failures=1, error=ValueError)
+    handler = make_handler(max_retries=3, retry_on=ConnectionError)
+
+    with pytest.raises(ValueError):
+        handler.retry_sync(flaky, 1)
+    assert flaky.calls == 1
+
+def test_retry_sync_opens_circuit():
+    handler = make_handler(max_retries=5, circuit_failure_threshold=2, circuit_reset_timeout=60)
+
+    with pytest.raises(RetryHandlerError, match="Circuit breaker opened"):
+        handler.retry_sync(Flaky(failures=5), 1)
+
+    # While open, calls are rejected without running the function
+    blocked = Flaky(failures=0)
+    with pytest.raises(RetryHandlerError, match="Circuit is open"):
+        handler.retry_sync(blocked, 1)
+    assert blocked.calls == 0
+
+def test_retry_sync_success_resets_failure_count():
+    handler = make_handler(max_retries=3, circuit_failure_threshold=3)
+
+    # Two failures then a success, twice: never three consecutive failures
+    assert handler.retry_sync(Flaky(failures=2), 1) == 2
+    assert handler.retry_sync(Flaky(failures=2), 2) == 4
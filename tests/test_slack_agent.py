@@ -7,6 +7,8 @@ from dotenv import load_dotenv
 # Load environment variables for testing
 load_dotenv()
 
+pytestmark = pytest.mark.integration
+
 class TestSlackAgent:
     @pytest.fixture
     def slack_agent(self):